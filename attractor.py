@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+from vertex import Player
+
+# Computes the attractor of player to the target vertices in linear time: every vertex from which
+# player can force the play into the targets. Vertices are ids, owner gives the owner of a vertex,
+# predecessors its predecessor ids and out_degree its number of successors in the (sub)game.
+# Vertices marked in excluded are not part of the subgame and are never attracted.
+def attractor(targets: Iterable[int], player: Player, owner: Callable[[int], Player],
+              predecessors: Callable[[int], Iterable[int]], out_degree: Callable[[int], int],
+              excluded=None) -> list[int]:
+    attracted: set[int] = set()
+    queue: list[int] = []
+    for v in targets:
+        if v not in attracted:
+            attracted.add(v)
+            queue.append(v)
+
+    # successors of an opponent vertex that are not attracted yet
+    remaining: dict[int, int] = {}
+    while queue:
+        w = queue.pop()
+        for u in predecessors(w):
+            if u in attracted or (excluded is not None and excluded[u]):
+                continue
+            if owner(u) != player:
+                # the opponent can only be forced once all of its moves are attracted
+                left = remaining.get(u, out_degree(u)) - 1
+                remaining[u] = left
+                if left > 0:
+                    continue
+            attracted.add(u)
+            queue.append(u)
+    return list(attracted)
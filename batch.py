@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+import resource
+import sys
+import time
+from multiprocessing import Pool
+from typing import TextIO
+
+from paritygame import ParityGame, Strategy, strat_to_string
+
+# Expands directories and glob patterns to a sorted list of .gm files 
+def collect_games(paths: list[str]) -> list[str]: 
+    files: list[str] = []
+    for path in paths: 
+        if os.path.isdir(path): 
+            files += sorted(glob.glob(os.path.join(path, '*.gm')))
+        else: 
+            files += sorted(glob.glob(path))
+    return files
+
+# Expands a comma separated list of strategies, 'all' means every strategy 
+def collect_strategies(strategies_str: str) -> list[str]: 
+    if strategies_str == 'all': 
+        return [strat_to_string(strat) for strat in Strategy]
+    return [s.strip() for s in strategies_str.split(',') if s.strip() != '']
+
+def peak_rss_kb() -> int: 
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macos reports bytes 
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+# Solves one (game, strategy) job, runs inside a worker process 
+def solve_job(job: tuple[str, str, str, bool]) -> dict: 
+    file, strategy, engine, use_cache = job
+    start = time.perf_counter()
+    try: 
+        pg = ParityGame.parse_graph(file, use_cache)
+        pg.set_solve_strategy(strategy)
+        pg.set_solve_engine(engine)
+        pg.solve(report=False)
+        result = pg.get_results()
+    except Exception as e: 
+        result = {'file': file, 'strategy': strategy, 'engine': engine, 'error': repr(e)}
+    result['wall_time'] = time.perf_counter() - start
+    result['peak_rss_kb'] = peak_rss_kb()
+    return result
+
+# Solves every game with every strategy over a pool of worker processes and writes one 
+# json line per job to out as soon as the job is done 
+def run_batch(files: list[str], strategies: list[str], engine: str, workers: int, out: TextIO, use_cache: bool = True) -> None: 
+    jobs = [(file, strategy, engine, use_cache) for file in files for strategy in strategies]
+    # a fresh worker per job so the peak rss belongs to that job only 
+    with Pool(processes=workers, maxtasksperchild=1) as pool: 
+        for result in pool.imap_unordered(solve_job, jobs): 
+            out.write(json.dumps(result) + '\n')
+            out.flush()
@@ -0,0 +1,543 @@
+from __future__ import annotations
+import argparse
+import gc
+import glob
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from multiprocessing import Process
+
+from gameparser import parse_game
+from generators import write_random_game, FAMILIES
+from paritygame import ParityGame, strat_to_string
+from vertex import Player
+from tuple import MeasureDomain
+from measurestore import TupleMeasureStore
+from batch import collect_strategies
+from server import SolveServer, request
+from suite import SUITE_SIZES, run_suite, read_results, compare_baseline, plot_results
+
+# Writes a random game of every size into directory, returns their paths
+def random_games(directory: str, sizes: list[int], max_priority: int, max_degree: int) -> list[str]: 
+    paths: list[str] = []
+    for n_vertices in sizes: 
+        path = os.path.join(directory, 'random{n}.gm'.format(n=n_vertices))
+        write_random_game(path, n_vertices, max_priority, max_degree)
+        paths.append(path)
+    return paths
+
+# Parses the game and solves it (with solve_dual when dual is set), returns the game and the wall
+# time of the solve
+def timed_solve(path: str, strategy: str, engine: str = 'tuple', dual: bool = False, workers: int | None = None, 
+                timeout: float | None = None) -> tuple[ParityGame, float]: 
+    pg = ParityGame.parse_graph(path, use_cache=False)
+    pg.set_solve_strategy(strategy)
+    pg.set_solve_engine(engine)
+    if workers is not None: 
+        pg.workers = workers
+    start = time.perf_counter()
+    if dual: 
+        pg.solve_dual(report=False, timeout=timeout)
+    else: 
+        pg.solve(report=False, timeout=timeout)
+    return pg, time.perf_counter() - start
+
+def odd_wins(pg: ParityGame) -> list[bool]: 
+    return [v.tuple.top for v in pg.vertices]
+
+def benchmark_parse(n_vertices: int, max_priority: int, max_degree: int) -> None: 
+    with tempfile.TemporaryDirectory() as directory: 
+        path, = random_games(directory, [n_vertices], max_priority, max_degree)
+        size_mb = os.path.getsize(path) / (1 << 20)
+
+        start = time.perf_counter()
+        graph = parse_game(path)
+        parse_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        graph.build_vertices()
+        build_time = time.perf_counter() - start
+
+    print('Parse benchmark: {n} vertices, {m} edges, {size:.1f} MB'.format(n=graph.n_vertices, m=graph.n_edges, size=size_mb))
+    print('  streaming parse to CSR: {t:.2f}s ({mbs:.1f} MB/s, {vs:.0f} vertices/s)'.format(
+        t=parse_time, mbs=size_mb / parse_time, vs=graph.n_vertices / parse_time))
+    print('  building Vertex objects: {t:.2f}s'.format(t=build_time))
+
+# The layout of a game before the compact representation: a vertex with a __dict__, its successors 
+# and predecessors in sets and its name as a string, and a measure with a __dict__ per vertex 
+class SetVertex: 
+
+    def __init__(self, id: int) -> None: 
+        self.id: int = id
+        self.name: str = ''
+        self.priority: int = 0
+        self.even_priority: bool = True
+        self.owner: Player = Player.EVEN
+        self.next: set[SetVertex] = set()
+        self.prev: set[SetVertex] = set()
+        self.tuple: DictTuple | None = None
+        self.stable: bool = False
+        self.odd_self_loop: bool = False
+
+class DictTuple: 
+
+    def __init__(self, values: list[int]) -> None: 
+        self.values: list[int] = values
+        self.top: bool = False
+
+def build_set_vertices(graph) -> list[SetVertex]: 
+    vertices = [SetVertex(v) for v in range(graph.n_vertices)]
+    for v, vertex in enumerate(vertices): 
+        vertex.name = graph.names[v]
+        vertex.priority = graph.priorities[v]
+        vertex.even_priority = vertex.priority % 2 == 0
+        vertex.owner = Player.EVEN if graph.owners[v] else Player.ODD
+        for w in graph.succ_targets[graph.succ_offsets[v]: graph.succ_offsets[v + 1]]: 
+            vertex.next.add(vertices[w])
+            vertices[w].prev.add(vertex)
+    return vertices
+
+# Memory held by every representation of a generated random game, measured with tracemalloc, in 
+# bytes per vertex and per edge. After: the compact graph made by the parser, the Vertex objects 
+# built from it and the Tuple measures of the tuple engine. Before: the same game in the layout of 
+# SetVertex and DictTuple, built from the compact graph. 
+def benchmark_memory(n_vertices: int, max_priority: int, max_degree: int) -> None: 
+    with tempfile.TemporaryDirectory() as directory: 
+        path, = random_games(directory, [n_vertices], max_priority, max_degree)
+        sizes: list[tuple[str, int]] = []
+        tracemalloc.start()
+        try: 
+            graph = parse_game(path)
+            sizes.append(('compact graph', tracemalloc.get_traced_memory()[0]))
+            vertices = graph.build_vertices()
+            sizes.append(('vertex objects', tracemalloc.get_traced_memory()[0] - sum(size for _, size in sizes)))
+            store = TupleMeasureStore(vertices, MeasureDomain(graph.max_priority, graph.priorities))
+            store.reset()
+            sizes.append(('tuple measures', tracemalloc.get_traced_memory()[0] - sum(size for _, size in sizes)))
+            after = sum(size for _, size in sizes)
+            sizes.append(('after', after))
+            # the vertices point at each other, they are only freed by the cycle collector and that 
+            # should not run while the old layout is measured 
+            del store, vertices
+            gc.collect()
+
+            start = tracemalloc.get_traced_memory()[0]
+            before_vertices = build_set_vertices(graph)
+            vertices_size = tracemalloc.get_traced_memory()[0] - start
+            sizes.append(('set vertices', vertices_size))
+            for vertex in before_vertices: 
+                vertex.tuple = DictTuple([0 for _ in range(graph.max_priority + 1)])
+            measures_size = tracemalloc.get_traced_memory()[0] - start - vertices_size
+            sizes.append(('dict measures', measures_size))
+            before = vertices_size + measures_size
+            sizes.append(('before', before))
+        finally: 
+            tracemalloc.stop()
+
+    print('Memory benchmark: {n} vertices, {m} edges'.format(n=graph.n_vertices, m=graph.n_edges))
+    print('{name:>16} {mb:>10} {vertex:>12} {edge:>10}'.format(name='', mb='MB', vertex='B/vertex', edge='B/edge'))
+    for name, size in sizes: 
+        print('{name:>16} {mb:>10.1f} {vertex:>12.1f} {edge:>10.1f}'.format(
+            name=name, mb=size / (1 << 20), vertex=size / graph.n_vertices, edge=size / graph.n_edges))
+    print('The compact layout takes {ratio:.1f}x less memory'.format(ratio=before / after))
+
+# Wall time of the numpy bulk lifting strategy against the combined strategy on random games of
+# growing size, the winners of both are checked to be the same
+def benchmark_bulk(sizes: list[int], max_priority: int, max_degree: int) -> None: 
+    print('{n:>10} {combined:>12} {numpy:>12} {speedup:>8}'.format(n='vertices', combined='combined', numpy='numpy', speedup='speedup'))
+    with tempfile.TemporaryDirectory() as directory: 
+        for n_vertices, path in zip(sizes, random_games(directory, sizes, max_priority, max_degree)): 
+            times: dict[str, float] = {}
+            winners: dict[str, list[bool]] = {}
+            for strategy in ('combined', 'numpy'): 
+                pg, times[strategy] = timed_solve(path, strategy)
+                winners[strategy] = odd_wins(pg)
+            if winners['combined'] != winners['numpy']: 
+                raise RuntimeError('numpy and combined disagree on {path}'.format(path=path))
+            print('{n:>10} {combined:>11.2f}s {numpy:>11.2f}s {speedup:>7.2f}x'.format(
+                n=n_vertices, combined=times['combined'], numpy=times['numpy'], speedup=times['combined'] / times['numpy']))
+
+# Applies one random edit of the given kind to the game, the same seed gives the same edit
+def random_edit(pg: ParityGame, kind: str, rng: random.Random) -> None: 
+    v = rng.randrange(pg.n_vertices)
+    match kind: 
+        case 'add': 
+            pg.add_edge(v, rng.randrange(pg.n_vertices))
+        case 'remove': 
+            # keep a successor so no dead end is made 
+            while len(pg.vertices[v].next) < 2: 
+                v = rng.randrange(pg.n_vertices)
+            pg.remove_edge(v, rng.choice(sorted(w.id for w in pg.vertices[v].next)))
+        case 'priority': 
+            pg.set_priority(v, rng.randrange(pg.max_priority + 1))
+        case 'owner': 
+            pg.set_owner(v, Player.ODD if pg.vertices[v].owner == Player.EVEN else Player.EVEN)
+
+# Lifts and wall time of resolve after a number of random edits of every kind against solving the
+# edited game from scratch, the winners of both are checked to be the same
+def benchmark_resolve(n_vertices: int, max_priority: int, max_degree: int, edits: int, strategy: str, repeats: int) -> None: 
+    print('{kind:>9} {queued:>8} {resolve:>14} {full:>14} {speedup:>8}'.format(
+        kind='edit', queued='queued', resolve='resolve lifts', full='full lifts', speedup='speedup'))
+    with tempfile.TemporaryDirectory() as directory: 
+        path, = random_games(directory, [n_vertices], max_priority, max_degree)
+        for kind in ('add', 'remove', 'priority', 'owner'): 
+            totals = {'queued': 0, 'resolve': 0, 'full': 0, 'resolve_time': 0.0, 'full_time': 0.0}
+            for seed in range(repeats): 
+                warm = ParityGame.parse_graph(path, use_cache=False)
+                warm.set_solve_strategy(strategy)
+                warm.solve(report=False)
+                rng = random.Random(seed)
+                for _ in range(edits): 
+                    random_edit(warm, kind, rng)
+                start = time.perf_counter()
+                warm.resolve(report=False)
+                totals['resolve_time'] += time.perf_counter() - start
+                totals['resolve'] += warm.lift_amount
+                totals['queued'] += warm.requeued
+
+                cold = ParityGame.parse_graph(path, use_cache=False)
+                cold.set_solve_strategy(strategy)
+                rng = random.Random(seed)
+                for _ in range(edits): 
+                    random_edit(cold, kind, rng)
+                start = time.perf_counter()
+                cold.solve(report=False)
+                totals['full_time'] += time.perf_counter() - start
+                totals['full'] += cold.lift_amount
+                if odd_wins(warm) != odd_wins(cold): 
+                    raise RuntimeError('resolve and a full solve disagree after {kind} edits (seed {seed})'.format(kind=kind, seed=seed))
+            print('{kind:>9} {queued:>8} {resolve:>14} {full:>14} {speedup:>7.2f}x'.format(
+                kind=kind, queued=totals['queued'] // repeats, resolve=totals['resolve'] // repeats, full=totals['full'] // repeats, 
+                speedup=totals['full_time'] / totals['resolve_time']))
+
+# Lifts and wall time of the worklist orderings of the backtrack strategy on the given games and on
+# generated random games of the given sizes, the winners of every ordering are checked to be the same
+def benchmark_worklist(paths: list[str], sizes: list[int], max_priority: int, max_degree: int, strategies: list[str], engine: str) -> None: 
+    print('{game:>24} {strategy:>10} {lifts:>10} {time:>9} {high:>8}'.format(game='game', strategy='strategy', lifts='lifts', time='time', high='queue'))
+    totals = {strategy: [0, 0.0] for strategy in strategies}
+    with tempfile.TemporaryDirectory() as directory: 
+        for path in paths + random_games(directory, sizes, max_priority, max_degree): 
+            winners: list[bool] | None = None
+            for strategy in strategies: 
+                pg, wall_time = timed_solve(path, strategy, engine)
+                if winners is None: 
+                    winners = odd_wins(pg)
+                elif winners != odd_wins(pg): 
+                    raise RuntimeError('{strategy} and {first} disagree on {path}'.format(strategy=strategy, first=strategies[0], path=path))
+                totals[strategy][0] += pg.lift_amount
+                totals[strategy][1] += wall_time
+                print('{game:>24} {strategy:>10} {lifts:>10} {time:>8.3f}s {high:>8}'.format(
+                    game=os.path.basename(path)[-24:], strategy=strategy, lifts=pg.lift_amount, time=wall_time, 
+                    high=pg.strategy_counters.get('queue_high_water', '-')))
+    for strategy, (lifts, wall_time) in totals.items(): 
+        print('{game:>24} {strategy:>10} {lifts:>10} {time:>8.3f}s'.format(game='total', strategy=strategy, lifts=lifts, time=wall_time))
+
+# Lifts and wall time of solving with the measures of odd only against solving with the measures of
+# both players side by side (solve_dual) on the given games and on generated random games of the
+# given sizes, the winners of both are checked to be the same
+def benchmark_dual(paths: list[str], sizes: list[int], max_priority: int, max_degree: int, strategy: str, engine: str) -> None: 
+    print('{game:>24} {single:>10} {dual:>10} {odd:>10} {even:>10} {speedup:>8}'.format(
+        game='game', single='lifts', dual='dual lifts', odd='odd side', even='even side', speedup='speedup'))
+    totals = {'single': 0, 'dual': 0, 'single_time': 0.0, 'dual_time': 0.0}
+    with tempfile.TemporaryDirectory() as directory: 
+        for path in paths + random_games(directory, sizes, max_priority, max_degree): 
+            single, single_time = timed_solve(path, strategy, engine)
+            dual, dual_time = timed_solve(path, strategy, engine, dual=True)
+            if odd_wins(single) != odd_wins(dual): 
+                raise RuntimeError('solve_dual and solve disagree on {path}'.format(path=path))
+            totals['single'] += single.lift_amount
+            totals['dual'] += dual.lift_amount
+            totals['single_time'] += single_time
+            totals['dual_time'] += dual_time
+            print('{game:>24} {single:>10} {dual:>10} {odd:>10} {even:>10} {speedup:>7.2f}x'.format(
+                game=os.path.basename(path)[-24:], single=single.lift_amount, dual=dual.lift_amount, 
+                odd=dual.strategy_counters['odd_measure_lifts'], even=dual.strategy_counters['even_measure_lifts'], 
+                speedup=single_time / dual_time if dual_time > 0 else float('inf')))
+    print('{game:>24} {single:>10} {dual:>10} {odd:>10} {even:>10} {speedup:>7.2f}x'.format(
+        game='total', single=totals['single'], dual=totals['dual'], odd='', even='', 
+        speedup=totals['single_time'] / totals['dual_time'] if totals['dual_time'] > 0 else float('inf')))
+
+# Lifts and wall time of the succinct engine against a classic engine on random games with a growing
+# number of priorities. A solve stops after timeout seconds, the winners are checked to be the same
+# when both engines finished.
+def benchmark_succinct(sizes: list[int], priorities: list[int], max_degree: int, strategy: str, engine: str, timeout: float) -> None: 
+    print('{n:>8} {p:>10} {classic:>22} {succinct:>22}'.format(n='vertices', p='priorities', classic=engine, succinct='succinct'))
+    with tempfile.TemporaryDirectory() as directory: 
+        for n_vertices in sizes: 
+            for max_priority in priorities: 
+                path, = random_games(directory, [n_vertices], max_priority, max_degree)
+                columns: list[str] = []
+                winners: list[list[bool]] = []
+                for name in (engine, 'succinct'): 
+                    pg, wall_time = timed_solve(path, strategy, name, timeout=timeout)
+                    if pg.stopped is None: 
+                        winners.append(odd_wins(pg))
+                    columns.append('{lifts:>10} {time:>8.2f}s{stopped}'.format(lifts=pg.lift_amount, time=wall_time, stopped='*' if pg.stopped else ' '))
+                if len(winners) == 2 and winners[0] != winners[1]: 
+                    raise RuntimeError('succinct and {engine} disagree on {path}'.format(engine=engine, path=path))
+                print('{n:>8} {p:>10} {classic:>22} {succinct:>22}'.format(n=n_vertices, p=max_priority, classic=columns[0], succinct=columns[1]))
+    print('* stopped after {timeout:.0f}s'.format(timeout=timeout))
+
+# Solves the given games and generated games of every family with Zielonka's algorithm and with small
+# progress measures, fails when they disagree on a winner, and prints the wall time of both and the
+# strategy auto picks. Small progress measures get timeout seconds per game, a game where they stop
+# is only checked on the vertices they decided (the ones at top).
+def benchmark_crosscheck(paths: list[str], sizes: dict[str, list[int]], strategy: str, engine: str, timeout: float) -> None: 
+    print('{game:>28} {vertices:>9} {priorities:>10} {spm:>10} {zielonka:>10} {auto:>10}'.format(
+        game='game', vertices='vertices', priorities='priorities', spm=strategy, zielonka='zielonka', auto='auto picks'))
+    with tempfile.TemporaryDirectory() as directory: 
+        for family, family_sizes in sizes.items(): 
+            for size in family_sizes: 
+                path = os.path.join(directory, '{family}{size}.gm'.format(family=family, size=size))
+                FAMILIES[family](path, size)
+                paths = paths + [path]
+        for path in paths: 
+            times: dict[str, float] = {}
+            games: dict[str, ParityGame] = {}
+            for name in (strategy, 'zielonka'): 
+                games[name], times[name] = timed_solve(path, name, engine, timeout=timeout if name == strategy else None)
+            spm, zielonka = games[strategy], games['zielonka']
+            for v, w in zip(spm.vertices, zielonka.vertices): 
+                if v.tuple.top != w.tuple.top and (spm.stopped is None or v.tuple.top): 
+                    raise RuntimeError('zielonka and {strategy} disagree on vertex {id} of {path}'.format(strategy=strategy, id=v.id, path=path))
+            print('{game:>28} {vertices:>9} {priorities:>10} {spm:>9.3f}s{stopped} {zielonka:>9.3f}s {auto:>10}'.format(
+                game=os.path.basename(path)[-28:], vertices=spm.n_vertices, priorities=spm.max_priority + 1, spm=times[strategy], 
+                stopped='*' if spm.stopped else ' ', zielonka=times['zielonka'], auto=strat_to_string(spm.pick_strategy())))
+    print('* stopped after {timeout:.0f}s'.format(timeout=timeout))
+
+# Wall time of the parallel strategy for every number of workers against the serial strategy on the
+# given games and generated random games, the speedups are against one parallel worker and against
+# the serial strategy. The winners are checked to be the same. The lifts differ per run, the workers
+# pick up each other's changes in whatever order they arrive.
+def benchmark_parallel(paths: list[str], sizes: list[int], max_priority: int, max_degree: int, workers: list[int], strategy: str, engine: str) -> None: 
+    print('{game:>24} {workers:>8} {time:>10} {speedup:>8} {serial:>8} {lifts:>10} {sent:>10}'.format(
+        game='game', workers='workers', time='time', speedup='speedup', serial='vs serial', lifts='lifts', sent='sent'))
+    with tempfile.TemporaryDirectory() as directory: 
+        for path in paths + random_games(directory, sizes, max_priority, max_degree): 
+            game = os.path.basename(path)[-24:]
+            serial, serial_time = timed_solve(path, strategy, engine)
+            winners = odd_wins(serial)
+            print('{game:>24} {workers:>8} {time:>9.2f}s {speedup:>8} {serial:>8} {lifts:>10} {sent:>10}'.format(
+                game=game, workers='serial', time=serial_time, speedup='', serial='', lifts=serial.lift_amount, sent=''))
+            single_time: float | None = None
+            for n_workers in workers: 
+                pg, wall_time = timed_solve(path, 'parallel', engine, workers=n_workers)
+                if odd_wins(pg) != winners: 
+                    raise RuntimeError('parallel with {n} workers and {strategy} disagree on {path}'.format(n=n_workers, strategy=strategy, path=path))
+                if single_time is None: 
+                    single_time = wall_time
+                print('{game:>24} {workers:>8} {time:>9.2f}s {speedup:>7.2f}x {serial:>7.2f}x {lifts:>10} {sent:>10}'.format(
+                    game=game, workers=pg.strategy_counters['workers'], time=wall_time, speedup=single_time / wall_time, 
+                    serial=serial_time / wall_time, lifts=pg.lift_amount, sent=pg.strategy_counters['sent_vertices']))
+    print('{n} cpus'.format(n=os.cpu_count()))
+
+# Time of solving the given games and generated random games with a fresh `python main.py` against
+# asking a solver daemon on a unix socket in a temporary directory: the first request (parsed and
+# solved by the daemon), a repeated request (served from its cache) and a request with another
+# strategy (the game is cached, the solve is not). Then clients threads send every request again at
+# the same time, the wall time of that is the throughput with the cache warm. The winners of the
+# daemon are checked against main.py.
+def benchmark_server(paths: list[str], sizes: list[int], max_priority: int, max_degree: int, strategy: str, other: str, workers: int, clients: int) -> None: 
+    print('{game:>24} {cli:>10} {first:>10} {repeated:>10} {other:>10}'.format(game='game', cli='main.py', first='first', repeated='repeated', other=other))
+    main_py = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    with tempfile.TemporaryDirectory() as directory: 
+        paths = [os.path.abspath(path) for path in paths + random_games(directory, sizes, max_priority, max_degree)]
+        socket_path = os.path.join(directory, 'solver.sock')
+        server = Process(target=SolveServer(socket_path, workers).serve)
+        server.start()
+        try: 
+            while not os.path.exists(socket_path): 
+                time.sleep(0.01)
+
+            def ask(path: str, name: str) -> tuple[dict, float]: 
+                start = time.perf_counter()
+                reply = request(socket_path, {'path': path, 'strategy': name})
+                if not reply['ok']: 
+                    raise RuntimeError('the server failed on {path}: {error}'.format(path=path, error=reply['error']))
+                return reply, time.perf_counter() - start
+
+            for path in paths: 
+                start = time.perf_counter()
+                output = subprocess.run([sys.executable, main_py, '-pg', path, '-s', strategy], capture_output=True, text=True, check=True).stdout
+                cli_time = time.perf_counter() - start
+                first, first_time = ask(path, strategy)
+                _, repeated_time = ask(path, strategy)
+                _, other_time = ask(path, other)
+                if 'Vertices that player odd wins: {n}\n'.format(n=first['result']['odd_wins']) not in output: 
+                    raise RuntimeError('main.py and the server disagree on {path}'.format(path=path))
+                print('{game:>24} {cli:>9.3f}s {first:>9.3f}s {repeated:>9.3f}s {other:>9.3f}s'.format(
+                    game=os.path.basename(path)[-24:], cli=cli_time, first=first_time, repeated=repeated_time, other=other_time))
+
+            # every client sends every request once more 
+            errors: list[Exception] = []
+            def client() -> None: 
+                try: 
+                    for path in paths: 
+                        for name in (strategy, other): 
+                            ask(path, name)
+                except Exception as e: 
+                    errors.append(e)
+            threads = [threading.Thread(target=client) for _ in range(clients)]
+            start = time.perf_counter()
+            for thread in threads: 
+                thread.start()
+            for thread in threads: 
+                thread.join()
+            wall_time = time.perf_counter() - start
+            if len(errors) > 0: 
+                raise errors[0]
+            n_requests = clients * len(paths) * 2
+            print('{n} requests from {clients} clients in {time:.3f}s, {rate:.0f} requests per second'.format(
+                n=n_requests, clients=clients, time=wall_time, rate=n_requests / wall_time))
+            stats = request(socket_path, {'command': 'stats'})['workers']
+            print('cache: {hits} hits, {misses} misses, {evictions} evictions, {mb:.1f} MB'.format(
+                hits=sum(s['hits'] for s in stats), misses=sum(s['misses'] for s in stats), 
+                evictions=sum(s['evictions'] for s in stats), mb=sum(s['bytes'] for s in stats) / (1 << 20)))
+        finally: 
+            if os.path.exists(socket_path): 
+                request(socket_path, {'command': 'shutdown'})
+            server.join()
+
+# Runs the suite of generated game families, writes the measurements as json lines and compares
+# them with a baseline. Exits with status 1 when something regressed.
+def benchmark_suite(arguments: argparse.Namespace) -> None: 
+    sizes = SUITE_SIZES
+    if arguments.families: 
+        sizes = {family: SUITE_SIZES[family] for family in arguments.families.split(',')}
+    if arguments.sizes: 
+        sizes = {family: arguments.sizes for family in sizes}
+    strategies = collect_strategies(arguments.strategy)
+    with open(arguments.output, 'w') as out: 
+        results = run_suite(sizes, strategies, arguments.engine, arguments.timeout, out)
+    print('Wrote {n} measurements to {path}'.format(n=len(results), path=arguments.output))
+    if arguments.baseline: 
+        regressions = compare_baseline(results, read_results(arguments.baseline), arguments.threshold)
+        for regression in regressions: 
+            print('Regression:', regression)
+        if len(regressions) > 0: 
+            sys.exit(1)
+        print('No regressions against', arguments.baseline)
+
+def parse_arguments() -> argparse.Namespace: 
+    parser = argparse.ArgumentParser(prog="SPM parity game solver benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    parse = subparsers.add_parser('parse', help="parse throughput on a generated random game")
+    parse.add_argument('-n', '--vertices', type=int, default=1000000)
+    parse.add_argument('-d', '--degree', type=int, default=4)
+    parse.add_argument('-p', '--priorities', type=int, default=8)
+    memory = subparsers.add_parser('memory', help="memory per vertex and per edge of the game representations on a generated random game")
+    memory.add_argument('-n', '--vertices', type=int, default=1000000)
+    memory.add_argument('-d', '--degree', type=int, default=4)
+    memory.add_argument('-p', '--priorities', type=int, default=8)
+    bulk = subparsers.add_parser('bulk', help="numpy bulk lifting against the combined strategy on generated random games")
+    bulk.add_argument('-n', '--vertices', type=int, nargs='+', default=[500, 1000, 2000, 3000])
+    bulk.add_argument('-d', '--degree', type=int, default=4)
+    bulk.add_argument('-p', '--priorities', type=int, default=8)
+    resolve = subparsers.add_parser('resolve', help="re-solving after random edits against solving the edited game from scratch")
+    resolve.add_argument('-n', '--vertices', type=int, default=2000)
+    resolve.add_argument('-d', '--degree', type=int, default=4)
+    resolve.add_argument('-p', '--priorities', type=int, default=8)
+    resolve.add_argument('-k', '--edits', type=int, default=1, help="edits before every re-solve")
+    resolve.add_argument('-s', '--strategy', default='combined')
+    resolve.add_argument('-r', '--repeats', type=int, default=5, help="re-solves per kind of edit, the averages are printed")
+    worklist = subparsers.add_parser('worklist', help="lifts and wall time of the worklist orderings of the backtrack strategy")
+    worklist.add_argument('paths', nargs='*', help="games to solve (default: examples/test_games/*.gm)")
+    worklist.add_argument('-n', '--vertices', type=int, nargs='*', default=[], help="sizes of generated random games to solve as well")
+    worklist.add_argument('-d', '--degree', type=int, default=4)
+    worklist.add_argument('-p', '--priorities', type=int, default=8)
+    worklist.add_argument('-s', '--strategy', default='backtrack,lifo,priority,magnitude,focus', help="comma separated strategies")
+    worklist.add_argument('-e', '--engine', default='tuple')
+    dual = subparsers.add_parser('dual', help="solving with the measures of odd against solving with the measures of both players")
+    dual.add_argument('paths', nargs='*', help="games to solve (default: examples/test_games/*.gm)")
+    dual.add_argument('-n', '--vertices', type=int, nargs='*', default=[], help="sizes of generated random games to solve as well")
+    dual.add_argument('-d', '--degree', type=int, default=4)
+    dual.add_argument('-p', '--priorities', type=int, default=8)
+    dual.add_argument('-s', '--strategy', default='backtrack')
+    dual.add_argument('-e', '--engine', default='tuple')
+    succinct = subparsers.add_parser('succinct', help="succinct measures against a classic engine on random games with many priorities")
+    succinct.add_argument('-n', '--vertices', type=int, nargs='+', default=[300, 1000])
+    succinct.add_argument('-p', '--priorities', type=int, nargs='+', default=[8, 16, 32])
+    succinct.add_argument('-d', '--degree', type=int, default=3)
+    succinct.add_argument('-s', '--strategy', default='combined')
+    succinct.add_argument('-e', '--engine', default='radix', help="classic engine to compare with (default: radix)")
+    succinct.add_argument('-t', '--timeout', type=float, default=20, help="seconds before a solve is stopped")
+    crosscheck = subparsers.add_parser('crosscheck', help="check zielonka against small progress measures on the test games and generated games")
+    crosscheck.add_argument('paths', nargs='*', help="games to solve (default: examples/test_games/*.gm)")
+    crosscheck.add_argument('-f', '--families', default=','.join(SUITE_SIZES), help="comma separated families to generate (default: all)")
+    crosscheck.add_argument('-n', '--sizes', type=int, nargs='+', help="sizes to generate for every family (default: per family, as in the suite)")
+    crosscheck.add_argument('-s', '--strategy', default='combined')
+    crosscheck.add_argument('-e', '--engine', default='radix')
+    crosscheck.add_argument('-t', '--timeout', type=float, default=60, help="seconds before a small progress measures solve is stopped")
+    parallel = subparsers.add_parser('parallel', help="speedup of the parallel strategy against the number of workers")
+    parallel.add_argument('paths', nargs='*', help="games to solve (default: none, only generated games)")
+    parallel.add_argument('-n', '--vertices', type=int, nargs='*', default=[1000, 3000], help="sizes of generated random games to solve")
+    parallel.add_argument('-d', '--degree', type=int, default=4)
+    parallel.add_argument('-p', '--priorities', type=int, default=8)
+    parallel.add_argument('-w', '--workers', type=int, nargs='+', default=[1, 2, 4, 8], help="numbers of workers to try, the first is the base of the speedup")
+    parallel.add_argument('-s', '--strategy', default='backtrack', help="serial strategy to compare with")
+    parallel.add_argument('-e', '--engine', default='radix')
+    server = subparsers.add_parser('server', help="a fresh main.py per solve against a solver daemon with a cache")
+    server.add_argument('paths', nargs='*', help="games to solve (default: examples/test_games/*.gm)")
+    server.add_argument('-n', '--vertices', type=int, nargs='*', default=[2000], help="sizes of generated random games to solve as well")
+    server.add_argument('-d', '--degree', type=int, default=4)
+    server.add_argument('-p', '--priorities', type=int, default=8)
+    server.add_argument('-s', '--strategy', default='combined')
+    server.add_argument('-o', '--other', default='zielonka', help="second strategy, solved on the cached game")
+    server.add_argument('-w', '--workers', type=int, default=2, help="solver processes of the daemon")
+    server.add_argument('-c', '--clients', type=int, default=4, help="clients sending requests at the same time")
+    suite = subparsers.add_parser('suite', help="solve generated game families with every strategy and compare with a baseline")
+    suite.add_argument('-f', '--families', help="comma separated families from: " + ', '.join(SUITE_SIZES) + " (default: all)")
+    suite.add_argument('-n', '--sizes', type=int, nargs='+', help="sizes to generate for every family (default: per family)")
+    suite.add_argument('-s', '--strategy', default='all', help="comma separated strategies (default: all)")
+    suite.add_argument('-e', '--engine', default='tuple')
+    suite.add_argument('-t', '--timeout', type=float, default=60, help="seconds before a solve is stopped")
+    suite.add_argument('-o', '--output', default='benchmark.jsonl')
+    suite.add_argument('--baseline', help="earlier suite output to compare with")
+    suite.add_argument('--threshold', type=float, default=0.2, help="allowed relative growth of lifts and wall time (default: 0.2)")
+    plot = subparsers.add_parser('plot', help="plot lifts and wall time per family from suite output")
+    plot.add_argument('results')
+    plot.add_argument('-d', '--directory', default='results')
+    return parser.parse_args()
+
+def main(): 
+    arguments = parse_arguments()
+    match arguments.benchmark: 
+        case 'parse': 
+            benchmark_parse(arguments.vertices, arguments.priorities, arguments.degree)
+        case 'memory': 
+            benchmark_memory(arguments.vertices, arguments.priorities, arguments.degree)
+        case 'bulk': 
+            benchmark_bulk(arguments.vertices, arguments.priorities, arguments.degree)
+        case 'resolve': 
+            benchmark_resolve(arguments.vertices, arguments.priorities, arguments.degree, arguments.edits, arguments.strategy, arguments.repeats)
+        case 'worklist': 
+            paths = arguments.paths or sorted(glob.glob(os.path.join('examples', 'test_games', '*.gm')))
+            benchmark_worklist(paths, arguments.vertices, arguments.priorities, arguments.degree, arguments.strategy.split(','), arguments.engine)
+        case 'dual': 
+            paths = arguments.paths or sorted(glob.glob(os.path.join('examples', 'test_games', '*.gm')))
+            benchmark_dual(paths, arguments.vertices, arguments.priorities, arguments.degree, arguments.strategy, arguments.engine)
+        case 'succinct': 
+            benchmark_succinct(arguments.vertices, arguments.priorities, arguments.degree, arguments.strategy, arguments.engine, arguments.timeout)
+        case 'crosscheck': 
+            paths = arguments.paths or sorted(glob.glob(os.path.join('examples', 'test_games', '*.gm')))
+            families = [family for family in arguments.families.split(',') if family != '']
+            sizes = {family: arguments.sizes or SUITE_SIZES[family] for family in families}
+            benchmark_crosscheck(paths, sizes, arguments.strategy, arguments.engine, arguments.timeout)
+        case 'parallel': 
+            benchmark_parallel(arguments.paths, arguments.vertices, arguments.priorities, arguments.degree, arguments.workers, arguments.strategy, arguments.engine)
+        case 'server': 
+            paths = arguments.paths or sorted(glob.glob(os.path.join('examples', 'test_games', '*.gm')))
+            benchmark_server(paths, arguments.vertices, arguments.priorities, arguments.degree, arguments.strategy, arguments.other, arguments.workers, arguments.clients)
+        case 'suite': 
+            benchmark_suite(arguments)
+        case 'plot': 
+            for path in plot_results(read_results(arguments.results), arguments.directory): 
+                print('Wrote', path)
+
+if __name__ == "__main__": 
+    main()
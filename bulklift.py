@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+
+# Solves the whole game with Jacobi rounds: every round computes the lift of all vertices at
+# once from the measures of the previous round, until a round changes nothing. Only vertices with
+# a successor that changed in the previous round can change, so a round only lifts those. Measures
+# are a matrix with one row per vertex holding the odd components (column c is tuple index 2c + 1)
+# and a separate top vector. The game is given in CSR form: the successors of v are
+# targets[offsets[v]:offsets[v + 1]]. The rounds start from the given measures and top vector,
+# vertices in frozen keep their initial measure. stop is asked after every round with the lifts so
+# far and ends the rounds early when it returns true.
+# Returns the measures, the top vector and counters: rounds, lifts, lifts that changed a measure,
+# measures that reached top and the number of prog computations (one per edge of a lifted vertex).
+def jacobi_solve(offsets: np.ndarray, targets: np.ndarray, priorities: np.ndarray, even_owned: np.ndarray,
+                 bounds: np.ndarray, measures: np.ndarray, top: np.ndarray, frozen: np.ndarray,
+                 stop: Callable[[int], bool] | None = None) -> tuple[np.ndarray, np.ndarray, dict]:
+    n = len(priorities)
+    k = len(bounds)
+    measures = measures.copy()
+    top = top.copy()
+
+    degree = np.diff(offsets)
+    # an even dead end can only go to top, an odd one stays at the empty measure
+    dead_even = (degree == 0) & even_owned
+    src = np.repeat(np.arange(n), degree)
+    dst = np.asarray(targets, dtype=np.int64)
+    # prog keeps the components up to the priority of the source and, for an odd priority,
+    # increments the last kept component
+    kept = (priorities + 1) // 2
+    increment_column = np.where(priorities % 2 == 1, kept - 1, -1)
+
+    active = ~frozen
+    counters = {'rounds': 0, 'lifts': 0, 'changed_lifts': 0, 'tops_reached': 0, 'prog_calls': 0}
+    while True:
+        lifting = np.flatnonzero(active)
+        if len(lifting) == 0 or (stop is not None and stop(counters['lifts'])):
+            return measures, top, counters
+        counters['rounds'] += 1
+        counters['lifts'] += len(lifting)
+
+        best = np.zeros((len(lifting), k), dtype=np.int64)
+        best_top = dead_even[lifting]
+        # the edges of the lifted vertices, grouped per vertex
+        lifting_degree = degree[lifting]
+        with_edges = lifting_degree > 0
+        n_edges = int(lifting_degree.sum())
+        counters['prog_calls'] += n_edges
+        if n_edges > 0:
+            segment_starts = np.cumsum(lifting_degree) - lifting_degree
+            edges = np.repeat(offsets[lifting] - segment_starts, lifting_degree) + np.arange(n_edges)
+            edge_src = src[edges]
+            mask = np.arange(k)[None, :] < kept[edge_src][:, None]
+            prog, prog_top = prog_edges(measures, top, dst[edges], mask, increment_column[edge_src], bounds)
+            rows, rows_top, rank = rank_rows(prog, prog_top)
+            # segment wise min (even) or max (odd) over the successors of every vertex
+            starts = segment_starts[with_edges]
+            best_rank = np.where(even_owned[lifting[with_edges]],
+                                 np.minimum.reduceat(rank, starts),
+                                 np.maximum.reduceat(rank, starts))
+            best[with_edges] = rows[best_rank]
+            best_top[with_edges] = rows_top[best_rank]
+
+        # the new measure is the max of the old one and the best successor
+        lifted = lexicographic_less(measures[lifting], top[lifting], best, best_top)
+        changed = lifting[lifted]
+        measures[changed] = best[lifted]
+        top[changed] = best_top[lifted]
+        counters['changed_lifts'] += len(changed)
+        counters['tops_reached'] += int(best_top[lifted].sum())
+
+        # the next round lifts the predecessors of the changed vertices
+        was_changed = np.zeros(n, dtype=bool)
+        was_changed[changed] = True
+        active = np.zeros(n, dtype=bool)
+        active[src[was_changed[dst]]] = True
+        active &= ~frozen
+
+def prog_edges(measures: np.ndarray, top: np.ndarray, dst: np.ndarray, mask: np.ndarray,
+               increment_column: np.ndarray, bounds: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    prog = np.where(mask, measures[dst], 0)
+    prog_top = top[dst].copy()
+    # add one at the increment column, carrying to the more significant (lower) columns
+    carry = np.zeros(len(dst), dtype=bool)
+    for c in range(len(bounds) - 1, -1, -1):
+        column = prog[:, c] + (carry | (increment_column == c))
+        carry = column > bounds[c]
+        column[carry] = 0
+        prog[:, c] = column
+    prog_top |= carry
+    # the values of a top measure do not matter, clear them so all tops are equal
+    prog[prog_top] = 0
+    return prog, prog_top
+
+# Gives every row a rank such that rows compare like their ranks, top being the largest.
+# Returns the distinct rows (indexed by rank), their top flags and the rank of every row.
+def rank_rows(rows: np.ndarray, rows_top: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    k = rows.shape[1]
+    # lexsort uses the last key as the primary one
+    order = np.lexsort(tuple(rows[:, c] for c in reversed(range(k))) + (rows_top,))
+    sorted_rows = rows[order]
+    sorted_top = rows_top[order]
+    new_group = np.ones(len(order), dtype=bool)
+    new_group[1:] = (sorted_rows[1:] != sorted_rows[:-1]).any(axis=1) | (sorted_top[1:] != sorted_top[:-1])
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.cumsum(new_group) - 1
+    return sorted_rows[new_group], sorted_top[new_group], rank
+
+# Row wise a < b, a top row is never smaller and every other row is smaller than a top row
+def lexicographic_less(a: np.ndarray, a_top: np.ndarray, b: np.ndarray, b_top: np.ndarray) -> np.ndarray:
+    if a.shape[1] == 0:
+        return ~a_top & b_top
+    different = a != b
+    first = different.argmax(axis=1)
+    index = np.arange(len(a))
+    smaller = different.any(axis=1) & (a[index, first] < b[index, first])
+    return ~a_top & (b_top | smaller)
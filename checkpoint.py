@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+import struct
+from array import array
+
+# Binary checkpoint of a solve that was stopped (or is still running): the measures, the stability
+# flags and the queue state of the lift strategy. The layout is a fixed header followed by the
+# measure rows, the stability flags and the strategy state, each aligned to 8 bytes. A measure row
+# holds the odd components of the tuple (component c is tuple index 2c + 1) and a top flag.
+# Measures only go up and a checkpoint is never above the fixpoint, so resuming from it reaches
+# the same fixpoint as an uninterrupted solve.
+CHECKPOINT_MAGIC = b'SPMK'
+CHECKPOINT_VERSION = 1
+# magic, version, n_vertices, n_edges, max_priority, strategy, engine, lifts, changed lifts, tops reached, state length
+HEADER = struct.Struct('<4sIqqqqqqqqq')
+
+def padding(size: int) -> int:
+    return (8 - size % 8) % 8
+
+class Checkpoint:
+
+    def __init__(self, n_vertices: int, n_edges: int, max_priority: int, strategy: int, engine: int) -> None:
+        self.n_vertices: int = n_vertices
+        self.n_edges: int = n_edges
+        self.max_priority: int = max_priority
+        self.strategy: int = strategy
+        self.engine: int = engine
+        self.components: int = (max_priority + 1) // 2
+        self.lifts: int = 0
+        self.changed_lifts: int = 0
+        self.tops_reached: int = 0
+        self.measures: array = array('i', bytes(4 * n_vertices * (self.components + 1)))
+        self.stable: bytearray = bytearray(n_vertices)
+        self.state: array = array('q')
+
+    # (odd components, top) of vertex v
+    def get_measure(self, v: int) -> tuple[list[int], bool]:
+        row_size = self.components + 1
+        row = self.measures[v * row_size: (v + 1) * row_size]
+        return list(row[:self.components]), row[self.components] != 0
+
+    def set_measure(self, v: int, components: list[int], top: bool) -> None:
+        base = v * (self.components + 1)
+        self.measures[base: base + self.components] = array('i', components)
+        self.measures[base + self.components] = 1 if top else 0
+
+    def write(self, path: str) -> None:
+        header = HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, self.n_vertices, self.n_edges, self.max_priority,
+                             self.strategy, self.engine, self.lifts, self.changed_lifts, self.tops_reached, len(self.state))
+        # write to a temporary file first so a crash while writing keeps the previous checkpoint
+        tmp_path = '{path}.{pid}.tmp'.format(path=path, pid=os.getpid())
+        with open(tmp_path, 'wb') as file:
+            file.write(header)
+            file.write(b'\0' * padding(len(header)))
+            for values in (self.measures, self.stable, self.state):
+                data = bytes(values)
+                file.write(data)
+                file.write(b'\0' * padding(len(data)))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def read(path: str) -> Checkpoint:
+        with open(path, 'rb') as file:
+            data = file.read()
+        if len(data) < HEADER.size:
+            raise ValueError('{path} is not a checkpoint'.format(path=path))
+        magic, version, n_vertices, n_edges, max_priority, strategy, engine, lifts, changed_lifts, tops_reached, state_length = HEADER.unpack_from(data, 0)
+        if magic != CHECKPOINT_MAGIC or version != CHECKPOINT_VERSION:
+            raise ValueError('{path} is not a checkpoint of this version'.format(path=path))
+
+        checkpoint = Checkpoint(n_vertices, n_edges, max_priority, strategy, engine)
+        checkpoint.lifts = lifts
+        checkpoint.changed_lifts = changed_lifts
+        checkpoint.tops_reached = tops_reached
+        offset = HEADER.size + padding(HEADER.size)
+        for name, typecode, length in (('measures', 'i', len(checkpoint.measures)), ('stable', 'B', n_vertices), ('state', 'q', state_length)):
+            values = array(typecode)
+            size = length * values.itemsize
+            values.frombytes(data[offset: offset + size])
+            offset += size + padding(size)
+            setattr(checkpoint, name, bytearray(values) if name == 'stable' else values)
+        return checkpoint
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+
+from gameparser import GameGraph, NameTable, parse_game
+
+# Binary cache of a parsed game, written next to the .gm file. The layout is a fixed header
+# followed by the arrays of the GameGraph, each aligned to 8 bytes, and the names joined by
+# '\0'. Loading memory-maps the file and uses the arrays in place, so startup does not
+# depend on the size of the game.
+CACHE_SUFFIX = '.spmcache'
+CACHE_MAGIC = b'SPMG'
+CACHE_VERSION = 1
+# magic, version, n_vertices, n_edges, max_priority, start, source size, source mtime, source sha256, names size
+HEADER = struct.Struct('<4sIqqqqqq32sq')
+# where the source mtime is in the header, it is rewritten when only the mtime of the source changed
+MTIME = struct.Struct('<q')
+MTIME_OFFSET = struct.calcsize('<4sIqqqqq')
+
+def cache_path(filepath: str) -> str:
+    return filepath + CACHE_SUFFIX
+
+def source_hash(filepath: str) -> bytes:
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+# size, mtime and sha256 of the source file. It is taken before the file is parsed: when the file
+# changes while it is parsed, the cache then belongs to the old contents and is not used.
+def source_stamp(filepath: str) -> tuple[int, int, bytes]:
+    stat = os.stat(filepath)
+    return stat.st_size, stat.st_mtime_ns, source_hash(filepath)
+
+def padding(size: int) -> int:
+    return (8 - size % 8) % 8
+
+def write_cache(graph: GameGraph, filepath: str, stamp: tuple[int, int, bytes]) -> None:
+    size, mtime, sha = stamp
+    names = graph.names.to_joined()
+    header = HEADER.pack(CACHE_MAGIC, CACHE_VERSION, graph.n_vertices, graph.n_edges, graph.max_priority,
+                         graph.start, size, mtime, sha, len(names))
+    # write to a temporary file first so a reader never sees a half written cache
+    tmp_path = '{path}.{pid}.tmp'.format(path=cache_path(filepath), pid=os.getpid())
+    with open(tmp_path, 'wb') as file:
+        file.write(header)
+        file.write(b'\0' * padding(len(header)))
+        for values in (graph.priorities, graph.owners, graph.succ_offsets, graph.succ_targets,
+                       graph.pred_offsets, graph.pred_targets):
+            data = bytes(values)
+            file.write(data)
+            file.write(b'\0' * padding(len(data)))
+        file.write(names)
+    os.replace(tmp_path, cache_path(filepath))
+
+# Returns the cached graph, or None if there is no cache or it does not belong to the
+# current contents of the source file
+def load_cache(filepath: str) -> GameGraph | None:
+    path = cache_path(filepath)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size < HEADER.size:
+            return None
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, n_vertices, n_edges, max_priority, start, size, mtime, sha, names_size = HEADER.unpack_from(buffer, 0)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION:
+        return None
+    stat = os.stat(filepath)
+    if stat.st_size != size:
+        return None
+    # an unchanged mtime is trusted, otherwise the contents decide
+    if stat.st_mtime_ns != mtime:
+        if source_hash(filepath) != sha:
+            return None
+        # the same contents with a new mtime (touched, copied, checked out again), store the new
+        # mtime so the next load does not hash the source again
+        try:
+            with open(path, 'r+b') as file:
+                file.seek(MTIME_OFFSET)
+                file.write(MTIME.pack(stat.st_mtime_ns))
+        except OSError:
+            pass
+
+    view = memoryview(buffer)
+    offset = HEADER.size + padding(HEADER.size)
+
+    def take(typecode: str, length: int) -> memoryview:
+        nonlocal offset
+        itemsize = array(typecode).itemsize
+        values = view[offset: offset + length * itemsize].cast(typecode)
+        offset += length * itemsize + padding(length * itemsize)
+        return values
+
+    graph = GameGraph(0)
+    graph.n_vertices = n_vertices
+    graph.max_priority = max_priority
+    graph.start = start
+    # the arrays are read only views on the memory-mapped file
+    graph.priorities = take('i', n_vertices)
+    graph.owners = take('b', n_vertices)
+    graph.succ_offsets = take('q', n_vertices + 1)
+    graph.succ_targets = take('i', n_edges)
+    graph.pred_offsets = take('q', n_vertices + 1)
+    graph.pred_targets = take('i', n_edges)
+    graph.names = NameTable.from_joined(bytes(view[offset: offset + names_size]), n_vertices)
+    graph.buffer = buffer
+    return graph
+
+# Parses the game, reusing the binary cache next to the file when it is up to date
+def load_game(filepath: str, use_cache: bool = True, rebuild_cache: bool = False) -> GameGraph:
+    if use_cache and not rebuild_cache:
+        graph = load_cache(filepath)
+        if graph is not None:
+            return graph
+    stamp = source_stamp(filepath) if use_cache else None
+    graph = parse_game(filepath)
+    if use_cache:
+        try:
+            write_cache(graph, filepath, stamp)
+        except OSError:
+            # the cache is only an optimization, a read only directory is fine
+            pass
+    return graph
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from array import array
+from typing import Iterator, TextIO
+
+from vertex import Vertex, Player
+
+# Names of the vertices of a game, utf-8 encoded in one buffer with the start and end of every name.
+# A name is only decoded into a str when it is asked for, so a game with a million named vertices
+# does not hold a million strings. A table loaded from the cache keeps the names joined by '\0' and
+# only finds where every name starts on the first lookup.
+class NameTable:
+
+    def __init__(self, n_vertices: int) -> None:
+        self.n_vertices: int = n_vertices
+        self.data: bytearray = bytearray()
+        self.starts: array = array('q', [0]) * n_vertices
+        self.ends: array = array('q', [0]) * n_vertices
+        self.joined: bytes | None = None
+
+    @staticmethod
+    def from_joined(joined: bytes, n_vertices: int) -> NameTable:
+        table = NameTable(0)
+        table.n_vertices = n_vertices
+        table.joined = joined
+        return table
+
+    def __split(self) -> None:
+        self.data = bytearray(self.joined)
+        self.joined = None
+        self.starts = array('q')
+        self.ends = array('q')
+        start = 0
+        for _ in range(self.n_vertices):
+            end = self.data.find(b'\0', start)
+            if end == -1:
+                end = len(self.data)
+            self.starts.append(start)
+            self.ends.append(end)
+            start = end + 1
+
+    def __getitem__(self, v: int) -> str:
+        if self.joined is not None:
+            self.__split()
+        return self.data[self.starts[v]: self.ends[v]].decode('utf-8')
+
+    def __setitem__(self, v: int, name: str) -> None:
+        if self.joined is not None:
+            self.__split()
+        # the bytes of an overwritten name stay in the buffer
+        encoded = name.encode('utf-8')
+        self.starts[v] = len(self.data)
+        self.data += encoded
+        self.ends[v] = len(self.data)
+
+    def __len__(self) -> int:
+        return self.n_vertices
+
+    def __iter__(self) -> Iterator[str]:
+        for v in range(self.n_vertices):
+            yield self[v]
+
+    # the names joined by '\0', as stored in the cache
+    def to_joined(self) -> bytes:
+        if self.joined is not None:
+            return self.joined
+        return b'\0'.join(self.data[self.starts[v]: self.ends[v]] for v in range(self.n_vertices))
+
+# Compact representation of a parsed parity game. Successors and predecessors are stored in
+# compressed sparse row (CSR) form: the successors of vertex v are
+# succ_targets[succ_offsets[v]:succ_offsets[v + 1]], and the same for the predecessors.
+# Owners are stored as in the file, 1 means player even and 0 means player odd. A graph loaded
+# from the binary cache holds read only memoryviews on the mapped file instead of arrays.
+class GameGraph:
+
+    def __init__(self, n_vertices: int) -> None:
+        self.n_vertices: int = n_vertices
+        self.max_priority: int = -1
+        self.start: int = 0
+        self.priorities: array = array('i', [0]) * n_vertices
+        self.owners: array = array('b', [1]) * n_vertices
+        self.names: NameTable = NameTable(n_vertices)
+        self.succ_offsets: array = array('q', [0]) * (n_vertices + 1)
+        self.succ_targets: array = array('i')
+        self.pred_offsets: array = array('q', [0]) * (n_vertices + 1)
+        self.pred_targets: array = array('i')
+        self.buffer = None # memory map backing the arrays of a cached graph
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.succ_targets)
+
+    def successors(self, v: int) -> array:
+        return self.succ_targets[self.succ_offsets[v]: self.succ_offsets[v + 1]]
+
+    def predecessors(self, v: int) -> array:
+        return self.pred_targets[self.pred_offsets[v]: self.pred_offsets[v + 1]]
+
+    # Builds the Vertex objects of the game, only done when a caller asks for them. The vertices
+    # look their names up in the name table of this graph.
+    def build_vertices(self) -> list[Vertex]:
+        vertices: list[Vertex] = [Vertex(id=i, names=self.names) for i in range(self.n_vertices)]
+        for v in vertices:
+            v.priority = self.priorities[v.id]
+            v.even_priority = (v.priority % 2) == 0
+            v.owner = Player.EVEN if self.owners[v.id] else Player.ODD
+            successors = self.successors(v.id)
+            if len(successors) > 1:
+                # the file may list an edge twice
+                successors = dict.fromkeys(successors)
+            for w in successors:
+                v.next.append(vertices[w])
+                vertices[w].prev.append(v)
+        for v in vertices:
+            v.check_odd_self_loop()
+        return vertices
+
+# Splits the file into entries ending in ';' while reading it in chunks, so the whole file
+# is never in memory. A ';' inside a quoted name does not end an entry.
+def read_entries(file: TextIO, chunk_size: int = 1 << 20) -> Iterator[str]:
+    rest = ''
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        pieces = (rest + chunk).split(';')
+        rest = pieces.pop()
+        pending: str | None = None
+        for piece in pieces:
+            if pending is not None:
+                piece = pending + ';' + piece
+                pending = None
+            # an odd amount of quotes means the ';' was part of a name
+            if piece.count('"') % 2 == 1:
+                pending = piece
+                continue
+            yield piece
+        if pending is not None:
+            rest = pending + ';' + rest
+    if rest.strip():
+        yield rest
+
+# CSR offsets for an edge list whose sources are src
+def build_offsets(n_vertices: int, src: array) -> array:
+    offsets: array = array('q', [0]) * (n_vertices + 1)
+    for s in src:
+        offsets[s + 1] += 1
+    for i in range(n_vertices):
+        offsets[i + 1] += offsets[i]
+    return offsets
+
+# Counting sort of the edge list (src, dst) into CSR offsets and targets
+def build_csr(n_vertices: int, src: array, dst: array) -> tuple[array, array]:
+    offsets: array = build_offsets(n_vertices, src)
+    position: array = offsets[:-1]
+    targets: array = array('i', [0]) * len(src)
+    for s, d in zip(src, dst):
+        targets[position[s]] = d
+        position[s] += 1
+    return offsets, targets
+
+# Parses a game in PGSolver format: a 'parity <max id>;' header, an optional 'start <id>;'
+# header and entries '<id> <priority> <owner> <successor>,<successor>,... ["name"];' that may
+# be spread over several lines.
+def parse_game(filepath: str, keep_names: bool = True, chunk_size: int = 1 << 20) -> GameGraph:
+    graph: GameGraph | None = None
+    start: int = 0
+    src: array = array('i')
+    dst: array = array('i')
+    in_order: bool = True # successor lists already sorted by vertex id, no sort needed
+    last_id: int = -1
+
+    with open(filepath, 'r') as file:
+        for entry in read_entries(file, chunk_size):
+            tokens = entry.split()
+            if len(tokens) == 0:
+                continue
+            if tokens[0] == 'parity':
+                graph = GameGraph(int(tokens[1]) + 1)
+                continue
+            if tokens[0] == 'start':
+                start = int(tokens[1])
+                continue
+            if graph is None:
+                raise ValueError('{file}: vertex entry before the parity header'.format(file=filepath))
+
+            id = int(tokens[0])
+            priority = int(tokens[1])
+            graph.priorities[id] = priority
+            graph.owners[id] = 1 if int(tokens[2]) else 0
+            if priority > graph.max_priority:
+                graph.max_priority = priority
+
+            # successors may be written as '1,2' or as '1, 2', a dead end has none
+            i = 3
+            successors = tokens[i] if len(tokens) > i and not tokens[i].startswith('"') else ''
+            while successors.endswith(',') and i + 1 < len(tokens):
+                i += 1
+                successors += tokens[i]
+            if successors == '':
+                i -= 1
+            targets = [int(w) for w in successors.split(',') if w != '']
+            dst.extend(targets)
+            src.extend([id] * len(targets))
+            if id < last_id:
+                in_order = False
+            last_id = id
+
+            if keep_names and len(tokens) > i + 1:
+                graph.names[id] = " ".join(tokens[i + 1:]).strip("\"")
+
+    if graph is None:
+        raise ValueError('{file}: missing parity header'.format(file=filepath))
+    graph.start = start
+
+    if in_order:
+        graph.succ_offsets = build_offsets(graph.n_vertices, src)
+        graph.succ_targets = dst
+    else:
+        graph.succ_offsets, graph.succ_targets = build_csr(graph.n_vertices, src, dst)
+    graph.pred_offsets, graph.pred_targets = build_csr(graph.n_vertices, dst, src)
+    return graph
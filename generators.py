@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import itertools
+import random
+from typing import Callable
+
+from vertex import Player
+
+# A generated vertex: (priority, owner, successors, name)
+GameVertex = tuple[int, Player, list[int], str]
+
+# Writes the vertices in PGSolver format, the owner is written as the value of the player
+def write_game(path: str, vertices: list[GameVertex]) -> None:
+    with open(path, 'w') as file:
+        file.write('parity {n};\n'.format(n=len(vertices) - 1))
+        for v, (priority, owner, successors, name) in enumerate(vertices):
+            file.write('{v} {priority} {owner} {successors} "{name}";\n'.format(
+                v=v,
+                priority=priority,
+                owner=owner.value,
+                successors=','.join(str(w) for w in successors),
+                name=name))
+
+# Writes a random game in PGSolver format with n_vertices vertices, priorities in
+# [0, max_priority] and between 1 and max_degree successors per vertex
+def write_random_game(path: str, n_vertices: int, max_priority: int, max_degree: int, seed: int = 1234) -> None:
+    rng = random.Random(seed)
+    vertices: list[GameVertex] = []
+    for v in range(n_vertices):
+        successors = sorted(set(rng.randrange(n_vertices) for _ in range(rng.randint(1, max_degree))))
+        vertices.append((rng.randint(0, max_priority), Player.EVEN if rng.randint(0, 1) else Player.ODD, successors, 'v{v}'.format(v=v)))
+    write_game(path, vertices)
+
+# A ladder of n rungs: every rung has an even vertex with priority 2 and an odd vertex with
+# priority 1 that can cross to each other or climb to the next rung, the top rung goes back to
+# the bottom. Both players win their own side of the ladder by climbing forever, so the measures
+# of the odd side have to count up to top.
+def write_ladder_game(path: str, rungs: int) -> None:
+    vertices: list[GameVertex] = []
+    for i in range(rungs):
+        up = (i + 1) % rungs
+        vertices.append((2, Player.EVEN, [2 * i + 1, 2 * up], 'a{i}'.format(i=i)))
+        vertices.append((1, Player.ODD, [2 * i, 2 * up + 1], 'b{i}'.format(i=i)))
+    write_game(path, vertices)
+
+# A game in the style of Jurdzinski's lower bound for small progress measures: levels of
+# blocks, level i has blocks vertices with priority 2i + 1 between blocks + 1 vertices with
+# priority 2i + 2. Even can only move within a level, odd can also move up a level, and the top
+# level returns to the bottom. Odd wins everywhere, but the measures only get to top after
+# counting through the odd vertices of every level.
+def write_jurdzinski_game(path: str, levels: int, blocks: int = 3) -> None:
+    per_level = 2 * blocks + 1
+
+    def even_vertex(level: int, j: int) -> int:
+        return level * per_level + 2 * j
+    def odd_vertex(level: int, j: int) -> int:
+        return level * per_level + 2 * j + 1
+
+    vertices: list[GameVertex] = []
+    for level in range(levels):
+        up = even_vertex((level + 1) % levels, 0)
+        for j in range(blocks + 1):
+            successors = [odd_vertex(level, j - 1)] if j > 0 else []
+            if j < blocks:
+                successors.append(odd_vertex(level, j))
+            vertices.append((2 * level + 2, Player.ODD, successors + [up], 'e{level}_{j}'.format(level=level, j=j)))
+            if j < blocks:
+                vertices.append((2 * level + 1, Player.EVEN, [even_vertex(level, j), even_vertex(level, j + 1)],
+                                 'o{level}_{j}'.format(level=level, j=j)))
+    write_game(path, vertices)
+
+# An elevator serving floors floors. Odd (the environment) serves the request at the current
+# floor and can add a request for a floor, then even (the controller) moves the elevator one
+# floor up or down, or stays. Priority 0 when a request is served, 1 while requests are waiting
+# and 2 without requests: even wins when waiting requests keep getting served.
+def write_elevator_game(path: str, floors: int) -> None:
+    states = [(position, requests) for position in range(floors) for requests in range(1 << floors)]
+    index = {state: i for i, state in enumerate(states)}
+    n_states = len(states)
+    vertices: list[GameVertex] = []
+    # environment vertices first, then the controller vertex of every state
+    for position, requests in states:
+        waiting = requests & ~(1 << position)
+        successors = sorted(set([n_states + index[(position, waiting)]] +
+                                [n_states + index[(position, waiting | (1 << floor))] for floor in range(floors)]))
+        if requests & (1 << position):
+            priority = 0
+        else:
+            priority = 1 if requests else 2
+        vertices.append((priority, Player.ODD, successors, 'env_{p}_{r}'.format(p=position, r=requests)))
+    for position, requests in states:
+        successors = set()
+        for move in (-1, 0, 1):
+            new_position = position + move
+            if 0 <= new_position < floors:
+                successors.add(index[(new_position, requests)])
+        vertices.append((1 if requests else 2, Player.EVEN, sorted(successors), 'ctrl_{p}_{r}'.format(p=position, r=requests)))
+    write_game(path, vertices)
+
+# Dining philosophers around a table, every philosopher thinks, is hungry or eats and two
+# neighbours never eat at the same time. Odd (the scheduler) picks the philosopher that moves,
+# even (the arbiter) decides whether a hungry philosopher with free forks starts eating or
+# waits. Priority 0 while philosopher 0 eats and 1 otherwise: even wins when philosopher 0
+# eats infinitely often.
+THINKING, HUNGRY, EATING = 0, 1, 2
+
+def write_philosophers_game(path: str, philosophers: int) -> None:
+    n = philosophers
+
+    def valid(state: tuple[int, ...]) -> bool:
+        return all(not (state[i] == EATING and state[(i + 1) % n] == EATING) for i in range(n)) if n > 1 else True
+
+    states = [state for state in itertools.product((THINKING, HUNGRY, EATING), repeat=n) if valid(state)]
+    index = {state: i for i, state in enumerate(states)}
+    n_states = len(states)
+
+    def replace(state: tuple[int, ...], i: int, value: int) -> tuple[int, ...]:
+        return state[:i] + (value,) + state[i + 1:]
+
+    def can_eat(state: tuple[int, ...], i: int) -> bool:
+        return n == 1 or (state[(i - 1) % n] != EATING and state[(i + 1) % n] != EATING)
+
+    vertices: list[GameVertex] = []
+    # scheduler vertices, followed by one arbiter vertex per (state, hungry philosopher)
+    arbiters: list[tuple[tuple[int, ...], int]] = []
+    for state in states:
+        successors: set[int] = set()
+        for i in range(n):
+            if state[i] == THINKING:
+                successors.add(index[replace(state, i, HUNGRY)])
+            elif state[i] == HUNGRY:
+                successors.add(n_states + len(arbiters))
+                arbiters.append((state, i))
+            else:
+                successors.add(index[replace(state, i, THINKING)])
+        name = 'sched_' + ''.join(str(s) for s in state)
+        vertices.append((0 if state[0] == EATING else 1, Player.ODD, sorted(successors), name))
+    for state, i in arbiters:
+        successors = {index[state]}
+        if can_eat(state, i):
+            successors.add(index[replace(state, i, EATING)])
+        name = 'arbiter_{i}_'.format(i=i) + ''.join(str(s) for s in state)
+        vertices.append((0 if state[0] == EATING else 1, Player.EVEN, sorted(successors), name))
+    write_game(path, vertices)
+
+# The generated families by name, a generator writes the game of the given size to a path
+FAMILIES: dict[str, Callable[[str, int], None]] = {
+    'random': lambda path, size: write_random_game(path, size, 8, 4),
+    'ladder': write_ladder_game,
+    'jurdzinski': lambda path, size: write_jurdzinski_game(path, size, size),
+    'elevator': write_elevator_game,
+    'philosophers': write_philosophers_game,
+}
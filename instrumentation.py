@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Iterator, TextIO
+
+# Adds the wall time of the block to times[name], so a phase that runs more than once is summed
+@contextmanager
+def phase(times: dict[str, float], name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        times[name] = times.get(name, 0.0) + time.perf_counter() - start
+
+# Progress callback that writes one line per report, as json when as_json is set so it can be scraped
+def progress_printer(out: TextIO = sys.stderr, as_json: bool = False) -> Callable[[dict], None]:
+    def progress(report: dict) -> None:
+        if as_json:
+            out.write(json.dumps(report) + '\n')
+        else:
+            line = '{elapsed:.1f}s: {lifts} lifts, {changed_lifts} changed a measure, {tops_reached} reached top, {unstable} unstable'.format(**report)
+            if 'odd_decided' in report: 
+                line += ', {odd_decided} won by odd, {even_decided} won by even'.format(**report)
+            out.write(line + '\n')
+        out.flush()
+    return progress
+
+# Runs fn under cProfile, writes the stats to path when given (they can be read with pstats) and
+# prints the functions that took the most cumulative time
+def profiled(fn: Callable[[], None], path: str | None = None, amount: int = 20) -> None:
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        fn()
+    finally:
+        profile.disable()
+        if path:
+            profile.dump_stats(path)
+        output = io.StringIO()
+        pstats.Stats(profile, stream=output).sort_stats('cumulative').print_stats(amount)
+        print(output.getvalue())
+
+# Runs fn while tracemalloc traces the allocations, prints the peak and the lines that hold the
+# most memory at the end. Returns the peak in bytes.
+def traced(fn: Callable[[], None], amount: int = 10) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    print('Peak traced memory: {mb:.1f} MB'.format(mb=peak / (1 << 20)))
+    for stat in snapshot.statistics('lineno')[:amount]:
+        print(' ', stat)
+    return peak
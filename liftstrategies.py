@@ -1,15 +1,25 @@
 from __future__ import annotations
 
 from vertex import Vertex, Player
+from measurestore import MeasureStore
+from worklist import Worklist, FifoWorklist, LifoWorklist, HeapWorklist
 
 import random 
-from queue import Queue, PriorityQueue
+from collections import deque
 
+# A lift strategy decides the order in which the given vertices are lifted. The vertices can be 
+# a part of the game (for example one SCC), vertices outside of it are never queued. 
 class LiftStrategy: 
 
-    def __init__(self, vertices: list[Vertex]): 
+    def __init__(self, vertices: list[Vertex], measures: MeasureStore): 
         self.vertices = vertices
         self.n_vertices = len(vertices)
+        self.measures = measures
+        # number of vertices that still need to be lifted, kept up to date by set_stable 
+        self.n_unstable = 0 
+        for v in vertices: 
+            if not v.stable: 
+                self.n_unstable += 1
 
     def next_vertex(self) -> Vertex: 
         pass 
@@ -17,59 +27,239 @@ class LiftStrategy:
     def was_lifted(self, v: Vertex) -> None: 
         pass 
 
+    def set_stable(self, v: Vertex, stable: bool) -> None: 
+        if (v.stable != stable): 
+            self.n_unstable += -1 if stable else 1
+            v.stable = stable
+
+    # the solver stops as soon as this returns true 
+    def is_finished(self) -> bool: 
+        return self.n_unstable == 0
+
+    # number of vertices that may still be lifted, for progress reports 
+    def pending(self) -> int: 
+        return self.n_unstable
+
+    # strategy specific statistics of the last solve 
+    def counters(self) -> dict: 
+        return {}
+
+    # the position of the strategy as integers, so a checkpoint can continue where it stopped 
+    def save_state(self) -> list[int]: 
+        return []
+
+    # continues from a state made by save_state of the same strategy on the same vertices 
+    def load_state(self, state: list[int]) -> None: 
+        pass
+
+    # queue only the given vertices at the start, the strategies that go round all vertices ignore this 
+    def start_with(self, vertices: list[Vertex]) -> None: 
+        pass
+
 class InputLiftStrategy(LiftStrategy): 
     
-    def __init__(self, vertices: list[Vertex]): 
-        super().__init__(vertices)
+    def __init__(self, vertices: list[Vertex], measures: MeasureStore): 
+        super().__init__(vertices, measures)
         self.count = 0 
+        self.unchanged = 0 # lifts since the last change, a full pass without change means we are done 
 
     def next_vertex(self) -> Vertex: 
         v: Vertex = self.vertices[self.count]
         self.count = (self.count + 1) % self.n_vertices
+        self.unchanged += 1
         return v 
+
+    def was_lifted(self, v: Vertex) -> None: 
+        self.unchanged = 0 
+
+    def is_finished(self) -> bool: 
+        return self.unchanged >= self.n_vertices or super().is_finished()
+
+    def save_state(self) -> list[int]: 
+        return [self.count, self.unchanged]
+
+    def load_state(self, state: list[int]) -> None: 
+        self.count, self.unchanged = state
     
 class RandomLiftStrategy(LiftStrategy): 
     
-    def __init__(self, vertices: list[Vertex]): 
-        super().__init__(vertices)
+    def __init__(self, vertices: list[Vertex], measures: MeasureStore): 
+        super().__init__(vertices, measures)
         
-        random.seed(1234)
-        self.vertices = random.sample(vertices, self.n_vertices)  
+        # own generator so solving games side by side does not share random state 
+        self.random = random.Random(1234)
+        self.vertices = self.random.sample(vertices, self.n_vertices)  
         self.count = 0 
+        self.unchanged = 0 # lifts since the last change, a full pass without change means we are done 
 
     def next_vertex(self) -> Vertex: 
         v: Vertex = self.vertices[self.count]
         self.count = (self.count + 1) % self.n_vertices
+        self.unchanged += 1
         return v 
 
+    def was_lifted(self, v: Vertex) -> None: 
+        self.unchanged = 0 
+
+    def is_finished(self) -> bool: 
+        return self.unchanged >= self.n_vertices or super().is_finished()
+
+    def save_state(self) -> list[int]: 
+        return [self.count, self.unchanged]
+
+    def load_state(self, state: list[int]) -> None: 
+        self.count, self.unchanged = state
+
+# Every vertex is lifted once, after that a vertex is only lifted again when one of its successors 
+# changed. The worklist decides which of those vertices goes first, first in first out here, the 
+# subclasses below only change the worklist. 
 class BackTrackLiftStrategy(LiftStrategy): 
     
-    def __init__(self, vertices: list[Vertex]): 
-        super().__init__(vertices)
-        self.Q: Queue[Vertex] = Queue(maxsize=self.n_vertices)
-        self.in_queue: list[bool] = [True for i in range(self.n_vertices)] 
+    def __init__(self, vertices: list[Vertex], measures: MeasureStore): 
+        super().__init__(vertices, measures)
+        self.Q: Worklist = self.new_worklist()
         for v in self.vertices: 
-            self.Q.put(v)
+            self.Q.add(v)
+
+    def new_worklist(self) -> Worklist: 
+        return FifoWorklist(self.measures.n_vertices, self.vertices)
 
     def next_vertex(self) -> Vertex: 
-        if (self.Q.empty()): 
-            return None
-        else: 
-            v: Vertex = self.Q.get()
-            self.in_queue[v.id] = False
-            return v 
+        return self.Q.take()
         
     def was_lifted(self, v: Vertex): 
+        is_top = self.measures.is_top
         for w in v.prev: 
-            if (not self.in_queue[w.id] and not w.tuple.top): 
-                self.in_queue[w.id] = True 
-                self.Q.put(w)
+            if not is_top(w): 
+                self.Q.add(w)
+
+    # every vertex that can still change is in the worklist, the stability flags do not say that: 
+    # a vertex that was stable is not marked unstable when it is added again 
+    def is_finished(self) -> bool: 
+        return len(self.Q) == 0
+
+    def pending(self) -> int: 
+        return len(self.Q)
+
+    def counters(self) -> dict: 
+        return {'queue_high_water': self.Q.high_water}
+
+    # the ids in the worklist, in the order they are taken 
+    def save_state(self) -> list[int]: 
+        return [v.id for v in self.Q.vertices()]
+
+    def load_state(self, state: list[int]) -> None: 
+        self.Q = self.new_worklist()
+        for id in state: 
+            self.Q.add(self.measures.vertices[id])
+
+    def start_with(self, vertices: list[Vertex]) -> None: 
+        self.load_state([v.id for v in vertices])
+
+class LifoLiftStrategy(BackTrackLiftStrategy): 
+
+    def new_worklist(self) -> Worklist: 
+        return LifoWorklist(self.measures.n_vertices, self.vertices)
+
+# Lifts the vertices with the most significant priority first: the lowest priority, which is the 
+# first component of the measures 
+class PriorityLiftStrategy(BackTrackLiftStrategy): 
+
+    def new_worklist(self) -> Worklist: 
+        return HeapWorklist(self.measures.n_vertices, self.vertices, lambda v: v.priority)
+
+# Lifts the predecessors of the vertex whose measure went up the most first. The size of a change 
+# is the difference of the ranks of the measures (see MeasureStore.rank), so a change of a more 
+# significant component or reaching top counts more than any change below it. 
+class MagnitudeLiftStrategy(BackTrackLiftStrategy): 
+
+    def __init__(self, vertices: list[Vertex], measures: MeasureStore): 
+        # the key the next added vertices get, minus the change of the last lifted vertex 
+        self.key: int = 0
+        self.before: int = 0
+        super().__init__(vertices, measures)
+
+    def new_worklist(self) -> Worklist: 
+        return HeapWorklist(self.measures.n_vertices, self.vertices, lambda v: self.key)
+
+    def next_vertex(self) -> Vertex: 
+        v = self.Q.take()
+        if v is not None: 
+            self.before = self.measures.rank(v)
+        return v
+
+    def was_lifted(self, v: Vertex): 
+        self.key = self.before - self.measures.rank(v)
+        super().was_lifted(v)
+
+# Backtracking with a focus list: a vertex whose measure just changed is lifted again before the rest 
+# of the worklist, for as long as that keeps changing it. Every vertex in the focus list has a 
+# credit that doubles when a lift changes its measure and halves when it does not, it leaves the 
+# focus list when the credit is gone. The focus list goes round in order, so the vertices of a cycle 
+# that keep raising each other are lifted one after the other. 
+class FocusListLiftStrategy(BackTrackLiftStrategy): 
+
+    def __init__(self, vertices: list[Vertex], measures: MeasureStore, max_credit: int = 64): 
+        super().__init__(vertices, measures)
+        self.focus: deque[Vertex] = deque()
+        self.credit: dict[int, int] = {}
+        self.max_credit = max_credit
+        self.focused: Vertex | None = None
+        # lifts of vertices that were taken from the focus list 
+        self.focus_lifts: int = 0
+
+    def next_vertex(self) -> Vertex: 
+        while self.focus: 
+            v = self.focus.popleft()
+            if not self.measures.is_top(v): 
+                self.focused = v
+                self.focus_lifts += 1
+                return v
+            del self.credit[v.id]
+        self.focused = None
+        return self.Q.take()
+
+    def was_lifted(self, v: Vertex): 
+        super().was_lifted(v)
+        if self.measures.is_top(v): 
+            self.credit.pop(v.id, None)
+            return
+        credit = self.credit.get(v.id)
+        if credit is None: 
+            self.credit[v.id] = 1
+            self.focus.append(v)
+        elif v is self.focused: 
+            self.credit[v.id] = min(2 * credit, self.max_credit)
+            self.focus.append(v)
+
+    def set_stable(self, v: Vertex, stable: bool) -> None: 
+        super().set_stable(v, stable)
+        if stable and v is self.focused: 
+            credit = self.credit[v.id] // 2
+            if credit == 0: 
+                del self.credit[v.id]
+            else: 
+                self.credit[v.id] = credit
+                self.focus.append(v)
+
+    def is_finished(self) -> bool: 
+        return len(self.focus) == 0 and len(self.Q) == 0
+
+    def counters(self) -> dict: 
+        return super().counters() | {'focus_lifts': self.focus_lifts}
+
+    def load_state(self, state: list[int]) -> None: 
+        super().load_state(state)
+        # the focus list is only a shortcut, the worklist has every vertex that still has to be lifted 
+        self.focus = deque()
+        self.credit = {}
 
 class SelfLoopStrategy(LiftStrategy): 
 
-    def __init__(self, vertices: list[Vertex]): 
-        super().__init__(vertices)
+    def __init__(self, vertices: list[Vertex], measures: MeasureStore): 
+        super().__init__(vertices, measures)
         self.count = 0 
+        self.unchanged = 0 # lifts since the last change, a full pass without change means we are done 
         self.split_value = 0 # used to determine where self-loops stop 
 
         # split the vertices in ones that have a self-loop and ones that don't 
@@ -86,22 +276,38 @@ class SelfLoopStrategy(LiftStrategy):
 
     def next_vertex(self) -> Vertex: 
         v: Vertex = self.vertices[self.count]
-        if (self.count < self.split_value): 
-            # When we have reached the top with a self-loop vertex we continue with the next
-            if (v.tuple.top): 
-                v.stable = True
-                self.count = (self.count + 1) % len(self.vertices)
-                return self.next_vertex()
-        else: 
+        # When we have reached the top with a self-loop vertex we continue with the next, 
+        # in a loop instead of recursion so many self-loops in a row do not hit the recursion limit
+        while (self.count < self.split_value and self.measures.is_top(v)): 
+            self.set_stable(v, True)
             self.count = (self.count + 1) % len(self.vertices)
+            self.unchanged += 1
+            # only self-loops that reached top are left 
+            if self.is_finished(): 
+                return None 
+            v = self.vertices[self.count]
+        if (self.count >= self.split_value): 
+            self.count = (self.count + 1) % len(self.vertices)
+        self.unchanged += 1
         return v 
+
+    def was_lifted(self, v: Vertex) -> None: 
+        self.unchanged = 0 
+
+    def is_finished(self) -> bool: 
+        return self.unchanged >= self.n_vertices or super().is_finished()
+
+    def save_state(self) -> list[int]: 
+        return [self.count, self.unchanged]
+
+    def load_state(self, state: list[int]) -> None: 
+        self.count, self.unchanged = state
     
 class BackTrackSelfLoopStrategy(LiftStrategy):
 
-    def __init__(self, vertices):
-        super().__init__(vertices)
-        self.Q: Queue[Vertex] = Queue(maxsize=self.n_vertices)
-        self.in_queue: list[bool] = [True for _ in range(self.n_vertices)] 
+    def __init__(self, vertices: list[Vertex], measures: MeasureStore):
+        super().__init__(vertices, measures)
+        self.Q: Worklist = FifoWorklist(self.measures.n_vertices, self.vertices)
         
         # split the vertices in ones that have a self-loop and ones that don't 
         odd_self_loop: list[Vertex] = []
@@ -115,59 +321,95 @@ class BackTrackSelfLoopStrategy(LiftStrategy):
         self.current: Vertex = odd_self_loop[0] if len(odd_self_loop) > 0 else no_odd_self_loop[0]
         # put the vertices with a self-loop first in the queue
         for v in odd_self_loop: 
-            self.Q.put(v)
+            self.Q.add(v)
         for v in no_odd_self_loop: 
-            self.Q.put(v)
+            self.Q.add(v)
 
     def next_vertex(self) -> Vertex: 
-        if (self.Q.empty()): 
+        if len(self.Q) == 0: 
             return None
         
-        if (self.current.odd_self_loop and not self.current.tuple.top): 
+        if (self.current.odd_self_loop and not self.measures.is_top(self.current)): 
             return self.current
         else: 
-            v: Vertex = self.Q.get()
-            self.in_queue[v.id] = False
+            v: Vertex = self.Q.take()
             self.current = v 
             return v 
                 
     def was_lifted(self, v: Vertex): 
+        is_top = self.measures.is_top
         for w in v.prev: 
-            if (not self.in_queue[w.id] and not w.tuple.top): 
-                self.in_queue[w.id] = True 
-                self.Q.put(w)
+            if not is_top(w): 
+                self.Q.add(w)
+
+    def pending(self) -> int: 
+        return len(self.Q)
+
+    def counters(self) -> dict: 
+        return {'queue_high_water': self.Q.high_water}
+
+    # the current vertex followed by the ids in the queue, in queue order 
+    def save_state(self) -> list[int]: 
+        return [self.current.id] + [v.id for v in self.Q.vertices()]
+
+    def load_state(self, state: list[int]) -> None: 
+        self.current = self.measures.vertices[state[0]]
+        self.Q = FifoWorklist(self.measures.n_vertices, self.vertices)
+        for id in state[1:]: 
+            self.Q.add(self.measures.vertices[id])
+
+    def start_with(self, vertices: list[Vertex]) -> None: 
+        # current is only lifted again when it has an odd self-loop, so it is queued as well 
+        current = vertices[0].id if len(vertices) > 0 else self.current.id
+        self.load_state([current] + [v.id for v in vertices])
 
 
 class OddFirstBackTrackSelfLoopStrategy(LiftStrategy): 
 
-    def __init__(self, vertices):
-        super().__init__(vertices)
-        self.Q: Queue[Vertex] = PriorityQueue(maxsize=self.n_vertices)
-        self.in_queue: list[bool] = [True for _ in range(self.n_vertices)] 
+    def __init__(self, vertices: list[Vertex], measures: MeasureStore):
+        super().__init__(vertices, measures)
+        # ordered by Vertex.__lt__, the vertices of odd first 
+        self.Q: Worklist = HeapWorklist(self.measures.n_vertices, self.vertices)
         
         for v in self.vertices: 
             if (v.odd_self_loop): 
-                v.tuple.set_top(True)
-                v.stable = True 
+                self.measures.set_top(v)
+                self.set_stable(v, True)
             else: 
-                self.Q.put(v)
+                self.Q.add(v)
 
     def next_vertex(self) -> Vertex: 
-        if (self.Q.empty()): 
-            return None
-        
-        v: Vertex = self.Q.get()
-        self.in_queue[v.id] = False
+        v: Vertex = self.Q.take()
         self.current = v 
         return v 
                 
     def was_lifted(self, v: Vertex): 
+        is_top = self.measures.is_top
         for w in v.prev: 
-            if (not self.in_queue[w.id] and not w.tuple.top): 
-                self.in_queue[w.id] = True 
-                self.Q.put(w)
+            if not is_top(w): 
+                self.Q.add(w)
 
+    def pending(self) -> int: 
+        return len(self.Q)
 
+    def counters(self) -> dict: 
+        return {'queue_high_water': self.Q.high_water}
 
+    # the ids in the heap of the worklist 
+    def save_state(self) -> list[int]: 
+        return [v.id for v in self.Q.vertices()]
 
+    def load_state(self, state: list[int]) -> None: 
+        self.Q = HeapWorklist(self.measures.n_vertices, self.vertices)
+        for id in state: 
+            self.Q.add(self.measures.vertices[id])
 
+    def start_with(self, vertices: list[Vertex]) -> None: 
+        ids: list[int] = []
+        for v in vertices: 
+            if v.odd_self_loop: 
+                # the constructor put it at top, its predecessors have to be lifted to see that 
+                ids.extend(u.id for u in v.prev if not u.odd_self_loop and not self.measures.is_top(u))
+            else: 
+                ids.append(v.id)
+        self.load_state(list(dict.fromkeys(ids)))
@@ -1,25 +1,154 @@
 from __future__ import annotations
 import argparse
+import json
+import os
+import sys
 
-from paritygame import ParityGame, Strategy, strategy_string
+from paritygame import ParityGame, Strategy, strategy_string, strat_to_string
+from batch import collect_games, collect_strategies, run_batch
+from instrumentation import progress_printer, profiled, traced
+from server import SolveServer, request, print_reply
 
 def parse_arguments() -> argparse.Namespace:
     parser = argparse.ArgumentParser(prog="SPM parity game solver")
     parser.add_argument('-pg', '--paritygame', help="Path + name to the paritygame file")
-    parser.add_argument('-s', '--strategy', help="choose from: input, random, selfloop, backtrack or combined")
+    parser.add_argument('-s', '--strategy', help="choose from: input, random, selfloop, backtrack, lifo, priority, magnitude, focus, combined, numpy, zielonka, auto, parallel or all (comma separated list in batch mode)")
+    parser.add_argument('-e', '--engine', default='tuple', help="measure representation, choose from: tuple, array, radix, incremental or succinct (default: tuple)")
+    parser.add_argument('--no-cache', action='store_true', help="do not read or write the binary cache next to the game file")
+    parser.add_argument('--rebuild-cache', action='store_true', help="parse the game file again and overwrite its binary cache")
+    parser.add_argument('--preprocess', help="simplify the game before solving, comma separated passes from: deadends, chains, priorities or all")
+    parser.add_argument('--presolve', action='store_true', help="decide the attractors of trivially won self-loops and dead ends before lifting")
+    parser.add_argument('--scc', action='store_true', help="solve one strongly connected component at a time, bottom components first, using -j worker processes")
+    parser.add_argument('-p', '--portfolio', action='store_true', help="race the strategies given by -s (default all) in parallel processes and keep the first solution")
+    parser.add_argument('-b', '--batch', nargs='+', help="directories or glob patterns of .gm files to solve in batch mode")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help="number of worker processes in batch and scc mode and of the parallel strategy (default: number of cpus)")
+    parser.add_argument('-o', '--output', help="file to write the json lines of batch mode to (default: stdout)")
+    parser.add_argument('--local', type=int, nargs='*', help="only decide these vertices (default: the start vertex), lifting the part of the game they reach")
+    parser.add_argument('--dual', action='store_true', help="lift the measures of odd and of even side by side and stop as soon as every vertex is decided")
+    parser.add_argument('--lift-budget', type=int, help="stop the solve after this many lifts")
+    parser.add_argument('--timeout', type=float, help="stop the solve after this many seconds")
+    parser.add_argument('--checkpoint', help="file to write checkpoints of the solve to, when it stops early, is interrupted and every --checkpoint-every seconds")
+    parser.add_argument('--checkpoint-every', type=float, default=60.0, help="seconds between checkpoints (default: 60)")
+    parser.add_argument('--resume', help="continue the solve from this checkpoint")
+    parser.add_argument('--metrics', help="file to write the metrics of every solve to as json lines")
+    parser.add_argument('--progress', type=int, help="report progress on stderr every this many lifts")
+    parser.add_argument('--progress-seconds', type=float, help="report progress on stderr at least every this many seconds")
+    parser.add_argument('--progress-json', action='store_true', help="write the progress reports as json lines")
+    parser.add_argument('--profile', nargs='?', const='', help="run under cProfile, print the slowest functions and write the stats to the given file")
+    parser.add_argument('--serve', metavar='SOCKET', help="run as a solver daemon on this unix socket with -j solver processes, until a shutdown request or ctrl-c")
+    parser.add_argument('--cache-mb', type=int, default=1024, help="memory for the games and solutions the daemon keeps, in MB (default: 1024)")
+    parser.add_argument('--connect', metavar='SOCKET', help="let the daemon on this unix socket solve the game (-pg with -s, -e, --presolve, --dual, --local, --lift-budget and --timeout)")
+    parser.add_argument('--server-command', choices=['stats', 'shutdown'], help="with --connect: print the cache counters of the daemon or stop it instead of solving")
+    parser.add_argument('--tracemalloc', action='store_true', help="trace memory allocations and print the peak and the largest allocation sites")
     arguments = parser.parse_args()
     return arguments
 
-def solve_every_strat(pg: ParityGame): 
+def solve_every_strat(pg: ParityGame, arguments: argparse.Namespace): 
     for strat in Strategy: 
-        pg.set_solve_strategy(strat)
+        pg.set_solve_strategy(strat_to_string(strat))
         pg.solve()
+        write_metrics(pg.get_results(), arguments)
+
+def write_metrics(metrics: dict, arguments: argparse.Namespace): 
+    if arguments.metrics: 
+        with open(arguments.metrics, 'a') as out: 
+            out.write(json.dumps(metrics) + '\n')
+
+def batch(arguments: argparse.Namespace): 
+    files = collect_games(arguments.batch)
+    strategies = collect_strategies(arguments.strategy or 'all')
+    if arguments.output: 
+        with open(arguments.output, 'w') as out: 
+            run_batch(files, strategies, arguments.engine, arguments.jobs, out, not arguments.no_cache)
+    else: 
+        run_batch(files, strategies, arguments.engine, arguments.jobs, sys.stdout, not arguments.no_cache)
 
 def main():
     arguments = parse_arguments()
-    paritygame = ParityGame.parse_graph(arguments.paritygame)
+    if arguments.profile is not None: 
+        profiled(lambda: run(arguments), arguments.profile or None)
+    elif arguments.tracemalloc: 
+        traced(lambda: run(arguments))
+    else: 
+        run(arguments)
+
+def serve(arguments: argparse.Namespace): 
+    server = SolveServer(arguments.serve, arguments.jobs, arguments.cache_mb << 20, not arguments.no_cache)
+    try: 
+        server.serve()
+    except KeyboardInterrupt: 
+        pass
+
+def connect(arguments: argparse.Namespace): 
+    if arguments.server_command: 
+        payload = {'command': arguments.server_command}
+    else: 
+        # the daemon runs in another directory 
+        payload = {'command': 'solve', 'path': os.path.abspath(arguments.paritygame), 'strategy': arguments.strategy, 
+                   'engine': arguments.engine, 'presolve': arguments.presolve, 'dual': arguments.dual, 'local': arguments.local, 
+                   'lift_budget': arguments.lift_budget, 'timeout': arguments.timeout}
+    reply = request(arguments.connect, payload)
+    if not reply['ok']: 
+        print('Server error:', reply['error'], file=sys.stderr)
+        sys.exit(1)
+    if arguments.server_command == 'stats': 
+        for worker, stats in enumerate(reply['workers']): 
+            print('Solver {worker}: {stats}'.format(worker=worker, stats=', '.join('{name} {value}'.format(name=name, value=value) for name, value in stats.items())))
+    elif arguments.server_command is None: 
+        print_reply(reply)
+        write_metrics(reply['result'] | {'served_from': reply['served_from']}, arguments)
+
+def run(arguments: argparse.Namespace):
+    if arguments.serve: 
+        serve(arguments)
+        return
+    if arguments.connect: 
+        connect(arguments)
+        return
+    if arguments.batch: 
+        batch(arguments)
+        return
+    paritygame = ParityGame.parse_graph(arguments.paritygame, not arguments.no_cache, arguments.rebuild_cache)
+    paritygame.set_solve_engine(arguments.engine)
+    paritygame.presolve = arguments.presolve
+    paritygame.workers = arguments.jobs
+    if arguments.progress or arguments.progress_seconds: 
+        paritygame.set_progress(progress_printer(as_json=arguments.progress_json), arguments.progress or 10000, arguments.progress_seconds)
+    if arguments.portfolio: 
+        portfolio = paritygame.solve_portfolio(collect_strategies(arguments.strategy or 'all'))
+        write_metrics(paritygame.get_results() | {'portfolio': portfolio}, arguments)
+        return
+    if arguments.strategy == 'all': 
+        solve_every_strat(paritygame, arguments)
+        return
     paritygame.set_solve_strategy(arguments.strategy)
-    paritygame.solve()
+    if arguments.local is not None: 
+        paritygame.solve_local(arguments.local or None, lift_budget=arguments.lift_budget, timeout=arguments.timeout)
+        write_metrics(paritygame.get_results(), arguments)
+        return
+    if arguments.dual: 
+        paritygame.solve_dual(lift_budget=arguments.lift_budget, timeout=arguments.timeout)
+        write_metrics(paritygame.get_results(), arguments)
+        return
+    if arguments.preprocess: 
+        passes = ['deadends', 'chains', 'priorities'] if arguments.preprocess == 'all' else arguments.preprocess.split(',')
+        reduced = paritygame.preprocess('deadends' in passes, 'chains' in passes, 'priorities' in passes)
+        reduced.reduction.print_reports()
+        reduced.set_progress(paritygame.progress, paritygame.progress_every, paritygame.progress_seconds)
+        solve(reduced, arguments, report=False)
+        paritygame.expand_results(reduced)
+        paritygame.print_results()
+        write_metrics(paritygame.get_results(), arguments)
+        return
+    solve(paritygame, arguments)
+    write_metrics(paritygame.get_results(), arguments)
+
+def solve(pg: ParityGame, arguments: argparse.Namespace, report: bool = True): 
+    if arguments.scc: 
+        pg.solve_scc(report=report, workers=arguments.jobs)
+    else: 
+        pg.solve(report=report, lift_budget=arguments.lift_budget, timeout=arguments.timeout, 
+                 checkpoint=arguments.checkpoint, checkpoint_every=arguments.checkpoint_every, resume=arguments.resume)
     
 if __name__ == "__main__": 
     main()
@@ -0,0 +1,543 @@
+from __future__ import annotations
+
+from array import array
+
+from tuple import Tuple, MeasureDomain
+from vertex import Vertex, Player
+
+class MeasureStore:
+
+    def __init__(self, vertices: list[Vertex], domain: MeasureDomain) -> None:
+        self.vertices: list[Vertex] = vertices
+        self.domain: MeasureDomain = domain
+        self.n_vertices: int = len(vertices)
+        # number of times prog was computed, one per successor that is looked at
+        self.prog_calls: int = 0
+        # rank of top, one past the largest measure
+        self.top_rank: int = 1
+        for i in domain.odd_indices:
+            self.top_rank *= domain.max_tuple_values[i] + 1
+
+    # set the measure of every vertex back to the empty tuple
+    def reset(self) -> None:
+        pass
+
+    # lifts the measure of v in place, returns if the measure changed
+    def lift(self, v: Vertex) -> bool:
+        pass
+
+    def is_top(self, v: Vertex) -> bool:
+        pass
+
+    def set_top(self, v: Vertex) -> None:
+        pass
+
+    def get_tuple(self, v: Vertex) -> Tuple:
+        pass
+
+    def set_tuple(self, v: Vertex, t: Tuple) -> None:
+        pass
+
+    # the measure of v as one integer that orders like the measures: the odd components as a mixed
+    # radix number with the maximum of every component as base, and top_rank for top
+    def rank(self, v: Vertex) -> int:
+        t: Tuple = self.get_tuple(v)
+        if t.top:
+            return self.top_rank
+        max_values = self.domain.max_tuple_values
+        value = 0
+        for i in self.domain.odd_indices:
+            value = value * (max_values[i] + 1) + t.values[i]
+        return value
+
+    # write the measures back into v.tuple so the results can be read from the vertices
+    def store_tuples(self) -> None:
+        pass
+
+    # the successors or the priority of v were edited, forget what is remembered about its lift
+    def invalidate(self, v: Vertex) -> None:
+        pass
+
+    # engine specific statistics of the last solve
+    def counters(self) -> dict:
+        return {'prog_calls': self.prog_calls}
+
+    def reset_counters(self) -> None:
+        self.prog_calls = 0
+
+class TupleMeasureStore(MeasureStore):
+
+    def reset(self) -> None:
+        for v in self.vertices:
+            v.tuple = self.domain.get_empty_tuple()
+
+    def lift(self, v: Vertex) -> bool:
+        new_tuple: Tuple = self.__lift(v)
+        changed: bool = not (new_tuple == v.tuple)
+        v.tuple = new_tuple
+        return changed
+
+    def is_top(self, v: Vertex) -> bool:
+        return v.tuple.top
+
+    def set_top(self, v: Vertex) -> None:
+        v.tuple.set_top(True)
+
+    def get_tuple(self, v: Vertex) -> Tuple:
+        return v.tuple
+
+    def set_tuple(self, v: Vertex, t: Tuple) -> None:
+        v.tuple = t
+
+    def store_tuples(self) -> None:
+        # the tuples already live on the vertices
+        pass
+
+    def __lift(self, v: Vertex) -> Tuple:
+        self.prog_calls += len(v.next)
+        if (v.owner == Player.EVEN):
+            # initilize the tuple to the largest tuple (top)
+            min_tup: Tuple = self.domain.get_empty_tuple()
+            min_tup.set_top(True)
+
+            for w in v.next:
+                new_tup: Tuple = self.__prog(v, w)
+                # less then
+                if new_tup < min_tup:
+                    min_tup = new_tup
+            return v.tuple if v.tuple > min_tup else min_tup
+        else:
+            # initilize the tuple to the smallest tuple
+            max_tup: Tuple = self.domain.get_empty_tuple()
+
+            for w in v.next:
+                new_tup: Tuple = self.__prog(v,w)
+                # greater then
+                if new_tup > max_tup:
+                    max_tup = new_tup
+            return v.tuple if v.tuple > max_tup else max_tup
+
+    def __prog(self, v: Vertex, w: Vertex):
+        m: Tuple = self.domain.get_empty_tuple()
+        if (w.tuple.top):
+            m.set_top(True)
+
+        if (v.even_priority):
+            # always set it equal to the smallest option
+            m.set_value_range(0, v.priority + 1, w.tuple.get_range(0, v.priority + 1))
+        else:
+            m.set_value_range(0, v.priority + 1, w.tuple.get_range(0, v.priority + 1))
+            m.add(v.priority)
+        return m
+
+# Keeps the measures of all vertices in one flat integer array. Every vertex owns a row with a
+# top flag followed by only the odd components of its tuple (component c is tuple index 2c + 1,
+# at row index c + 1). With the flag first, two rows order like their measures when they are
+# compared as arrays, so lift compares, copies and picks the best row with slices and min/max
+# instead of a python loop over the components.
+class ArrayMeasureStore(MeasureStore):
+
+    def __init__(self, vertices: list[Vertex], domain: MeasureDomain) -> None:
+        super().__init__(vertices, domain)
+        self.components: int = domain.tuple_size // 2
+        self.row_size: int = self.components + 1
+        # the largest value at every row index, the flag has none
+        self.bounds: list[int] = [0] + [domain.max_tuple_values[2 * c + 1] for c in range(self.components)]
+        self.top_row: array = array('q', [1] + [0 for _ in range(self.components)])
+        self.empty_row: array = array('q', bytes(8 * self.row_size))
+        # the zeros a truncated row is padded with, by the number of components that were kept
+        self.padding: list[array] = [array('q', bytes(8 * (self.components - m))) for m in range(self.components + 1)]
+        self.rows: array = array('q', bytes(8 * self.n_vertices * self.row_size))
+
+    def reset(self) -> None:
+        self.rows = array('q', bytes(8 * self.n_vertices * self.row_size))
+
+    def lift(self, v: Vertex) -> bool:
+        rows = self.rows
+        size = self.row_size
+        base = v.id * size
+        # a measure can never be lifted past top
+        if rows[base]:
+            return False
+
+        self.prog_calls += len(v.next)
+        top_row = self.top_row
+        bounds = self.bounds
+        # prog keeps the components up to the priority of v, that is row index m
+        m = (v.priority + 1) // 2
+        tail = self.padding[m]
+        odd = not v.even_priority
+
+        def prog(w: Vertex) -> array:
+            src = w.id * size
+            if rows[src]:
+                return top_row
+            row = rows[src: src + m + 1]
+            if odd:
+                # increment the component of v's priority, carrying to the more significant ones
+                c = m
+                while row[c] == bounds[c]:
+                    row[c] = 0
+                    c -= 1
+                    if c == 0:
+                        return top_row
+                row[c] += 1
+            row.extend(tail)
+            return row
+
+        if (v.owner == Player.EVEN):
+            best = min(map(prog, v.next), default=top_row)
+        else:
+            best = max(map(prog, v.next), default=self.empty_row)
+        if not rows[base: base + size] < best:
+            return False
+        rows[base: base + size] = best
+        return True
+
+    def is_top(self, v: Vertex) -> bool:
+        return self.rows[v.id * self.row_size] != 0
+
+    def set_top(self, v: Vertex) -> None:
+        self.rows[v.id * self.row_size] = 1
+
+    def store_tuples(self) -> None:
+        for v in self.vertices:
+            v.tuple = self.get_tuple(v)
+
+    def get_tuple(self, v: Vertex) -> Tuple:
+        t: Tuple = self.domain.get_empty_tuple()
+        base = v.id * self.row_size
+        for c in range(self.components):
+            t.set_value(2 * c + 1, self.rows[base + c + 1])
+        t.set_top(self.rows[base] != 0)
+        return t
+
+    def set_tuple(self, v: Vertex, t: Tuple) -> None:
+        base = v.id * self.row_size
+        self.rows[base] = 1 if t.top else 0
+        for c in range(self.components):
+            self.rows[base + c + 1] = t.get(2 * c + 1)
+
+# Packs the odd components of a measure into one integer, using the maximum value of every
+# component as a mixed radix. Component 0 (tuple index 1) is the most significant digit and top
+# is the first value past the largest measure, so measures compare as plain integers. prog is a
+# truncation to the priority of v (a modulo) plus, for an odd priority, adding the weight of its
+# component, which carries into the more significant components by itself.
+class RadixMeasureStore(MeasureStore):
+
+    def __init__(self, vertices: list[Vertex], domain: MeasureDomain) -> None:
+        super().__init__(vertices, domain)
+        self.components: int = domain.tuple_size // 2
+        self.radices: list[int] = [domain.max_tuple_values[2 * c + 1] + 1 for c in range(self.components)]
+        self.weights: list[int] = [0 for _ in range(self.components)]
+        weight = 1
+        for c in reversed(range(self.components)):
+            self.weights[c] = weight
+            weight *= self.radices[c]
+        self.top: int = weight
+
+        # per priority: prog keeps value - value % mods[p] and adds incs[p]
+        self.mods: list[int] = []
+        self.incs: list[int] = []
+        for p in range(domain.tuple_size):
+            kept = (p + 1) // 2
+            self.mods.append(self.weights[kept - 1] if kept > 0 else self.top)
+            self.incs.append(self.weights[kept - 1] if p % 2 == 1 else 0)
+        self.values: list[int] = [0 for _ in range(self.n_vertices)]
+
+    def reset(self) -> None:
+        self.values = [0 for _ in range(self.n_vertices)]
+
+    def lift(self, v: Vertex) -> bool:
+        values = self.values
+        top = self.top
+        old = values[v.id]
+        if old == top:
+            return False
+
+        self.prog_calls += len(v.next)
+        mod = self.mods[v.priority]
+        inc = self.incs[v.priority]
+        if (v.owner == Player.EVEN):
+            best = top
+            for w in v.next:
+                m = values[w.id]
+                if m != top:
+                    m = min(m - m % mod + inc, top)
+                if m < best:
+                    best = m
+        else:
+            best = 0
+            for w in v.next:
+                m = values[w.id]
+                if m != top:
+                    m = min(m - m % mod + inc, top)
+                if m > best:
+                    best = m
+
+        if best > old:
+            values[v.id] = best
+            return True
+        return False
+
+    def is_top(self, v: Vertex) -> bool:
+        return self.values[v.id] == self.top
+
+    def set_top(self, v: Vertex) -> None:
+        self.values[v.id] = self.top
+
+    # the packed measure is the rank already
+    def rank(self, v: Vertex) -> int:
+        return self.values[v.id]
+
+    def get_tuple(self, v: Vertex) -> Tuple:
+        t: Tuple = self.domain.get_empty_tuple()
+        value = self.values[v.id]
+        if value == self.top:
+            t.set_top(True)
+            return t
+        for c in range(self.components):
+            t.set_value(2 * c + 1, value // self.weights[c] % self.radices[c])
+        return t
+
+    def set_tuple(self, v: Vertex, t: Tuple) -> None:
+        if t.top:
+            self.values[v.id] = self.top
+            return
+        self.values[v.id] = sum(t.get(2 * c + 1) * self.weights[c] for c in range(self.components))
+
+    def store_tuples(self) -> None:
+        for v in self.vertices:
+            v.tuple = self.get_tuple(v)
+
+# Radix measures with a remembered best successor per vertex: the max prog value for odd vertices
+# and the min prog value (and the successor giving it) for even vertices. When a measure changes
+# only the edges into that vertex are looked at, which is enough because measures only go up:
+# the max of an odd vertex can only be raised by the changed edge, and the min of an even vertex
+# only changes when its witness moved, in which case it is marked dirty and rescanned on its
+# next lift. Lifting a vertex that is not dirty is a single comparison.
+class IncrementalMeasureStore(RadixMeasureStore):
+
+    def __init__(self, vertices: list[Vertex], domain: MeasureDomain) -> None:
+        super().__init__(vertices, domain)
+        self.best: list[int] = [0 for _ in range(self.n_vertices)]
+        self.witness: list[int] = [-1 for _ in range(self.n_vertices)]
+        self.dirty: list[bool] = [True for _ in range(self.n_vertices)]
+        # how often a lift could use the remembered best and how often it had to rescan
+        self.fast_lifts: int = 0
+        self.rescans: int = 0
+
+    def reset(self) -> None:
+        super().reset()
+        self.dirty = [True for _ in range(self.n_vertices)]
+        self.fast_lifts = 0
+        self.rescans = 0
+
+    def lift(self, v: Vertex) -> bool:
+        values = self.values
+        old = values[v.id]
+        if old == self.top:
+            return False
+
+        if self.dirty[v.id]:
+            self.__rescan(v)
+            self.rescans += 1
+        else:
+            self.fast_lifts += 1
+
+        best = self.best[v.id]
+        if best > old:
+            values[v.id] = best
+            self.__changed(v)
+            return True
+        return False
+
+    def set_top(self, v: Vertex) -> None:
+        super().set_top(v)
+        self.__changed(v)
+
+    def set_tuple(self, v: Vertex, t: Tuple) -> None:
+        super().set_tuple(v, t)
+        for u in v.prev:
+            self.dirty[u.id] = True
+
+    def invalidate(self, v: Vertex) -> None:
+        self.dirty[v.id] = True
+
+    def counters(self) -> dict:
+        return super().counters() | {'fast_lifts': self.fast_lifts, 'rescans': self.rescans}
+
+    def reset_counters(self) -> None:
+        super().reset_counters()
+        self.fast_lifts = 0
+        self.rescans = 0
+
+    def __rescan(self, v: Vertex) -> None:
+        self.prog_calls += len(v.next)
+        values = self.values
+        top = self.top
+        mod = self.mods[v.priority]
+        inc = self.incs[v.priority]
+        witness = -1
+        if (v.owner == Player.EVEN):
+            best = top
+            for w in v.next:
+                m = values[w.id]
+                if m != top:
+                    m = min(m - m % mod + inc, top)
+                if m < best or witness == -1:
+                    best = m
+                    witness = w.id
+        else:
+            best = 0
+            for w in v.next:
+                m = values[w.id]
+                if m != top:
+                    m = min(m - m % mod + inc, top)
+                if m > best:
+                    best = m
+        self.best[v.id] = best
+        self.witness[v.id] = witness
+        self.dirty[v.id] = False
+
+    # the measure of w went up, update the remembered best of its predecessors
+    def __changed(self, w: Vertex) -> None:
+        m = self.values[w.id]
+        top = self.top
+        for u in w.prev:
+            if self.dirty[u.id]:
+                continue
+            if (u.owner == Player.EVEN):
+                # the min only moves when its witness moved
+                if self.witness[u.id] == w.id:
+                    self.dirty[u.id] = True
+            else:
+                self.prog_calls += 1
+                p = m if m == top else min(m - m % self.mods[u.priority] + self.incs[u.priority], top)
+                if p > self.best[u.id]:
+                    self.best[u.id] = p
+
+# Succinct measures in the style of Jurdzinski and Lazic: a measure is a tuple of binary strings,
+# one per odd priority, whose lengths add up to at most `bits`, the bit length of the number of
+# vertices with an odd priority. The strings of one component are ordered like an in-order walk of
+# a binary tree (0x < empty < 1x), so string s is the dyadic number 0.s1 and is stored as that
+# number scaled by 2^(bits + 1): an odd multiple of 2^(bits - len(s)). The components are packed
+# like the radix measures, component 0 (priority 1) the most significant, and top is one past the
+# largest measure, so measures compare as plain integers. There are quasi-polynomially many of
+# these measures in the number of vertices and priorities where the classic tuples have
+# exponentially many in the number of priorities.
+#
+# prog keeps the components up to the priority p of v and puts the least strings the remaining
+# length allows after them. For an odd p the kept components are first raised to the next tuple
+# of strings: the last component that has a next string within the length left for it is raised
+# (adding 2^(length used before it)), the components after it start again from the least strings.
+class SuccinctMeasureStore(MeasureStore):
+
+    def __init__(self, vertices: list[Vertex], domain: MeasureDomain) -> None:
+        super().__init__(vertices, domain)
+        self.components: int = domain.tuple_size // 2
+        self.bits: int = sum(domain.max_tuple_values[i] for i in domain.odd_indices).bit_length()
+        self.width: int = self.bits + 1
+        self.mask: int = (1 << self.width) - 1
+        self.top: int = 1 << (self.width * self.components)
+        # tails[c][used]: the least strings of the components from c on, when used bits are taken
+        # by the components before c. The first of them gets every bit left, the others are empty.
+        self.tails: list[list[int]] = []
+        for c in range(self.components + 1):
+            empty = sum((1 << self.bits) << (self.width * (self.components - 1 - i)) for i in range(c + 1, self.components))
+            first = self.width * (self.components - 1 - c)
+            self.tails.append([empty | ((1 << used) << first) if c < self.components else 0 for used in range(self.bits + 1)])
+        self.least: int = self.tails[0][0]
+        self.values: list[int] = [self.least for _ in range(self.n_vertices)]
+
+    def reset(self) -> None:
+        self.values = [self.least for _ in range(self.n_vertices)]
+
+    def lift(self, v: Vertex) -> bool:
+        values = self.values
+        top = self.top
+        old = values[v.id]
+        if old == top:
+            return False
+
+        self.prog_calls += len(v.next)
+        p = v.priority
+        if (v.owner == Player.EVEN):
+            best = top
+            for w in v.next:
+                m = self.__prog(values[w.id], p)
+                if m < best:
+                    best = m
+        else:
+            best = self.least
+            for w in v.next:
+                m = self.__prog(values[w.id], p)
+                if m > best:
+                    best = m
+
+        if best > old:
+            values[v.id] = best
+            return True
+        return False
+
+    def is_top(self, v: Vertex) -> bool:
+        return self.values[v.id] == self.top
+
+    def set_top(self, v: Vertex) -> None:
+        self.values[v.id] = self.top
+
+    def rank(self, v: Vertex) -> int:
+        return self.values[v.id]
+
+    # the scaled strings are put in the odd components of the tuple, they compare like the strings
+    def get_tuple(self, v: Vertex) -> Tuple:
+        t: Tuple = self.domain.get_empty_tuple()
+        value = self.values[v.id]
+        if value == self.top:
+            t.set_top(True)
+            return t
+        for c in range(self.components):
+            t.set_value(2 * c + 1, value >> (self.width * (self.components - 1 - c)) & self.mask)
+        return t
+
+    # takes tuples made by get_tuple, a tuple of only zeros is the empty measure
+    def set_tuple(self, v: Vertex, t: Tuple) -> None:
+        if t.top:
+            self.values[v.id] = self.top
+        elif all(t.get(2 * c + 1) == 0 for c in range(self.components)):
+            self.values[v.id] = self.least
+        else:
+            self.values[v.id] = sum(t.get(2 * c + 1) << (self.width * (self.components - 1 - c)) for c in range(self.components))
+
+    def store_tuples(self) -> None:
+        for v in self.vertices:
+            v.tuple = self.get_tuple(v)
+
+    def counters(self) -> dict:
+        return super().counters() | {'succinct_bits': self.bits}
+
+    def __prog(self, m: int, p: int) -> int:
+        if m == self.top:
+            return m
+        width = self.width
+        mask = self.mask
+        kept = (p + 1) // 2
+        # the kept components and the bits used before every one of them
+        components: list[int] = []
+        used_before: list[int] = []
+        used = 0
+        for c in range(kept):
+            x = m >> (width * (self.components - 1 - c)) & mask
+            components.append(x)
+            used_before.append(used)
+            used += self.bits + 1 - (x & -x).bit_length()
+        if p % 2 == 0:
+            return (m >> (width * (self.components - kept))) << (width * (self.components - kept)) | self.tails[kept][used]
+
+        for c in reversed(range(kept)):
+            x = components[c] + (1 << used_before[c])
+            if x <= mask:
+                used = used_before[c] + self.bits + 1 - (x & -x).bit_length()
+                prefix = (m >> (width * (self.components - c))) << width | x
+                return prefix << (width * (self.components - 1 - c)) | self.tails[c + 1][used]
+        return self.top
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import multiprocessing
+import time
+from array import array
+from collections import deque
+from multiprocessing.sharedctypes import RawArray
+from typing import Callable
+
+# Measures are packed radix values (see RadixMeasureStore) split in limbs of this many bits, so every
+# limb fits in a signed 64 bit word of the shared array
+LIMB_BITS = 63
+LIMB_MASK = (1 << LIMB_BITS) - 1
+
+# slots of every ring between two workers
+RING_SLOTS = 4096
+
+# lifts a worker does between looking at its inbox and publishing its counters
+BATCH = 256
+
+# per worker counters in the shared stats array
+LIFTS = 0
+CHANGED_LIFTS = 1
+TOPS_REACHED = 2
+PROG_CALLS = 3
+SENT = 4
+RECEIVED = 5
+IDLE = 6
+# goes up every time the worker stops being idle, so the termination check sees work it missed
+EPOCH = 7
+N_STATS = 8
+
+# Everything the workers share. The measures, the rings and the counters are in shared memory, the
+# rest is only read and reaches the workers by forking.
+class ParallelJob:
+
+    def __init__(self, n_vertices: int, workers: int, limbs: int) -> None:
+        self.n_vertices: int = n_vertices
+        self.workers: int = workers
+        self.limbs: int = limbs
+        self.values = RawArray('q', n_vertices * limbs)
+        # ring from worker i to worker j: slots[(i * workers + j) * RING_SLOTS:], the writer moves the
+        # tail and the reader the head, both only go up
+        rings = workers * workers if workers > 1 else 0
+        self.slots = RawArray('i', rings * RING_SLOTS)
+        self.heads = RawArray('q', rings)
+        self.tails = RawArray('q', rings)
+        self.stats = RawArray('q', workers * N_STATS)
+        # set by the parent when the workers have to stop
+        self.done = RawArray('b', 1)
+        # worker of every vertex, -1 for frozen vertices
+        self.part: array = array('i', [-1]) * n_vertices
+        self.parts: list[list[int]] = [[] for _ in range(workers)]
+        self.succ_offsets = None
+        self.succ_targets = None
+        self.pred_offsets = None
+        self.pred_targets = None
+        self.priorities = None
+        self.even_owned = None
+        self.mods: list[int] = []
+        self.incs: list[int] = []
+        self.top: int = 0
+
+    def read(self, values: memoryview, v: int) -> int:
+        if self.limbs == 1:
+            return values[v]
+        value = 0
+        for i in range(v * self.limbs + self.limbs - 1, v * self.limbs - 1, -1):
+            value = (value << LIMB_BITS) | values[i]
+        return value
+
+    def write(self, values: memoryview, v: int, value: int) -> None:
+        if self.limbs == 1:
+            values[v] = value
+            return
+        for i in range(v * self.limbs, (v + 1) * self.limbs):
+            values[i] = value & LIMB_MASK
+            value >>= LIMB_BITS
+
+    # the counters of all workers at one moment, used by the termination check
+    def wave(self) -> list[int]:
+        return list(self.stats)
+
+# Lifts the game with worklists in several worker processes that share the measures, until no
+# measure changes. The vertices are split in blocks of about the same number of edges, every worker
+# lifts the vertices of its block with a first in first out worklist like BackTrackLiftStrategy.
+# When a measure goes up the predecessors are queued again, predecessors of another worker are sent
+# to that worker over a ring in shared memory with one writer and one reader, so no locks are taken.
+# Only the worker of a vertex writes its measure. A worker can read an older measure of a vertex of
+# another worker, which is safe because measures only go up: a lift from measures below the
+# fixpoint stays below the fixpoint, and the worker is sent the vertex again when the measure it
+# read changes. A measure of several limbs is written from the lowest limb up and read from the
+# highest limb down, then a read that overlaps a write gives a value no higher than that write.
+# The parent detects the end: every worker is idle, as many vertices were sent as received and
+# none of the counters moved between two looks at them.
+# The game is given in CSR form for successors and predecessors, owners are 1 for even. mods, incs
+# and top are the prog constants of RadixMeasureStore, values the packed measures to start from.
+# Vertices in frozen keep their measure. stop is asked with the lifts so far every poll seconds and
+# ends the solve early when it returns true. With one worker, or when this process cannot fork
+# workers, the lifting runs in this process.
+# Returns the measures and counters: lifts, lifts that changed a measure, measures that reached top,
+# prog calls, vertices sent to another worker and the lifts of every worker.
+def parallel_solve(succ_offsets: array, succ_targets: array, pred_offsets: array, pred_targets: array,
+                   priorities: array, even_owned: array, mods: list[int], incs: list[int], top: int,
+                   values: list[int], frozen: list[bool], workers: int,
+                   stop: Callable[[int], bool] | None = None, poll: float = 0.01) -> tuple[list[int], dict]:
+    n = len(priorities)
+    # a daemon process (a batch or portfolio worker) cannot start processes of its own
+    if 'fork' not in multiprocessing.get_all_start_methods() or multiprocessing.current_process().daemon:
+        workers = 1
+    workers = max(1, min(workers, n))
+    job = ParallelJob(n, workers, max(1, -(-top.bit_length() // LIMB_BITS)))
+    job.succ_offsets, job.succ_targets = succ_offsets, succ_targets
+    job.pred_offsets, job.pred_targets = pred_offsets, pred_targets
+    job.priorities, job.even_owned = priorities, even_owned
+    job.mods, job.incs, job.top = mods, incs, top
+    shared = memoryview(job.values).cast('B').cast('q')
+    for v in range(n):
+        job.write(shared, v, values[v])
+
+    # blocks of consecutive ids, ids that are close are often close in the game as well
+    share = (sum(1 for v in range(n) if not frozen[v]) + len(succ_targets)) / workers
+    worker = 0
+    load = 0
+    for v in range(n):
+        if frozen[v]:
+            continue
+        if load >= share * (worker + 1) and worker < workers - 1:
+            worker += 1
+        job.part[v] = worker
+        job.parts[worker].append(v)
+        load += 1 + succ_offsets[v + 1] - succ_offsets[v]
+
+    if workers == 1:
+        lift_worker(job, 0, stop)
+    else:
+        # the workers get the job by forking, only the shared arrays are written after that
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=lift_worker, args=(job, i), daemon=True) for i in range(workers)]
+        try:
+            for process in processes:
+                process.start()
+            coordinate(job, processes, stop, poll)
+        finally:
+            job.done[0] = 1
+            for process in processes:
+                process.join()
+
+    stats = job.stats
+    counters = {'lifts': 0, 'changed_lifts': 0, 'tops_reached': 0, 'prog_calls': 0}
+    for i in range(workers):
+        counters['lifts'] += stats[i * N_STATS + LIFTS]
+        counters['changed_lifts'] += stats[i * N_STATS + CHANGED_LIFTS]
+        counters['tops_reached'] += stats[i * N_STATS + TOPS_REACHED]
+        counters['prog_calls'] += stats[i * N_STATS + PROG_CALLS]
+    counters['workers'] = workers
+    counters['sent_vertices'] = sum(stats[i * N_STATS + SENT] for i in range(workers))
+    counters['worker_lifts'] = [stats[i * N_STATS + LIFTS] for i in range(workers)]
+    return [job.read(shared, v) for v in range(n)], counters
+
+# Waits in the parent until the workers are done or stop says so. Raises when a worker died.
+def coordinate(job: ParallelJob, processes: list, stop: Callable[[int], bool] | None, poll: float) -> None:
+    last: list[int] | None = None
+    while True:
+        time.sleep(poll)
+        for process in processes:
+            if process.exitcode is not None:
+                raise RuntimeError('parallel lift worker {pid} stopped with exit code {code}'.format(pid=process.pid, code=process.exitcode))
+        wave = job.wave()
+        idle = all(wave[i * N_STATS + IDLE] for i in range(job.workers))
+        sent = sum(wave[i * N_STATS + SENT] for i in range(job.workers))
+        received = sum(wave[i * N_STATS + RECEIVED] for i in range(job.workers))
+        if idle and sent == received and wave == last:
+            return
+        last = wave if idle and sent == received else None
+        if stop is not None and stop(sum(wave[i * N_STATS + LIFTS] for i in range(job.workers))):
+            return
+
+# Lifts the vertices of one worker until the parent says it is done. A worker that runs alone
+# stops when its worklist is empty or stop returns true.
+def lift_worker(job: ParallelJob, index: int, stop: Callable[[int], bool] | None = None) -> None:
+    workers = job.workers
+    values = memoryview(job.values).cast('B').cast('q')
+    slots = memoryview(job.slots).cast('B').cast('i')
+    heads = memoryview(job.heads).cast('B').cast('q')
+    tails = memoryview(job.tails).cast('B').cast('q')
+    stats = memoryview(job.stats).cast('B').cast('q')
+    done = job.done
+    part = job.part
+    succ_offsets, succ_targets = job.succ_offsets, job.succ_targets
+    pred_offsets, pred_targets = job.pred_offsets, job.pred_targets
+    priorities, even_owned = job.priorities, job.even_owned
+    mods, incs, top = job.mods, job.incs, job.top
+    read = values.__getitem__ if job.limbs == 1 else lambda v: job.read(values, v)
+    base = index * N_STATS
+
+    queue: deque[int] = deque(job.parts[index])
+    queued: bytearray = bytearray(job.n_vertices)
+    for v in queue:
+        queued[v] = 1
+    # vertices to send to every other worker, outgoing marks the ones already in an outbox
+    outboxes: list[list[int]] = [[] for _ in range(workers)]
+    outgoing: bytearray = bytearray(job.n_vertices)
+    lifts = changed_lifts = tops_reached = prog_calls = sent = received = 0
+    idle_rounds = 0
+
+    while not done[0]:
+        # the inbox: the rings of the other workers into this one
+        for source in range(workers):
+            if source == index:
+                continue
+            ring = source * workers + index
+            head = heads[ring]
+            tail = tails[ring]
+            if head == tail:
+                continue
+            if stats[base + IDLE]:
+                stats[base + IDLE] = 0
+                stats[base + EPOCH] += 1
+            start = ring * RING_SLOTS
+            for position in range(head, tail):
+                v = slots[start + position % RING_SLOTS]
+                if not queued[v] and read(v) != top:
+                    queued[v] = 1
+                    queue.append(v)
+            heads[ring] = tail
+            received += tail - head
+            stats[base + RECEIVED] = received
+
+        for _ in range(min(BATCH, len(queue))):
+            v = queue.popleft()
+            queued[v] = 0
+            old = read(v)
+            # a vertex can reach top after it was queued, it is not lifted again
+            if old == top:
+                continue
+            lifts += 1
+            first = succ_offsets[v]
+            last = succ_offsets[v + 1]
+            prog_calls += last - first
+            mod = mods[priorities[v]]
+            inc = incs[priorities[v]]
+            if even_owned[v]:
+                best = top
+                for e in range(first, last):
+                    m = read(succ_targets[e])
+                    if m != top:
+                        m = min(m - m % mod + inc, top)
+                    if m < best:
+                        best = m
+            else:
+                best = 0
+                for e in range(first, last):
+                    m = read(succ_targets[e])
+                    if m != top:
+                        m = min(m - m % mod + inc, top)
+                    if m > best:
+                        best = m
+            if best <= old:
+                continue
+            job.write(values, v, best)
+            changed_lifts += 1
+            if best == top:
+                tops_reached += 1
+            for e in range(pred_offsets[v], pred_offsets[v + 1]):
+                u = pred_targets[e]
+                worker = part[u]
+                if worker == index:
+                    if not queued[u] and read(u) != top:
+                        queued[u] = 1
+                        queue.append(u)
+                elif worker != -1 and not outgoing[u]:
+                    outgoing[u] = 1
+                    outboxes[worker].append(u)
+
+        # the outboxes, what does not fit in a ring waits for the next round
+        pending = False
+        for target in range(workers):
+            outbox = outboxes[target]
+            if len(outbox) == 0:
+                continue
+            ring = index * workers + target
+            tail = tails[ring]
+            room = RING_SLOTS - (tail - heads[ring])
+            count = min(room, len(outbox))
+            start = ring * RING_SLOTS
+            for k in range(count):
+                u = outbox[k]
+                slots[start + (tail + k) % RING_SLOTS] = u
+                outgoing[u] = 0
+            # the slots are written before the tail is moved
+            tails[ring] = tail + count
+            sent += count
+            del outbox[:count]
+            pending = pending or len(outbox) > 0
+
+        stats[base + LIFTS] = lifts
+        stats[base + CHANGED_LIFTS] = changed_lifts
+        stats[base + TOPS_REACHED] = tops_reached
+        stats[base + PROG_CALLS] = prog_calls
+        stats[base + SENT] = sent
+        if workers == 1:
+            if len(queue) == 0 or (stop is not None and stop(lifts)):
+                return
+            continue
+        if len(queue) > 0 or pending:
+            idle_rounds = 0
+            continue
+        # nothing to do until another worker sends a vertex
+        stats[base + IDLE] = 1
+        idle_rounds += 1
+        time.sleep(0 if idle_rounds < 100 else 0.0005)
@@ -1,10 +1,35 @@
 from __future__ import annotations
 
 from enum import Enum
+import math
+import multiprocessing
+import queue
+import time
+from multiprocessing import Process, Queue, Value
+from array import array
+from typing import Callable
 
-from tuple import Tuple 
+from tuple import Tuple, MeasureDomain 
 from vertex import Vertex, Player
+from gameparser import GameGraph, NameTable, build_csr
+from gamecache import load_game
+from scc import strongly_connected_components, component_levels
+from preprocess import Reduction, preprocess_game
+from attractor import attractor
+from zielonka import zielonka_solve
+from parallellift import parallel_solve
+from instrumentation import phase
+from checkpoint import Checkpoint
+from measurestore import MeasureStore, TupleMeasureStore, ArrayMeasureStore, RadixMeasureStore, IncrementalMeasureStore, SuccinctMeasureStore
 from liftstrategies import LiftStrategy, InputLiftStrategy, RandomLiftStrategy, BackTrackLiftStrategy, SelfLoopStrategy, OddFirstBackTrackSelfLoopStrategy
+from liftstrategies import LifoLiftStrategy, PriorityLiftStrategy, MagnitudeLiftStrategy, FocusListLiftStrategy
+
+# The auto strategy uses small progress measures when they take at most this many prog calls, see 
+# ParityGame.pick_strategy 
+AUTO_PROG_CALLS = 10000
+
+# seconds solve_portfolio waits for a result before it looks for workers that died 
+PORTFOLIO_POLL = 1.0
 
 class Strategy(Enum): 
     INPUT = 0 
@@ -12,6 +37,14 @@ class Strategy(Enum):
     BACKTRACK = 2 
     LOOP = 3
     LOOPBACKTRACKODD = 4
+    BULK = 5
+    LIFO = 6
+    PRIORITY = 7
+    MAGNITUDE = 8
+    FOCUS = 9
+    ZIELONKA = 10
+    AUTO = 11
+    PARALLEL = 12
 
 def strategy_string(strategy: Strategy): 
     match strategy: 
@@ -25,6 +58,51 @@ def strategy_string(strategy: Strategy):
             return "loop elim"
         case Strategy.LOOPBACKTRACKODD: 
             return "loop elim + backtrack"
+        case Strategy.BULK: 
+            return "numpy bulk lifting"
+        case Strategy.LIFO: 
+            return "backtrack (last in first out)"
+        case Strategy.PRIORITY: 
+            return "backtrack (lowest priority first)"
+        case Strategy.MAGNITUDE: 
+            return "backtrack (largest change first)"
+        case Strategy.FOCUS: 
+            return "backtrack + focus list"
+        case Strategy.ZIELONKA: 
+            return "zielonka recursive"
+        case Strategy.AUTO: 
+            return "auto"
+        case Strategy.PARALLEL: 
+            return "parallel worklists"
+
+def strat_to_string(strategy: Strategy): 
+    match strategy: 
+        case Strategy.INPUT: 
+            return "input"
+        case Strategy.RANDOM: 
+            return "random"
+        case Strategy.BACKTRACK: 
+            return "backtrack"
+        case Strategy.LOOP: 
+            return "selfloop"
+        case Strategy.LOOPBACKTRACKODD: 
+            return "combined"
+        case Strategy.BULK: 
+            return "numpy"
+        case Strategy.LIFO: 
+            return "lifo"
+        case Strategy.PRIORITY: 
+            return "priority"
+        case Strategy.MAGNITUDE: 
+            return "magnitude"
+        case Strategy.FOCUS: 
+            return "focus"
+        case Strategy.ZIELONKA: 
+            return "zielonka"
+        case Strategy.AUTO: 
+            return "auto"
+        case Strategy.PARALLEL: 
+            return "parallel"
 
 def string_to_strat(strat_str: str): 
     match strat_str: 
@@ -32,165 +110,1308 @@ def string_to_strat(strat_str: str):
             return Strategy.INPUT
         case "random": 
             return Strategy.RANDOM
-        case "backtrack": 
+        case "backtrack" | "fifo": 
             return Strategy.BACKTRACK
         case "selfloop": 
             return Strategy.LOOP
         case "combined": 
             return Strategy.LOOPBACKTRACKODD
+        case "numpy": 
+            return Strategy.BULK
+        case "lifo": 
+            return Strategy.LIFO
+        case "priority": 
+            return Strategy.PRIORITY
+        case "magnitude": 
+            return Strategy.MAGNITUDE
+        case "focus": 
+            return Strategy.FOCUS
+        case "zielonka": 
+            return Strategy.ZIELONKA
+        case "auto": 
+            return Strategy.AUTO
+        case "parallel": 
+            return Strategy.PARALLEL
+
+class Engine(Enum): 
+    TUPLE = 0
+    ARRAY = 1
+    RADIX = 2
+    INCREMENTAL = 3
+    SUCCINCT = 4
+
+def engine_string(engine: Engine): 
+    match engine: 
+        case Engine.TUPLE: 
+            return "tuple"
+        case Engine.ARRAY: 
+            return "array"
+        case Engine.RADIX: 
+            return "radix"
+        case Engine.INCREMENTAL: 
+            return "incremental"
+        case Engine.SUCCINCT: 
+            return "succinct"
+
+def string_to_engine(engine_str: str): 
+    match engine_str: 
+        case "tuple": 
+            return Engine.TUPLE
+        case "array": 
+            return Engine.ARRAY
+        case "radix": 
+            return Engine.RADIX
+        case "incremental": 
+            return Engine.INCREMENTAL
+        case "succinct": 
+            return Engine.SUCCINCT
+
+def winner_string(winner: Player | None): 
+    match winner: 
+        case Player.ODD: 
+            return "odd"
+        case Player.EVEN: 
+            return "even"
+        case None: 
+            return None
 
 class ParityGame: 
 
-    def __init__(self, n_vertices, file) -> None: 
+    def __init__(self, n_vertices, file, graph: GameGraph | None = None) -> None: 
         self.file: str = file
         self.n_vertices: int = n_vertices
-        self.vertices: list[Vertex] = [Vertex(id=i) for i in range(n_vertices)]
+        # compact form of the game, the vertex objects are only built when they are asked for 
+        self.graph: GameGraph | None = graph
+        self.__vertices: list[Vertex] | None = None if graph else [Vertex(id=i) for i in range(n_vertices)]
         self.max_priority: int = -1
+        self.start: int = 0
+        self.domain: MeasureDomain = None
 
         self.strategy: Strategy = Strategy.INPUT
+        self.engine: Engine = Engine.TUPLE
+        self.measures: MeasureStore = None
         self.lift_amount: int = 0 
+        # (size, lifts) of every component when solved with solve_scc 
+        self.scc_lifts: list[tuple[int, int]] | None = None
+        # number of jacobi rounds when solved with the numpy strategy 
+        self.bulk_rounds: int | None = None
+        # instrumentation of the last solve: lifts that changed a measure, measures that reached 
+        # top, counters of the lift strategy and the wall time of every phase (parse, solve, ...) 
+        self.changed_lifts: int = 0
+        self.tops_reached: int = 0
+        self.strategy_counters: dict = {}
+        self.phase_times: dict[str, float] = {}
+        # progress callback, see set_progress 
+        self.progress: Callable[[dict], None] | None = None
+        self.progress_every: int = 10000
+        self.progress_seconds: float | None = None
+        self.progress_check: int = 1000
+        self.__progress_lifts: int = 0
+        self.__progress_time: float = 0.0
+        self.__solve_start: float = 0.0
+        # limits and checkpoints of the running solve, see solve 
+        self.lift_budget: int | None = None
+        self.timeout: float | None = None
+        self.checkpoint_path: str | None = None
+        self.checkpoint_every: float = 60.0
+        self.__checkpoint_time: float = 0.0
+        # why the last solve stopped before the measures were stable, None when it finished 
+        self.stopped: str | None = None
+        # decide the attractors of trivially won vertices before lifting 
+        self.presolve: bool = False
+        self.presolved: int | None = None
+        # set on a game made by preprocess, links it to the original game 
+        self.reduction: Reduction | None = None
+        # edits since the last solve, see add_edge and resolve 
+        self.__edited: set[int] = set()
+        self.__reset_roots: set[int] = set()
+        self.__removed_edges: list[tuple[int, int]] = []
+        # vertices presolve decided in the last solve, they were never lifted 
+        self.__decided: list[bool] | None = None
+        # number of vertices resolve queued, None after a full solve 
+        self.requeued: int | None = None
+        # the solve stops as soon as all of these vertices reached top, see solve_local 
+        self.targets: list[int] | None = None
+        # results of solve_local: the winner of every target (None when not decided) and the size of 
+        # the part of the game that was explored 
+        self.local_winners: dict[int, Player | None] | None = None
+        self.explored: tuple[int, int] | None = None
+        # results of solve_dual: the winner of every vertex, None when the solve stopped before it was decided 
+        self.dual_winners: list[Player | None] | None = None
+        # the strategy the auto strategy picked for the last solve 
+        self.picked: Strategy | None = None
+        # number of worker processes of the parallel strategy 
+        self.workers: int = 1
+
+    @property 
+    def vertices(self) -> list[Vertex]: 
+        if self.__vertices is None: 
+            self.__vertices = self.graph.build_vertices()
+        return self.__vertices
 
     @staticmethod
-    def parse_graph(filepath: str) -> ParityGame: 
-        # read file 
-        with open(filepath, 'r') as file:
-            lines = file.read().strip().split('\n')
+    def parse_graph(filepath: str, use_cache: bool = True, rebuild_cache: bool = False) -> ParityGame: 
+        # stream the file into the compact graph, or load it from the binary cache next to the file 
+        times: dict[str, float] = {}
+        with phase(times, 'parse'): 
+            graph: GameGraph = load_game(filepath, use_cache, rebuild_cache)
+        pg = ParityGame.from_graph(graph, filepath)
+        pg.phase_times = times
+        return pg
 
-        # parse header info and create graph with vertices
-        pg = ParityGame(int(lines[0].strip(";").split(" ")[1]) + 1, filepath)
-        
-        # Parse info for each vertex
-        for i in range(1, len(lines)):
-            vertex_info = lines[i].strip(";").split(' ')
-            pg.vertices[int(vertex_info[0])].parse_vertex(
-                vertex_info=vertex_info, 
-                other_vertices=pg.vertices)
-            
-            # Set max priority 
-            if (pg.vertices[int(vertex_info[0])].priority > pg.max_priority): 
-                pg.max_priority = pg.vertices[int(vertex_info[0])].priority
+    # A game on a graph that was parsed before, the graph is only read so games can share it 
+    @staticmethod
+    def from_graph(graph: GameGraph, filepath: str) -> ParityGame: 
+        pg = ParityGame(graph.n_vertices, filepath, graph)
+        pg.max_priority = graph.max_priority
+        pg.start = graph.start
 
         # Set the maximum tuple
         pg.__set_max_tuple()
 
         return pg
     
-    # Sets the maximum tuple rho can become 
+    # Sets the maximum tuple rho can become, owned by this game only 
     def __set_max_tuple(self): 
-        Tuple.set_tuple_size(self.max_priority + 1)
-        Tuple.set_max_tuple([v.priority for v in self.vertices])
+        priorities = self.graph.priorities if self.graph else [v.priority for v in self.vertices]
+        self.domain = MeasureDomain(self.max_priority, priorities)
     
+    # Returns a smaller game with the same winners, made by the passes that are turned on. The 
+    # reduced game is solved like any other game, afterwards expand_results puts its results 
+    # back on the vertices of this game. 
+    def preprocess(self, dead_ends: bool = True, chains: bool = True, priorities: bool = True) -> ParityGame: 
+        with phase(self.phase_times, 'preprocess'): 
+            reduction = preprocess_game(self.graph, dead_ends, chains, priorities)
+        reduced = ParityGame(reduction.graph.n_vertices, self.file, reduction.graph)
+        reduced.max_priority = reduction.graph.max_priority
+        reduced.start = reduction.graph.start
+        reduced.strategy = self.strategy
+        reduced.engine = self.engine
+        reduced.presolve = self.presolve
+        reduced.workers = self.workers
+        reduced.reduction = reduction
+        reduced.__set_max_tuple()
+        return reduced
+
+    # Takes over the results of solving the game returned by preprocess. Only the winners carry 
+    # over, the measures of the reduced game do not belong to this game's domain. 
+    def expand_results(self, reduced: ParityGame) -> None: 
+        mapping = reduced.reduction.mapping
+        self.strategy = reduced.strategy
+        self.engine = reduced.engine
+        self.lift_amount = reduced.lift_amount
+        self.scc_lifts = reduced.scc_lifts
+        self.presolved = reduced.presolved
+        self.changed_lifts = reduced.changed_lifts
+        self.tops_reached = reduced.tops_reached
+        self.strategy_counters = reduced.strategy_counters
+        self.phase_times.update(reduced.phase_times)
+        for v in self.vertices: 
+            v.tuple = self.domain.get_empty_tuple()
+            if mapping[v.id] == -1: 
+                v.tuple.set_top(reduced.reduction.odd_wins[v.id] == 1)
+            else: 
+                v.tuple.set_top(reduced.vertices[mapping[v.id]].tuple.top)
+
     def set_solve_strategy(self, strategy_str: str): 
         self.strategy = string_to_strat(strategy_str)
 
-    def __init_lift_strategy(self) -> LiftStrategy: 
+    # The strategy auto uses for this game. Small progress measures take at most about n_edges prog 
+    # calls per measure of the domain (the product of the bounds of the odd components plus one): a 
+    # measure only goes up and a vertex is only lifted again when a successor went up. When that 
+    # bound is small they are used, their cost is certain. Otherwise Zielonka's algorithm is used, 
+    # which has no bound below exponential in the number of priorities either but is far faster on 
+    # the games in examples/ and the generated families. 
+    def pick_strategy(self) -> Strategy: 
+        limit = AUTO_PROG_CALLS // max(self.__n_edges(), 1)
+        measures = 1
+        for i in self.domain.odd_indices: 
+            measures *= self.domain.max_tuple_values[i] + 1
+            if measures > limit: 
+                return Strategy.ZIELONKA
+        return Strategy.LOOPBACKTRACKODD
+
+    def set_solve_engine(self, engine_str: str): 
+        self.engine = string_to_engine(engine_str)
+
+    # progress is called with progress_report() every `every` lifts and, when seconds is given, 
+    # at least every `seconds` seconds, and once more when the lifting ends. The clock is only read 
+    # every progress_check lifts. 
+    def set_progress(self, progress: Callable[[dict], None] | None, every: int = 10000, seconds: float | None = None): 
+        self.progress = progress
+        self.progress_every = every
+        self.progress_seconds = seconds
+        self.progress_check = math.gcd(every, 1000)
+
+    def __init_measure_store(self) -> MeasureStore: 
+        match self.engine: 
+            case Engine.TUPLE: 
+                return TupleMeasureStore(self.vertices, self.domain)
+            case Engine.ARRAY: 
+                return ArrayMeasureStore(self.vertices, self.domain)
+            case Engine.RADIX: 
+                return RadixMeasureStore(self.vertices, self.domain)
+            case Engine.INCREMENTAL: 
+                return IncrementalMeasureStore(self.vertices, self.domain)
+            case Engine.SUCCINCT: 
+                return SuccinctMeasureStore(self.vertices, self.domain)
+
+    def __init_lift_strategy(self, vertices: list[Vertex]) -> LiftStrategy: 
         match self.strategy: 
             case Strategy.INPUT: 
-                return InputLiftStrategy(self.vertices)
+                return InputLiftStrategy(vertices, self.measures)
             case Strategy.RANDOM: 
-                return RandomLiftStrategy(self.vertices)
+                return RandomLiftStrategy(vertices, self.measures)
             case Strategy.BACKTRACK: 
-                return BackTrackLiftStrategy(self.vertices)
+                return BackTrackLiftStrategy(vertices, self.measures)
             case Strategy.LOOP: 
-                return SelfLoopStrategy(self.vertices) 
+                return SelfLoopStrategy(vertices, self.measures) 
             case Strategy.LOOPBACKTRACKODD: 
-                return OddFirstBackTrackSelfLoopStrategy(self.vertices)
+                return OddFirstBackTrackSelfLoopStrategy(vertices, self.measures)
+            case Strategy.LIFO: 
+                return LifoLiftStrategy(vertices, self.measures)
+            case Strategy.PRIORITY: 
+                return PriorityLiftStrategy(vertices, self.measures)
+            case Strategy.MAGNITUDE: 
+                return MagnitudeLiftStrategy(vertices, self.measures)
+            case Strategy.FOCUS: 
+                return FocusListLiftStrategy(vertices, self.measures)
+            case Strategy.BULK: 
+                raise ValueError('the numpy strategy lifts the whole game at once, it cannot lift a part of the game')
+            case Strategy.ZIELONKA: 
+                raise ValueError('the zielonka strategy does not lift, it solves the whole game at once')
+            case Strategy.PARALLEL: 
+                raise ValueError('the parallel strategy lifts the whole game at once, it cannot lift a part of the game')
+            case Strategy.AUTO: 
+                # a part of the game is lifted with the strategy that is best on most games 
+                return OddFirstBackTrackSelfLoopStrategy(vertices, self.measures)
     
     def __reset_vertices(self): 
-        # Set empty tuples for each vertex and reset stability measure
+        # Set empty measures for each vertex and reset stability measure
         for v in self.vertices: 
             v.stable = False 
-            v.tuple = Tuple.get_empty_tuple()
+        if len(self.__edited) > 0: 
+            # the priorities may have been edited 
+            self.max_priority = max(v.priority for v in self.vertices)
+            self.__set_max_tuple()
+        self.measures = self.__init_measure_store()
+        self.measures.reset()
+        self.__clear_edits()
+
+    def __clear_edits(self) -> None: 
+        self.__edited = set()
+        self.__reset_roots = set()
+        self.__removed_edges = []
+
+    # Edits of a solved game, resolve then solves the edited game starting from the previous 
+    # measures. An edit that can only raise the fixpoint keeps every measure: removing an edge of 
+    # even (who takes the min), adding an edge of odd (who takes the max) or giving a vertex of even 
+    # that has successors to odd. Any other edit can lower the measures of the vertices that reach the edited vertex, 
+    # resolve sets those back to the empty measure. The compact graph does not match the game after 
+    # an edit, so it is dropped and the vertex objects are used from then on. 
+    def add_edge(self, u: int, w: int) -> None: 
+        source = self.__edit(u)
+        source.add_transition(self.vertices[w])
+        source.check_odd_self_loop()
+        if source.owner == Player.EVEN: 
+            self.__reset_roots.add(u)
+
+    def remove_edge(self, u: int, w: int) -> None: 
+        source = self.__edit(u)
+        target = self.vertices[w]
+        if target not in source.next: 
+            raise ValueError('there is no edge from {u} to {w}'.format(u=u, w=w))
+        source.remove_transition(target)
+        self.__removed_edges.append((u, w))
+        source.odd_self_loop = False
+        source.check_odd_self_loop()
+        if source.owner == Player.ODD: 
+            self.__reset_roots.add(u)
+
+    def set_priority(self, v: int, priority: int) -> None: 
+        vertex = self.__edit(v)
+        vertex.priority = priority
+        vertex.even_priority = (priority % 2) == 0
+        vertex.odd_self_loop = False
+        vertex.check_odd_self_loop()
+        self.__reset_roots.add(v)
+
+    def set_owner(self, v: int, owner: Player) -> None: 
+        vertex = self.__edit(v)
+        # a dead end is won by the opponent of its owner, giving one to odd takes it from top to empty 
+        if owner == Player.EVEN and vertex.owner == Player.ODD or owner != vertex.owner and len(vertex.next) == 0: 
+            self.__reset_roots.add(v)
+        vertex.owner = owner
+        vertex.odd_self_loop = False
+        vertex.check_odd_self_loop()
+
+    def __edit(self, v: int) -> Vertex: 
+        vertex = self.vertices[v]
+        self.graph = None
+        self.__edited.add(v)
+        return vertex
+
+    # Solves the game again after edits, starting from the measures of the last solve. Only the 
+    # edited vertices and the vertices whose measures were reset are queued in the lift strategy, 
+    # the other measures are a fixpoint already and only move when one of their successors does. 
+    def resolve(self, report: bool = True) -> None: 
+        if self.measures is None or Strategy.ZIELONKA in (self.strategy, self.picked): 
+            self.solve(report)
+            return
+        stopped = self.stopped is not None
+        self.__reset_counters()
+        self.presolved = None
+        with phase(self.phase_times, 'solve'): 
+            with phase(self.phase_times, 'cone'): 
+                impacted = self.__reset_cone(stopped)
+            self.requeued = len(impacted)
+            with phase(self.phase_times, 'lift'): 
+                if self.strategy == Strategy.BULK: 
+                    self.__solve_bulk([False for _ in range(self.n_vertices)])
+                elif self.strategy == Strategy.PARALLEL: 
+                    self.__solve_parallel([False for _ in range(self.n_vertices)])
+                else: 
+                    lift_strategy = self.__init_lift_strategy(self.vertices)
+                    lift_strategy.start_with(impacted)
+                    self.__lift_until_stable(lift_strategy)
+            with phase(self.phase_times, 'store'): 
+                self.measures.store_tuples()
+        self.__clear_edits()
+        self.__decided = None
+        if report: 
+            self.print_results()
+
+    # Sets the measures of every vertex that reaches an edit which can lower the fixpoint back to 
+    # the empty measure, over the edges before and after the edits, and moves the measures to the 
+    # domain of the edited game. The other measures stay below the new fixpoint: their part of the 
+    # game did not change or only changed in a way that raises the fixpoint. Returns the vertices 
+    # that have to be lifted, which are marked unstable. 
+    def __reset_cone(self, stopped: bool) -> list[Vertex]: 
+        vertices = self.vertices
+        removed_prev: dict[int, list[int]] = {}
+        for u, w in self.__removed_edges: 
+            removed_prev.setdefault(w, []).append(u)
+        cone: list[bool] = [False for _ in range(self.n_vertices)]
+        stack: list[int] = list(self.__reset_roots)
+        for id in stack: 
+            cone[id] = True
+        while stack: 
+            id = stack.pop()
+            for u in [u.id for u in vertices[id].prev] + removed_prev.get(id, []): 
+                if not cone[u]: 
+                    cone[u] = True
+                    stack.append(u)
+
+        old_domain = self.domain
+        self.max_priority = max(v.priority for v in vertices)
+        self.__set_max_tuple()
+        if (old_domain.tuple_size, old_domain.max_tuple_values) == (self.domain.tuple_size, self.domain.max_tuple_values): 
+            # keep the store, only the cone is reset 
+            self.domain = old_domain
+            for v in vertices: 
+                if cone[v.id]: 
+                    self.measures.set_tuple(v, self.domain.get_empty_tuple())
+        elif self.engine == Engine.SUCCINCT: 
+            # the length of the succinct strings changes with the domain, every measure starts again 
+            cone = [True for _ in range(self.n_vertices)]
+            self.measures = self.__init_measure_store()
+            self.measures.reset()
+        else: 
+            # the bounds changed, the measures move to a store of the new domain. They are copied out 
+            # first, the tuple engine keeps them on the vertices and its reset clears them. 
+            kept: dict[int, tuple[list[int], bool]] = {}
+            for v in vertices: 
+                if not cone[v.id]: 
+                    old: Tuple = self.measures.get_tuple(v)
+                    kept[v.id] = (list(old.values[:self.domain.tuple_size]), old.top)
+            store = self.__init_measure_store()
+            store.reset()
+            for id, (values, top) in kept.items(): 
+                t: Tuple = Tuple(values + [0 for _ in range(self.domain.tuple_size - len(values))], self.domain)
+                t.set_top(top)
+                store.set_tuple(vertices[id], t)
+            self.measures = store
+        for id in self.__edited: 
+            self.measures.invalidate(vertices[id])
+        self.measures.reset_counters()
+
+        # vertices presolve decided for even were never lifted, and a stopped solve left vertices 
+        # unstable without saying which 
+        decided = self.__decided
+        impacted: list[Vertex] = []
+        for v in vertices: 
+            v.stable = not (cone[v.id] or v.id in self.__edited or stopped or (decided is not None and decided[v.id])) or self.measures.is_top(v)
+            if not v.stable: 
+                impacted.append(v)
+        return impacted
 
     # Solve parity game using small progress measures (SPM) algorithm
-    def solve(self) -> None: 
+    # The solve stops early after lift_budget lifts or timeout seconds, self.stopped then tells why 
+    # and only the vertices at top are decided (they are won by odd). When checkpoint is given the 
+    # measures, stability flags and lift strategy state are written there every checkpoint_every 
+    # seconds, when the solve stops early and when it is interrupted. resume continues from such a 
+    # checkpoint, measures only go up so this reaches the same fixpoint as solving at once. 
+    def solve(self, report: bool = True, lift_budget: int | None = None, timeout: float | None = None, 
+              checkpoint: str | None = None, checkpoint_every: float = 60.0, resume: str | None = None) -> None: 
         # reset vertices
         self.__reset_vertices()
         
         # set lfiting startegy generator
+        self.__reset_counters()
+        self.lift_budget = lift_budget
+        self.timeout = timeout
+        self.checkpoint_path = checkpoint
+        self.checkpoint_every = checkpoint_every
+        with phase(self.phase_times, 'solve'): 
+            if self.strategy == Strategy.AUTO: 
+                self.picked = self.pick_strategy()
+            with phase(self.phase_times, 'presolve'): 
+                decided = self.__presolve()
+            self.__decided = decided if self.presolved else None
+            state = self.__load_checkpoint(resume, decided) if resume else None
+            with phase(self.phase_times, 'lift'): 
+                if Strategy.ZIELONKA in (self.strategy, self.picked): 
+                    self.__solve_zielonka(decided)
+                elif self.strategy == Strategy.BULK: 
+                    self.__solve_bulk(decided)
+                elif self.strategy == Strategy.PARALLEL: 
+                    self.__solve_parallel(decided)
+                else: 
+                    lift_strategy = self.__init_lift_strategy([v for v in self.vertices if not decided[v.id]])
+                    if state is not None: 
+                        lift_strategy.load_state(state)
+                    self.__lift_until_stable(lift_strategy)
+
+            # make the final measures available as tuples on the vertices 
+            with phase(self.phase_times, 'store'): 
+                self.measures.store_tuples()
+        if report: 
+            self.print_results()
+
+    def __reset_counters(self) -> None: 
         self.lift_amount = 0
-        lift_strategy = self.__init_lift_strategy()
-
-        while not self.__is_stable(self.vertices): 
-            v: Vertex | None = lift_strategy.next_vertex()
-            if not v: break # if the queue is empty we break out of the loop
-
-            # lift the vertex 
-            new_tuple: Tuple = self.__lift(v)
-            self.lift_amount += 1
-            # check if the found tuple is stable 
-            if (new_tuple == v.tuple): 
-                # no change in tuple 
-                v.stable = True 
-            else: 
-                # there has been a change in tuple 
-                v.stable = False 
-                lift_strategy.was_lifted(v)
-            # set the final tuple for the vertex 
-            v.tuple = new_tuple
+        self.scc_lifts = None
+        self.bulk_rounds = None
+        self.changed_lifts = 0
+        self.tops_reached = 0
+        self.strategy_counters = {}
+        # the phases of an earlier solve, parse and preprocess stay 
+        for name in ('solve', 'presolve', 'scc', 'cone', 'explore', 'dual', 'lift', 'store'): 
+            self.phase_times.pop(name, None)
+        self.__solve_start = self.__progress_time = self.__checkpoint_time = time.perf_counter()
+        self.__progress_lifts = 0
+        self.lift_budget = None
+        self.timeout = None
+        self.checkpoint_path = None
+        self.stopped = None
+        self.requeued = None
+        self.local_winners = None
+        self.explored = None
+        self.dual_winners = None
+        self.picked = None
 
-        self.print_results()
-        
-    def __is_stable(self, vertices: list[Vertex]): 
-        for v in vertices: 
-            if not v.stable: return False 
-        return True 
-
-    def __lift(self, v: Vertex) -> Tuple: 
-        if (v.owner == Player.EVEN): 
-            # initilize the tuple to the largest tuple (top)
-            min_tup: Tuple = Tuple.get_empty_tuple() 
-            min_tup.set_top(True)
-
-            for w in v.next: 
-                new_tup: Tuple = self.__prog(v, w)
-                # less then 
-                if new_tup < min_tup: 
-                    min_tup = new_tup
-            return v.tuple if v.tuple > min_tup else min_tup
+    # the state of the running solve that is given to the progress callback 
+    def progress_report(self, lift_strategy: LiftStrategy | None = None) -> dict: 
+        report = {
+            'lifts': self.lift_amount, 
+            'changed_lifts': self.changed_lifts, 
+            'tops_reached': self.tops_reached, 
+            'unstable': lift_strategy.pending() if lift_strategy else 0, 
+            'elapsed': time.perf_counter() - self.__solve_start, 
+        }
+        if self.dual_winners is not None: 
+            # the winners solve_dual knows so far, the worklist of a side still holds the vertices 
+            # the other side decided 
+            report['odd_decided'] = self.dual_winners.count(Player.ODD)
+            report['even_decided'] = self.dual_winners.count(Player.EVEN)
+            report['unstable'] = self.n_vertices - report['odd_decided'] - report['even_decided']
+        return report
+
+    # Reports progress, writes checkpoints and checks the timeout while lifting. Returns true when 
+    # the solve has to stop. 
+    def __check_running(self, lift_strategy: LiftStrategy) -> bool: 
+        now = time.perf_counter()
+        if self.progress and (self.lift_amount - self.__progress_lifts >= self.progress_every or 
+                (self.progress_seconds is not None and now - self.__progress_time >= self.progress_seconds)): 
+            self.__progress_lifts = self.lift_amount
+            self.__progress_time = now
+            self.progress(self.progress_report(lift_strategy))
+        if self.checkpoint_path and now - self.__checkpoint_time >= self.checkpoint_every: 
+            self.__write_checkpoint(lift_strategy)
+            self.__checkpoint_time = now
+        if self.timeout is not None and now - self.__solve_start >= self.timeout: 
+            self.stopped = 'timeout'
+            return True
+        return False
+
+    def __n_edges(self) -> int: 
+        return self.graph.n_edges if self.graph is not None else sum(len(v.next) for v in self.vertices)
+
+    # without a lift strategy no strategy state is written and a resume starts with all vertices unstable 
+    def __write_checkpoint(self, lift_strategy: LiftStrategy | None) -> None: 
+        strategy = self.strategy.value if lift_strategy is not None else -1
+        checkpoint = Checkpoint(self.n_vertices, self.__n_edges(), self.max_priority, strategy, self.engine.value)
+        checkpoint.lifts = self.lift_amount
+        checkpoint.changed_lifts = self.changed_lifts
+        checkpoint.tops_reached = self.tops_reached
+        for v in self.vertices: 
+            t: Tuple = self.measures.get_tuple(v)
+            checkpoint.set_measure(v.id, [t.values[i] for i in self.domain.odd_indices], t.top)
+            checkpoint.stable[v.id] = 1 if v.stable else 0
+        if lift_strategy is not None: 
+            checkpoint.state = array('q', lift_strategy.save_state())
+        checkpoint.write(self.checkpoint_path)
+
+    # Puts the measures of a checkpoint in the measure store. Returns the lift strategy state to 
+    # continue from, or None when the checkpoint was made with another strategy: that strategy 
+    # starts from the measures with all vertices unstable, which reaches the same fixpoint. 
+    def __load_checkpoint(self, path: str, decided: list[bool]) -> list[int] | None: 
+        checkpoint = Checkpoint.read(path)
+        if (checkpoint.n_vertices, checkpoint.n_edges, checkpoint.max_priority) != (self.n_vertices, self.__n_edges(), self.max_priority): 
+            raise ValueError('checkpoint {path} belongs to a different game'.format(path=path))
+        if (checkpoint.engine == Engine.SUCCINCT.value) != (self.engine == Engine.SUCCINCT): 
+            raise ValueError('checkpoint {path} holds {kind} measures'.format(path=path, kind='succinct' if checkpoint.engine == Engine.SUCCINCT.value else 'classic'))
+        for v in self.vertices: 
+            components, top = checkpoint.get_measure(v.id)
+            t: Tuple = self.domain.get_empty_tuple()
+            for c, i in enumerate(self.domain.odd_indices): 
+                t.values[i] = components[c]
+            t.set_top(top)
+            self.measures.set_tuple(v, t)
+        self.lift_amount = checkpoint.lifts
+        self.changed_lifts = checkpoint.changed_lifts
+        self.tops_reached = checkpoint.tops_reached
+        if checkpoint.strategy != self.strategy.value: 
+            return None
+        for v in self.vertices: 
+            if not decided[v.id]: 
+                v.stable = checkpoint.stable[v.id] != 0
+        return list(checkpoint.state)
+
+    # Without lifting, decides the vertices from which a player can force the play into a vertex that 
+    # player trivially wins: a vertex of the player with a self-loop of its own parity (the player can 
+    # stay there forever) or a dead end of the opponent. The odd attractor gets top and the even 
+    # attractor keeps the empty measure, both are marked stable and are never given to the lift 
+    # strategy. Leaving even's vertices at the empty measure is safe, they behave like a sink that 
+    # even wins, which has the same winners. Returns for every vertex if it was decided. 
+    def __presolve(self) -> list[bool]: 
+        decided: list[bool] = [False for _ in range(self.n_vertices)]
+        self.presolved = None
+        if not self.presolve: 
+            return decided
+
+        def owner(id: int) -> Player: 
+            return self.vertices[id].owner
+        def predecessors(id: int): 
+            return (u.id for u in self.vertices[id].prev)
+        def out_degree(id: int) -> int: 
+            return len(self.vertices[id].next)
+        def wins_trivially(v: Vertex, player: Player) -> bool: 
+            if len(v.next) == 0: 
+                return v.owner != player
+            return v.owner == player and v.even_priority == (player == Player.EVEN) and v in v.next
+
+        odd_targets = [v.id for v in self.vertices if wins_trivially(v, Player.ODD)]
+        for id in attractor(odd_targets, Player.ODD, owner, predecessors, out_degree): 
+            decided[id] = True
+            self.measures.set_top(self.vertices[id])
+        # the rest of the game is a trap for odd, so out degrees do not change for even's attractor 
+        even_targets = [v.id for v in self.vertices if not decided[v.id] and wins_trivially(v, Player.EVEN)]
+        for id in attractor(even_targets, Player.EVEN, owner, predecessors, out_degree, decided): 
+            decided[id] = True
+
+        for v in self.vertices: 
+            if decided[v.id]: 
+                v.stable = True
+        self.presolved = sum(decided)
+        return decided
+
+    # Lifts all vertices at once in Jacobi rounds with numpy (see bulklift.py) and puts the result in 
+    # the measure store. Decided vertices keep the measure presolve gave them. 
+    def __solve_bulk(self, decided: list[bool]) -> None: 
+        if self.engine == Engine.SUCCINCT: 
+            raise ValueError('the numpy strategy lifts classic measures, it cannot be used with the succinct engine')
+        # numpy is only needed for this strategy 
+        import numpy as np
+        from bulklift import jacobi_solve
+
+        if self.graph is not None: 
+            offsets = np.asarray(self.graph.succ_offsets, dtype=np.int64)
+            targets = np.asarray(self.graph.succ_targets, dtype=np.int64)
+            priorities = np.asarray(self.graph.priorities, dtype=np.int64)
+            even_owned = np.asarray(self.graph.owners, dtype=bool)
         else: 
-            # initilize the tuple to the smallest tuple 
-            max_tup: Tuple = Tuple.get_empty_tuple() 
-
-            for w in v.next: 
-                new_tup: Tuple = self.__prog(v,w)
-                # greater then 
-                if new_tup > max_tup: 
-                    max_tup = new_tup 
-            return v.tuple if v.tuple > max_tup else max_tup
-
-    def __prog(self, v: Vertex, w: Vertex): 
-        m: Tuple = Tuple.get_empty_tuple()
-        if (w.tuple.top):
-            m.set_top(True)
-
-        if (v.even_priority): 
-            # always set it equal to the smallest option 
-            m.set_value_range(0, v.priority + 1, w.tuple.get_range(0, v.priority + 1))
+            offsets = np.cumsum([0] + [len(v.next) for v in self.vertices], dtype=np.int64)
+            targets = np.array([w.id for v in self.vertices for w in v.next], dtype=np.int64)
+            priorities = np.array([v.priority for v in self.vertices], dtype=np.int64)
+            even_owned = np.array([v.owner == Player.EVEN for v in self.vertices], dtype=bool)
+        odd_indices = self.domain.odd_indices
+        bounds = np.array([self.domain.max_tuple_values[i] for i in odd_indices], dtype=np.int64)
+        # start from the measures in the store, which are not empty after presolve or a resume 
+        measures = np.zeros((self.n_vertices, len(odd_indices)), dtype=np.int64)
+        top = np.zeros(self.n_vertices, dtype=bool)
+        for v in self.vertices: 
+            t: Tuple = self.measures.get_tuple(v)
+            measures[v.id] = [t.values[i] for i in odd_indices]
+            top[v.id] = t.top
+        frozen = np.array(decided, dtype=bool)
+
+        lift_limit = self.lift_amount + self.lift_budget if self.lift_budget is not None else None
+        def stop(lifts: int) -> bool: 
+            if lift_limit is not None and self.lift_amount + lifts >= lift_limit: 
+                self.stopped = 'lift budget'
+            elif self.timeout is not None and time.perf_counter() - self.__solve_start >= self.timeout: 
+                self.stopped = 'timeout'
+            return self.stopped is not None
+
+        measures, top, counters = jacobi_solve(offsets, targets, priorities, even_owned, bounds, measures, top, frozen, stop)
+        self.bulk_rounds = counters['rounds']
+        self.lift_amount += counters['lifts']
+        self.changed_lifts += counters['changed_lifts']
+        self.tops_reached += counters['tops_reached']
+        self.measures.prog_calls = counters['prog_calls']
+        for v in self.vertices: 
+            t: Tuple = self.domain.get_empty_tuple()
+            for c, i in enumerate(odd_indices): 
+                t.values[i] = int(measures[v.id, c])
+            t.set_top(bool(top[v.id]))
+            self.measures.set_tuple(v, t)
+        if self.stopped and self.checkpoint_path: 
+            self.__write_checkpoint(None)
+
+    # Lifts the game with worklists in self.workers processes that share the measures (see 
+    # parallellift.py) and puts the result in the measure store. Decided vertices keep the measure 
+    # presolve gave them. The workers lift packed radix measures whatever the engine is, the 
+    # measures are moved over as tuples. 
+    def __solve_parallel(self, decided: list[bool]) -> None: 
+        if self.engine == Engine.SUCCINCT: 
+            raise ValueError('the parallel strategy lifts classic measures, it cannot be used with the succinct engine')
+        if self.graph is not None: 
+            graph = self.graph
+            succ_offsets, succ_targets = graph.succ_offsets, graph.succ_targets
+            pred_offsets, pred_targets = graph.pred_offsets, graph.pred_targets
+            priorities = graph.priorities
+            even_owned = graph.owners
         else: 
-            m.set_value_range(0, v.priority + 1, w.tuple.get_range(0, v.priority + 1))
-            m.add(v.priority)
-        return m 
-    
+            src: array = array('i', (v.id for v in self.vertices for _ in v.next))
+            dst: array = array('i', (w.id for v in self.vertices for w in v.next))
+            succ_offsets, succ_targets = build_csr(self.n_vertices, src, dst)
+            pred_offsets, pred_targets = build_csr(self.n_vertices, dst, src)
+            priorities = array('i', (v.priority for v in self.vertices))
+            even_owned = array('b', (1 if v.owner == Player.EVEN else 0 for v in self.vertices))
+        # start from the measures in the store, which are not empty after presolve or a resume 
+        radix = RadixMeasureStore(self.vertices, self.domain)
+        for v in self.vertices: 
+            radix.set_tuple(v, self.measures.get_tuple(v))
+
+        lift_limit = self.lift_amount + self.lift_budget if self.lift_budget is not None else None
+        def stop(lifts: int) -> bool: 
+            if lift_limit is not None and self.lift_amount + lifts >= lift_limit: 
+                self.stopped = 'lift budget'
+            elif self.timeout is not None and time.perf_counter() - self.__solve_start >= self.timeout: 
+                self.stopped = 'timeout'
+            return self.stopped is not None
+
+        radix.values, counters = parallel_solve(succ_offsets, succ_targets, pred_offsets, pred_targets, priorities, even_owned, 
+                                                radix.mods, radix.incs, radix.top, radix.values, decided, self.workers, stop)
+        self.lift_amount += counters.pop('lifts')
+        self.changed_lifts += counters.pop('changed_lifts')
+        self.tops_reached += counters.pop('tops_reached')
+        self.measures.prog_calls = counters.pop('prog_calls')
+        self.strategy_counters.update(counters)
+        for v in self.vertices: 
+            self.measures.set_tuple(v, radix.get_tuple(v))
+        if self.stopped and self.checkpoint_path: 
+            self.__write_checkpoint(None)
+
+    # Solves the vertices presolve did not decide with Zielonka's algorithm (see zielonka.py) and puts 
+    # the winners in the measure store: top where odd wins, the empty measure where even wins. These 
+    # are not progress measures, so resolve solves the game again after edits. Only the timeout 
+    # stops it early, then only the vertices presolve put at top are decided. 
+    def __solve_zielonka(self, decided: list[bool]) -> None: 
+        if self.graph is not None: 
+            graph = self.graph
+            def owner(id: int) -> Player: 
+                return Player.EVEN if graph.owners[id] else Player.ODD
+            priority = graph.priorities.__getitem__
+            successors = graph.successors
+            predecessors = graph.predecessors
+        else: 
+            vertices = self.vertices
+            def owner(id: int) -> Player: 
+                return vertices[id].owner
+            def priority(id: int) -> int: 
+                return vertices[id].priority
+            def successors(id: int): 
+                return [w.id for w in vertices[id].next]
+            def predecessors(id: int): 
+                return [u.id for u in vertices[id].prev]
+
+        def stop() -> bool: 
+            if self.timeout is not None and time.perf_counter() - self.__solve_start >= self.timeout: 
+                self.stopped = 'timeout'
+            return self.stopped is not None
+
+        winners, counters = zielonka_solve(self.n_vertices, (id for id in range(self.n_vertices) if not decided[id]), 
+                                           owner, priority, successors, predecessors, stop)
+        self.strategy_counters.update(counters)
+        if winners is None: 
+            return
+        odd_wins, _ = winners
+        for id in odd_wins: 
+            self.measures.set_top(self.vertices[id])
+
+    # Lifts the vertices of the lift strategy until it is finished, returns the number of lifts 
+    def __lift_until_stable(self, lift_strategy: LiftStrategy) -> int: 
+        lifts = 0
+        lift_limit = self.lift_amount + self.lift_budget if self.lift_budget is not None else -1
+        watch = self.progress is not None or self.timeout is not None or self.checkpoint_path is not None
+        # targets that did not reach top yet, the lift strategy may have put some at top already 
+        open_targets = None if self.targets is None else {id for id in self.targets if not self.measures.is_top(self.vertices[id])}
+        try: 
+            while not lift_strategy.is_finished(): 
+                if self.lift_amount == lift_limit: 
+                    self.stopped = 'lift budget'
+                    break
+                if open_targets is not None and len(open_targets) == 0: 
+                    self.stopped = 'decided targets'
+                    break
+                v: Vertex | None = lift_strategy.next_vertex()
+                if not v: break # if the queue is empty we break out of the loop
+
+                # lift the vertex in place 
+                changed: bool = self.measures.lift(v)
+                lifts += 1
+                self.lift_amount += 1
+                # check if the found measure is stable 
+                if (not changed): 
+                    # no change in measure 
+                    lift_strategy.set_stable(v, True)
+                else: 
+                    # there has been a change in measure 
+                    self.changed_lifts += 1
+                    if self.measures.is_top(v): 
+                        self.tops_reached += 1
+                        if open_targets is not None: 
+                            open_targets.discard(v.id)
+                    lift_strategy.set_stable(v, False)
+                    lift_strategy.was_lifted(v)
+                if watch and self.lift_amount % self.progress_check == 0 and self.__check_running(lift_strategy): 
+                    break
+        except KeyboardInterrupt: 
+            # keep the measures so far, a later run can resume from them. The interrupt can come 
+            # between a lift and queueing its predecessors, so the strategy state is not kept. 
+            if self.checkpoint_path: 
+                self.__write_checkpoint(None)
+            raise
+        if self.stopped and self.checkpoint_path: 
+            self.__write_checkpoint(lift_strategy)
+        if self.progress: 
+            self.progress(self.progress_report(lift_strategy))
+
+        # with a strategy per component the largest value of every counter is kept 
+        for name, value in lift_strategy.counters().items(): 
+            self.strategy_counters[name] = max(self.strategy_counters.get(name, 0), value)
+        return lifts
+
+    # Decides only the given vertices (default the start vertex). The winner of a vertex only depends 
+    # on the vertices it can reach, so only that part of the game is explored and lifted, as a game 
+    # of its own: the vertices of this game are never built. Lifting stops as soon as every target 
+    # reached top (odd wins it), otherwise when the explored part is stable. Returns the winner of 
+    # every target, None for a target that is not decided because the solve stopped early. 
+    def solve_local(self, targets: list[int] | None = None, report: bool = True, 
+                    lift_budget: int | None = None, timeout: float | None = None) -> dict[int, Player | None]: 
+        targets = targets if targets is not None else [self.start]
+        self.__reset_counters()
+        with phase(self.phase_times, 'explore'): 
+            local, mapping = self.__local_game(targets)
+        local.strategy = self.strategy
+        local.engine = self.engine
+        local.presolve = self.presolve
+        local.workers = self.workers
+        local.targets = [mapping[id] for id in targets]
+        local.set_progress(self.progress, self.progress_every, self.progress_seconds)
+        local.solve(report=False, lift_budget=lift_budget, timeout=timeout)
+
+        self.lift_amount = local.lift_amount
+        self.bulk_rounds = local.bulk_rounds
+        self.presolved = local.presolved
+        self.changed_lifts = local.changed_lifts
+        self.tops_reached = local.tops_reached
+        # the measures belong to the local game, only its counters are kept 
+        self.measures = None
+        self.strategy_counters = local.measures.counters() | local.strategy_counters
+        self.picked = local.picked
+        self.phase_times.update((name, t) for name, t in local.phase_times.items() if name != 'parse')
+        self.stopped = local.stopped
+        self.explored = (local.n_vertices, local.graph.n_edges)
+        self.local_winners = {}
+        for id in targets: 
+            t: Tuple = local.vertices[mapping[id]].tuple
+            decided = t.top or local.stopped is None or local.stopped == 'decided targets'
+            self.local_winners[id] = (Player.ODD if t.top else Player.EVEN) if decided else None
+        if report: 
+            self.print_results()
+        return self.local_winners
+
+    # The part of the game reachable from targets as a game of its own, and for every vertex of this 
+    # game its id in that game (-1 when it is not reachable). The ids follow a breadth first search 
+    # from the targets. 
+    def __local_game(self, targets: list[int]) -> tuple[ParityGame, array]: 
+        graph = self.graph
+        if graph is not None: 
+            def successors(id: int): 
+                return graph.successors(id)
+        else: 
+            def successors(id: int): 
+                return [w.id for w in self.vertices[id].next]
+        mapping: array = array('i', [-1]) * self.n_vertices
+        reached: list[int] = []
+        for id in targets: 
+            if mapping[id] == -1: 
+                mapping[id] = len(reached)
+                reached.append(id)
+        i = 0
+        while i < len(reached): 
+            for w in successors(reached[i]): 
+                if mapping[w] == -1: 
+                    mapping[w] = len(reached)
+                    reached.append(w)
+            i += 1
+
+        local = GameGraph(len(reached))
+        src: array = array('i')
+        dst: array = array('i')
+        for new_v, id in enumerate(reached): 
+            if graph is not None: 
+                local.priorities[new_v] = graph.priorities[id]
+                local.owners[new_v] = graph.owners[id]
+                local.names[new_v] = graph.names[id]
+            else: 
+                v = self.vertices[id]
+                local.priorities[new_v] = v.priority
+                local.owners[new_v] = 1 if v.owner == Player.EVEN else 0
+                local.names[new_v] = v.name
+            for w in successors(id): 
+                src.append(new_v)
+                dst.append(mapping[w])
+        local.max_priority = max(local.priorities, default=-1)
+        local.start = mapping[targets[0]] if len(targets) > 0 else 0
+        local.succ_offsets, local.succ_targets = build_csr(local.n_vertices, src, dst)
+        local.pred_offsets, local.pred_targets = build_csr(local.n_vertices, dst, src)
+
+        game = ParityGame(local.n_vertices, self.file, local)
+        game.max_priority = local.max_priority
+        game.start = local.start
+        game.__set_max_tuple()
+        return game, mapping
+
+    # Solves the game with the measures of both players side by side. The measures of this game reach 
+    # top where odd wins, the measures of the dual game (every priority one higher and the owners 
+    # swapped, so the players swap sides) reach top where even wins. The two lift strategies take 
+    # turns of one lift each. A vertex is decided as soon as its measure reaches top on either side, 
+    # from then on it is skipped in both worklists and keeps its measure on the other side: it is won 
+    # by the player that side's measures are finite for, so it acts like a sink that player wins and 
+    # the other measures still reach the same tops. When either side is stable every vertex is 
+    # decided, the vertices it did not put at top are won by the other player. With a lift budget or 
+    # timeout the solve can stop earlier, the vertices that are decided by then are reported. 
+    # Returns the winner of every vertex, None for a vertex that is not decided. 
+    def solve_dual(self, report: bool = True, lift_budget: int | None = None, timeout: float | None = None) -> list[Player | None]: 
+        if self.strategy in (Strategy.BULK, Strategy.ZIELONKA, Strategy.PARALLEL): 
+            raise ValueError('the {strategy} strategy solves the whole game at once, it cannot take turns with the dual game'.format(strategy=strat_to_string(self.strategy)))
+        self.__reset_vertices()
+        self.__reset_counters()
+        self.lift_budget = lift_budget
+        self.timeout = timeout
+        with phase(self.phase_times, 'solve'): 
+            with phase(self.phase_times, 'dual'): 
+                dual = self.__dual_game()
+                dual.strategy = self.strategy
+                dual.engine = self.engine
+                dual.__reset_vertices()
+            with phase(self.phase_times, 'presolve'): 
+                decided = self.__presolve()
+            self.__decided = decided if self.presolved else None
+            winners: list[Player | None] = [None for _ in range(self.n_vertices)]
+            for v, w in zip(self.vertices, dual.vertices): 
+                if decided[v.id]: 
+                    w.stable = True
+                    if not self.measures.is_top(v): 
+                        dual.measures.set_top(w)
+
+            with phase(self.phase_times, 'lift'): 
+                lift_strategy = self.__init_lift_strategy([v for v in self.vertices if not decided[v.id]])
+                dual_strategy = dual.__init_lift_strategy([w for w in dual.vertices if not decided[w.id]])
+                # presolve and some strategies put vertices at top before lifting 
+                for v, w in zip(self.vertices, dual.vertices): 
+                    if self.measures.is_top(v): 
+                        winners[v.id] = Player.ODD
+                    elif dual.measures.is_top(w): 
+                        winners[v.id] = Player.EVEN
+                self.dual_winners = winners
+                finished = self.__lift_dual(lift_strategy, dual, dual_strategy)
+
+            with phase(self.phase_times, 'store'): 
+                # the vertices a stable side did not put at top are won by the other player 
+                if finished is not None: 
+                    for id, winner in enumerate(winners): 
+                        if winner is None: 
+                            winners[id] = Player.EVEN if finished == Player.ODD else Player.ODD
+                self.measures.store_tuples()
+                for v in self.vertices: 
+                    v.tuple.set_top(winners[v.id] == Player.ODD)
+        if self.progress: 
+            self.progress(self.progress_report())
+        # the measures of neither side are a fixpoint of the whole game, only the counters are kept 
+        self.strategy_counters = self.measures.counters() | self.strategy_counters
+        self.strategy_counters['prog_calls'] += dual.measures.prog_calls
+        self.measures = None
+        if report: 
+            self.print_results()
+        return winners
+
+    # The same game with every priority one higher and the owners swapped: a play has an even lowest 
+    # priority in one game exactly when it has an odd one in the other, so the winners are swapped. 
+    # The dual of a compact graph shares its edges and names. 
+    def __dual_game(self) -> ParityGame: 
+        graph = self.graph
+        dual = GameGraph(0)
+        dual.n_vertices = self.n_vertices
+        if graph is not None: 
+            dual.priorities = array('i', (p + 1 for p in graph.priorities))
+            dual.owners = array('b', (1 - owner for owner in graph.owners))
+            dual.names = graph.names
+            dual.succ_offsets, dual.succ_targets = graph.succ_offsets, graph.succ_targets
+            dual.pred_offsets, dual.pred_targets = graph.pred_offsets, graph.pred_targets
+            dual.start = graph.start
+        else: 
+            dual.priorities = array('i', (v.priority + 1 for v in self.vertices))
+            dual.owners = array('b', (0 if v.owner == Player.EVEN else 1 for v in self.vertices))
+            dual.names = NameTable(self.n_vertices)
+            for v in self.vertices: 
+                dual.names[v.id] = v.name
+            src: array = array('i', (v.id for v in self.vertices for _ in v.next))
+            dst: array = array('i', (w.id for v in self.vertices for w in v.next))
+            dual.succ_offsets, dual.succ_targets = build_csr(self.n_vertices, src, dst)
+            dual.pred_offsets, dual.pred_targets = build_csr(self.n_vertices, dst, src)
+            dual.start = self.start
+        dual.max_priority = self.max_priority + 1
+
+        game = ParityGame(self.n_vertices, self.file, dual)
+        game.max_priority = dual.max_priority
+        game.start = dual.start
+        game.__set_max_tuple()
+        return game
+
+    # Takes turns lifting a vertex of this game and of the dual game until every vertex is decided, 
+    # one of the sides is stable or the solve has to stop. Returns the player whose measures are 
+    # stable (odd for this game, even for the dual game), None when neither is. 
+    def __lift_dual(self, lift_strategy: LiftStrategy, dual: ParityGame, dual_strategy: LiftStrategy) -> Player | None: 
+        winners = self.dual_winners
+        undecided = winners.count(None)
+        sides = ((self.measures, lift_strategy, Player.ODD), (dual.measures, dual_strategy, Player.EVEN))
+        side_lifts = [0, 0]
+        lift_limit = self.lift_amount + self.lift_budget if self.lift_budget is not None else -1
+        watch = self.progress is not None or self.timeout is not None
+        finished: Player | None = None
+        turns = 0
+        while finished is None and undecided > 0 and self.stopped is None: 
+            for side, (measures, strategy, player) in enumerate(sides): 
+                # a turn lifts once for each player, the budget can run out in between 
+                if lift_limit >= 0 and self.lift_amount >= lift_limit: 
+                    self.stopped = 'lift budget'
+                    break
+                v: Vertex | None = None if strategy.is_finished() else strategy.next_vertex()
+                if not v: 
+                    finished = player
+                    break
+                if winners[v.id] is not None: 
+                    # decided by the other side, it is dropped from this worklist 
+                    strategy.set_stable(v, True)
+                    continue
+
+                changed: bool = measures.lift(v)
+                side_lifts[side] += 1
+                self.lift_amount += 1
+                if (not changed): 
+                    strategy.set_stable(v, True)
+                else: 
+                    self.changed_lifts += 1
+                    strategy.set_stable(v, False)
+                    strategy.was_lifted(v)
+                    if measures.is_top(v): 
+                        self.tops_reached += 1
+                        winners[v.id] = player
+                        undecided -= 1
+            turns += 1
+            if watch and turns % self.progress_check == 0 and self.__check_running(lift_strategy): 
+                break
+
+        for strategy in (lift_strategy, dual_strategy): 
+            for name, value in strategy.counters().items(): 
+                self.strategy_counters[name] = max(self.strategy_counters.get(name, 0), value)
+        self.strategy_counters['odd_measure_lifts'] = side_lifts[0]
+        self.strategy_counters['even_measure_lifts'] = side_lifts[1]
+        return finished
+
+    # Solve the game one strongly connected component at a time, bottom components first. When a 
+    # component is solved the measures of everything below it are final, so only its own vertices 
+    # are queued in the lift strategy. Components of the same level are independent and are solved 
+    # by a pool of workers processes when workers > 1. 
+    def solve_scc(self, report: bool = True, workers: int = 1) -> None: 
+        global scc_game
+        self.__reset_vertices()
+        self.__reset_counters()
+        solve_start = time.perf_counter()
+        with phase(self.phase_times, 'presolve'): 
+            decided = self.__presolve()
+        self.__decided = decided if self.presolved else None
+
+        def successors(id: int): 
+            return (w.id for w in self.vertices[id].next)
+        with phase(self.phase_times, 'scc'): 
+            component_ids = strongly_connected_components(self.n_vertices, successors)
+        # decided vertices are left out of their components, they are never lifted 
+        components = [[self.vertices[id] for id in component if not decided[id]] for component in component_ids]
+        lifts: list[int] = [0 for _ in components]
+        # the workers inherit the solved lower levels by forking 
+        parallel = workers > 1 and 'fork' in multiprocessing.get_all_start_methods()
+        lift_start = time.perf_counter()
+        for level in component_levels(component_ids, successors): 
+            level = [i for i in level if len(components[i]) > 0]
+            if parallel and len(level) > 1: 
+                scc_game = self
+                with multiprocessing.get_context('fork').Pool(processes=min(workers, len(level))) as pool: 
+                    jobs = [[v.id for v in components[i]] for i in level]
+                    for i, (component_lifts, measures) in zip(level, pool.map(scc_worker, jobs)): 
+                        lifts[i] = component_lifts
+                        self.lift_amount += component_lifts
+                        for id, values, top in measures: 
+                            t: Tuple = Tuple(values, self.domain)
+                            t.set_top(top)
+                            self.measures.set_tuple(self.vertices[id], t)
+                scc_game = None
+            else: 
+                for i in level: 
+                    lifts[i] = self.solve_component(components[i])
+        self.phase_times['lift'] = time.perf_counter() - lift_start
+
+        self.scc_lifts = [(len(component), lifts[i]) for i, component in enumerate(components)]
+        with phase(self.phase_times, 'store'): 
+            self.measures.store_tuples()
+        self.phase_times['solve'] = time.perf_counter() - solve_start
+        if report: 
+            self.print_results()
+
+    # Lifts only the given vertices until they are stable, the measures of all other vertices are 
+    # taken as they are. Returns the number of lifts. 
+    def solve_component(self, component: list[Vertex]) -> int: 
+        lift_strategy = self.__init_lift_strategy(component)
+        return self.__lift_until_stable(lift_strategy)
+
+    # Races several strategies on this game, each in its own process. The first strategy that 
+    # finishes wins, its measures are copied onto this game and the other processes are stopped. 
+    # Returns the name of the winning strategy and the number of lifts every strategy got to. 
+    def solve_portfolio(self, strategies: list[str], report: bool = True, progress_every: int = 1000) -> dict: 
+        results: Queue = Queue()
+        lifts = {strategy: Value('q', 0, lock=False) for strategy in strategies}
+        processes = {
+            strategy: Process(target=portfolio_worker, 
+                              args=(self.file, strategy, engine_string(self.engine), lifts[strategy], results, progress_every), 
+                              daemon=True) 
+            for strategy in strategies
+        }
+        for process in processes.values(): 
+            process.start()
+
+        winner: str | None = None
+        errors: dict[str, str] = {}
+        # the strategies that sent a result or an error, the others are cancelled at the end 
+        posted: set[str] = set()
+        # the workers that were found exited without a result at the last poll 
+        exited: set[str] = set()
+        try: 
+            # wait for the first strategy that solves the game, a failing strategy does not end the race 
+            while winner is None and len(errors) < len(strategies): 
+                try: 
+                    strategy, measures, counters, error = results.get(timeout=PORTFOLIO_POLL)
+                except queue.Empty: 
+                    # a worker that died (out of memory, a crash) never sends anything. What a worker 
+                    # sent just before it exited can still be on its way, so it only counts as dead 
+                    # when it is still found exited one poll later. 
+                    gone = {strategy for strategy, process in processes.items() if strategy not in posted and process.exitcode is not None}
+                    for strategy in gone & exited: 
+                        posted.add(strategy)
+                        errors[strategy] = 'the worker exited with code {code} without a result'.format(code=processes[strategy].exitcode)
+                    exited = gone - exited
+                    continue
+                posted.add(strategy)
+                if error: 
+                    errors[strategy] = error
+                    continue 
+                winner = strategy
+            # strategies that finished as well are not cancelled 
+            while True: 
+                try: 
+                    strategy, _, _, error = results.get_nowait()
+                except queue.Empty: 
+                    break
+                posted.add(strategy)
+                if error: 
+                    errors[strategy] = error
+            for strategy, process in processes.items(): 
+                if strategy not in posted and process.exitcode is not None: 
+                    posted.add(strategy)
+                    errors[strategy] = 'the worker exited with code {code} without a result'.format(code=process.exitcode)
+        finally: 
+            for process in processes.values(): 
+                if process.is_alive(): 
+                    process.terminate()
+            for process in processes.values(): 
+                process.join()
+        cancelled: list[str] = [strategy for strategy in strategies if strategy not in posted]
+
+        if winner is None: 
+            raise RuntimeError('every strategy in the portfolio failed: {errors}'.format(errors=errors))
+
+        # take over the solution of the winner 
+        self.strategy = string_to_strat(winner)
+        self.lift_amount = lifts[winner].value
+        self.changed_lifts = counters['changed_lifts']
+        self.tops_reached = counters['tops_reached']
+        self.strategy_counters = counters['strategy']
+        for v, (values, top) in zip(self.vertices, measures): 
+            v.tuple = Tuple(values, self.domain)
+            v.tuple.set_top(top)
+
+        portfolio = {
+            'winner': winner, 
+            'lifts': {strategy: lifts[strategy].value for strategy in strategies}, 
+            'cancelled': cancelled, 
+            'errors': errors, 
+        }
+        if report: 
+            self.print_results()
+            print('Portfolio winner:', winner)
+            for strategy in strategies: 
+                if strategy != winner: 
+                    state = 'failed' if strategy in errors else 'cancelled' if strategy in cancelled else 'finished'
+                    print('  {strategy} {state} after {lifts} lifts'.format(strategy=strategy, state=state, lifts=portfolio['lifts'][strategy]))
+            print()
+        return portfolio
+        
+    # the vertices odd wins and the vertices even wins, after a dual solve that stopped early the 
+    # vertices that are not decided are in neither 
     def make_groups(self) -> tuple[list[Vertex], list[Vertex]]: 
         odd_wins: list[Vertex] = []
         even_wins: list[Vertex] = []
         for v in self.vertices: 
+            if self.dual_winners is not None and self.dual_winners[v.id] is None: 
+                continue
             if v.tuple.top: 
                 odd_wins.append(v)
             else: 
                 even_wins.append(v)
         return odd_wins, even_wins 
+
+    def __verdict(self) -> Player | None: 
+        if self.dual_winners is not None: 
+            return self.dual_winners[self.start]
+        return Player.ODD if self.vertices[self.start].tuple.top else Player.EVEN
     
+    # results of the last solve in a form that can be written as json 
+    def get_results(self) -> dict: 
+        results = {
+            'file': self.file, 
+            'strategy': strat_to_string(self.strategy), 
+            'engine': engine_string(self.engine), 
+        }
+        if self.picked is not None: 
+            results['picked'] = strat_to_string(self.picked)
+        if self.local_winners is not None: 
+            # a local solve only decides its targets 
+            winners = [winner_string(winner) for winner in self.local_winners.values()]
+            results['verdict'] = winners[0] if len(winners) > 0 else None
+            results['winners'] = {str(id): winner_string(winner) for id, winner in self.local_winners.items()}
+            results['explored_vertices'], results['explored_edges'] = self.explored
+        else: 
+            odd_wins, even_wins = self.make_groups()
+            results['verdict'] = winner_string(self.__verdict())
+            results['odd_wins'] = len(odd_wins)
+            results['even_wins'] = len(even_wins)
+            if self.dual_winners is not None: 
+                results['undecided'] = self.n_vertices - len(odd_wins) - len(even_wins)
+        results['lifts'] = self.lift_amount
+        if self.measures is not None: 
+            results.update(self.measures.counters())
+        if self.presolved is not None: 
+            results['presolved'] = self.presolved
+        if self.bulk_rounds is not None: 
+            results['rounds'] = self.bulk_rounds
+        if self.stopped is not None: 
+            results['stopped'] = self.stopped
+        if self.requeued is not None: 
+            results['requeued'] = self.requeued
+        results['changed_lifts'] = self.changed_lifts
+        results['noop_lifts'] = self.lift_amount - self.changed_lifts
+        results['tops_reached'] = self.tops_reached
+        results.update(self.strategy_counters)
+        results['phase_times'] = dict(self.phase_times)
+        if self.scc_lifts is not None: 
+            results['sccs'] = len(self.scc_lifts)
+            results['scc_lifts'] = self.__heaviest_components()
+        return results
+
+    # (size, lifts) of the components that took the most lifts 
+    def __heaviest_components(self, amount: int = 10) -> list[tuple[int, int]]: 
+        return sorted(self.scc_lifts, key=lambda c: c[1], reverse=True)[:amount]
+
     def print_results(self) -> None: 
-        odd_wins, even_wins = self.make_groups()
         print("##################################")
         print('File path:', self.file)
-        print('Strategy:', strategy_string(self.strategy))
+        if self.picked is not None: 
+            print('Strategy: {auto} (picked {picked})'.format(auto=strategy_string(self.strategy), picked=strategy_string(self.picked)))
+        else: 
+            print('Strategy:', strategy_string(self.strategy))
+        print('Engine:', engine_string(self.engine))
         print('Number of lifts:', self.lift_amount)
-        print("Vertices that player odd wins:", len(odd_wins))
-        print("Vertices that player even wins:", len(even_wins))
-        print("Verdict:", "odd wins" if self.vertices[0].tuple.top else "even wins")
+        if self.local_winners is not None: 
+            print("Explored vertices: {n} of {total} ({m} edges)".format(n=self.explored[0], total=self.n_vertices, m=self.explored[1]))
+            for id, winner in self.local_winners.items(): 
+                print("Vertex {id}: {winner}".format(id=id, winner=winner_string(winner) + " wins" if winner is not None else "not decided"))
+        else: 
+            odd_wins, even_wins = self.make_groups()
+            print("Vertices that player odd wins:", len(odd_wins))
+            print("Vertices that player even wins:", len(even_wins))
+            if self.dual_winners is not None: 
+                print("Vertices not decided:", self.n_vertices - len(odd_wins) - len(even_wins))
+            verdict = self.__verdict()
+            print("Verdict:", winner_string(verdict) + " wins" if verdict is not None else "not decided")
+        if self.stopped == 'decided targets': 
+            print("Stopped early: the targets were decided")
+        elif self.stopped is not None and self.dual_winners is not None: 
+            print("Stopped early by the {reason}: the vertices that reached top on either side are decided".format(reason=self.stopped))
+        elif self.stopped is not None: 
+            print("Stopped early by the {reason}: only the vertices that odd wins are decided".format(reason=self.stopped))
+        if self.measures is not None: 
+            for name, value in self.measures.counters().items(): 
+                print("{name}: {value}".format(name=name.replace('_', ' ').capitalize(), value=value))
+        if self.presolved is not None: 
+            print("Vertices decided before lifting:", self.presolved)
+        if self.bulk_rounds is not None: 
+            print("Number of rounds:", self.bulk_rounds)
+        if self.requeued is not None: 
+            print("Vertices queued by the re-solve:", self.requeued)
+        print("Lifts that changed a measure:", self.changed_lifts)
+        print("Measures that reached top:", self.tops_reached)
+        for name, value in self.strategy_counters.items(): 
+            print("{name}: {value}".format(name=name.replace('_', ' ').capitalize(), value=value))
+        if len(self.phase_times) > 0: 
+            print("Time per phase:", ', '.join('{name} {time:.3f}s'.format(name=name, time=t) for name, t in self.phase_times.items()))
+        if self.scc_lifts is not None: 
+            print("Number of SCCs:", len(self.scc_lifts))
+            for size, lifts in self.__heaviest_components(): 
+                print("  SCC of {size} vertices: {lifts} lifts".format(size=size, lifts=lifts))
         print("##################################\n")
 
     def __str__(self) -> str:
@@ -199,3 +1420,35 @@ class ParityGame:
             output_string += (str(vertex) + "\n")
         return output_string
        
+
+# Runs one strategy of a portfolio race, the lift counter is shared with the parent so it can 
+# report how far a cancelled strategy got 
+def portfolio_worker(file: str, strategy: str, engine: str, lifts, results: Queue, progress_every: int) -> None: 
+    try: 
+        pg = ParityGame.parse_graph(file)
+        pg.set_solve_strategy(strategy)
+        pg.set_solve_engine(engine)
+
+        def progress(report: dict) -> None: 
+            lifts.value = report['lifts']
+
+        pg.set_progress(progress, progress_every)
+        pg.solve(report=False)
+        lifts.value = pg.lift_amount
+        counters = {'changed_lifts': pg.changed_lifts, 'tops_reached': pg.tops_reached, 'strategy': pg.strategy_counters}
+        results.put((strategy, [(v.tuple.values, v.tuple.top) for v in pg.vertices], counters, None))
+    except Exception as e: 
+        results.put((strategy, None, None, repr(e)))
+
+# game of the running solve_scc, read by the forked workers 
+scc_game: ParityGame | None = None
+
+# Solves one component of scc_game in a forked worker and sends its measures back 
+def scc_worker(component_ids: list[int]) -> tuple[int, list[tuple[int, list[int], bool]]]: 
+    component = [scc_game.vertices[id] for id in component_ids]
+    lifts = scc_game.solve_component(component)
+    measures = []
+    for v in component: 
+        t: Tuple = scc_game.measures.get_tuple(v)
+        measures.append((v.id, t.values, t.top))
+    return lifts, measures
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from array import array
+
+from attractor import attractor
+from gameparser import GameGraph, build_csr
+from scc import strongly_connected_components, is_cyclic
+from vertex import Player
+
+# Result of preprocessing a game: the reduced game, for every vertex of the original game its id
+# in the reduced game (-1 when it was decided by a pass) and the winner of the decided vertices.
+# reports holds the size of the game before and after every pass that ran.
+class Reduction:
+
+    def __init__(self, original: GameGraph) -> None:
+        self.original: GameGraph = original
+        self.graph: GameGraph = original
+        self.mapping: array = array('i', range(original.n_vertices))
+        self.odd_wins: bytearray = bytearray(original.n_vertices) # only meaningful for decided vertices
+        self.reports: list[dict] = []
+
+    # Runs a pass that turns the current graph into a smaller one. mapping maps the vertices of the
+    # current graph to the new graph (-1 when removed) and decided holds the winner of removed vertices.
+    def apply(self, name: str, graph: GameGraph, mapping: array, decided: dict[int, bool]) -> None:
+        self.reports.append({
+            'pass': name,
+            'vertices': (self.graph.n_vertices, graph.n_vertices),
+            'edges': (self.graph.n_edges, graph.n_edges),
+            'max_priority': (self.graph.max_priority, graph.max_priority),
+        })
+        for v in range(self.original.n_vertices):
+            current = self.mapping[v]
+            if current == -1:
+                continue
+            self.mapping[v] = mapping[current]
+            if mapping[current] == -1:
+                self.odd_wins[v] = 1 if decided[current] else 0
+        self.graph = graph
+
+    def print_reports(self) -> None:
+        for report in self.reports:
+            print('Preprocessing {name}: {v0} -> {v1} vertices, {e0} -> {e1} edges, max priority {p0} -> {p1}'.format(
+                name=report['pass'],
+                v0=report['vertices'][0], v1=report['vertices'][1],
+                e0=report['edges'][0], e1=report['edges'][1],
+                p0=report['max_priority'][0], p1=report['max_priority'][1]))
+
+# Builds the graph of the vertices that are kept. mapping maps old ids to new ids (-1 when removed),
+# several old vertices may map to the same new vertex. Only the edges of the vertices in sources are
+# used, and edges to removed vertices are dropped.
+def build_graph(graph: GameGraph, mapping: array, n_vertices: int, priorities: array, sources: list[int]) -> GameGraph:
+    reduced = GameGraph(n_vertices)
+    reduced.start = max(mapping[graph.start], 0) if graph.n_vertices > 0 else 0
+    src: array = array('i')
+    dst: array = array('i')
+    for v in sources:
+        new_v = mapping[v]
+        reduced.priorities[new_v] = priorities[v]
+        reduced.owners[new_v] = graph.owners[v]
+        reduced.names[new_v] = graph.names[v]
+        seen: set[int] = set()
+        for w in graph.successors(v):
+            new_w = mapping[w]
+            if new_w != -1 and new_w not in seen:
+                seen.add(new_w)
+                src.append(new_v)
+                dst.append(new_w)
+    reduced.max_priority = max(reduced.priorities, default=-1)
+    reduced.succ_offsets, reduced.succ_targets = build_csr(n_vertices, src, dst)
+    reduced.pred_offsets, reduced.pred_targets = build_csr(n_vertices, dst, src)
+    return reduced
+
+def owner_of(graph: GameGraph):
+    return lambda v: Player.EVEN if graph.owners[v] else Player.ODD
+
+# Dead ends are won by the opponent of their owner (the owner cannot move), and so is the attractor
+# of the opponent to them. These vertices are removed, which can create new dead ends, so this is
+# repeated until no dead ends are left.
+def remove_dead_ends(graph: GameGraph) -> tuple[GameGraph, array, dict[int, bool]]:
+    n = graph.n_vertices
+    removed = bytearray(n)
+    degree = [graph.succ_offsets[v + 1] - graph.succ_offsets[v] for v in range(n)]
+    decided: dict[int, bool] = {}
+    dead_ends = [v for v in range(n) if degree[v] == 0]
+    while dead_ends:
+        for player in (Player.ODD, Player.EVEN):
+            # player wins the dead ends of the other player
+            targets = [v for v in dead_ends if not removed[v] and owner_of(graph)(v) != player]
+            if len(targets) == 0:
+                continue
+            won = attractor(targets, player, owner_of(graph), graph.predecessors, lambda v: degree[v], removed)
+            for v in won:
+                removed[v] = 1
+                decided[v] = player == Player.ODD
+            for v in won:
+                for u in graph.predecessors(v):
+                    degree[u] -= 1
+        dead_ends = [v for v in range(n) if not removed[v] and degree[v] == 0]
+
+    mapping = array('i', [-1]) * n
+    kept = [v for v in range(n) if not removed[v]]
+    for i, v in enumerate(kept):
+        mapping[v] = i
+    return build_graph(graph, mapping, len(kept), graph.priorities, kept), mapping, decided
+
+# A vertex u with a single successor w that has no other predecessors is always followed by w, so
+# the two can be merged into one vertex with the lowest of their priorities and the owner and
+# successors of w. Whole chains (and cycles) of such vertices become a single vertex.
+def contract_chains(graph: GameGraph) -> tuple[GameGraph, array, dict[int, bool]]:
+    n = graph.n_vertices
+    link = [-1] * n # the vertex that v is merged into
+    linked_to = bytearray(n)
+    for u in range(n):
+        successors = graph.successors(u)
+        if len(successors) == 1:
+            w = successors[0]
+            if w != u and len(graph.predecessors(w)) == 1:
+                link[u] = w
+                linked_to[w] = 1
+
+    representative = [-1] * n
+    priorities = array('i', graph.priorities)
+    # chains start at a vertex that nothing links to and end at a vertex without link
+    for head in range(n):
+        if linked_to[head] or link[head] == -1:
+            continue
+        chain = [head]
+        while link[chain[-1]] != -1:
+            chain.append(link[chain[-1]])
+        for v in chain:
+            representative[v] = chain[-1]
+        priorities[chain[-1]] = min(graph.priorities[v] for v in chain)
+    # what is left with a link lies on a cycle of links, which becomes one vertex with a self-loop
+    for start in range(n):
+        if link[start] == -1 or representative[start] != -1:
+            continue
+        cycle = [start]
+        while link[cycle[-1]] != start:
+            cycle.append(link[cycle[-1]])
+        for v in cycle:
+            representative[v] = start
+        # the representative keeps its edge to the next vertex, which becomes a self-loop
+        priorities[start] = min(graph.priorities[v] for v in cycle)
+
+    mapping = array('i', [-1]) * n
+    kept = [v for v in range(n) if representative[v] == -1 or representative[v] == v]
+    for i, v in enumerate(kept):
+        mapping[v] = i
+    for v in range(n):
+        if representative[v] != -1:
+            mapping[v] = mapping[representative[v]]
+    # only the vertices that are kept contribute edges, the links inside a chain disappear
+    return build_graph(graph, mapping, len(kept), priorities, kept), mapping, {}
+
+# The winner only depends on the lowest priority that is seen infinitely often, so:
+# - vertices on no cycle get priority 0, their priority can never be seen infinitely often
+# - priorities are renumbered without gaps, keeping their order and parity, and neighbouring
+#   priorities of the same parity are merged into one
+def compress_priorities(graph: GameGraph) -> tuple[GameGraph, array, dict[int, bool]]:
+    n = graph.n_vertices
+    priorities = array('i', graph.priorities)
+    for component in strongly_connected_components(n, graph.successors):
+        if not is_cyclic(component, graph.successors):
+            priorities[component[0]] = 0
+
+    new_priority: dict[int, int] = {}
+    current = -1
+    for p in sorted(set(priorities)):
+        if current == -1:
+            current = p % 2
+        elif p % 2 != current % 2:
+            current += 1
+        new_priority[p] = current
+    for v in range(n):
+        priorities[v] = new_priority[priorities[v]]
+
+    mapping = array('i', range(n))
+    return build_graph(graph, mapping, n, priorities, list(range(n))), mapping, {}
+
+def preprocess_game(graph: GameGraph, dead_ends: bool = True, chains: bool = True, priorities: bool = True) -> Reduction:
+    reduction = Reduction(graph)
+    if dead_ends:
+        reduction.apply('dead ends', *remove_dead_ends(reduction.graph))
+    if chains:
+        reduction.apply('chains', *contract_chains(reduction.graph))
+    if priorities:
+        reduction.apply('priorities', *compress_priorities(reduction.graph))
+    return reduction
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+# Tarjan's algorithm with an explicit stack, so long paths do not hit the recursion limit.
+# Vertices are the ids 0 .. n_vertices - 1 and successors gives the successor ids of a vertex.
+# A component is only added after every component it can reach, so the list is in bottom-up
+# topological order: solving the components in this order only needs final successor measures.
+def strongly_connected_components(n_vertices: int, successors: Callable[[int], Iterable[int]]) -> list[list[int]]:
+    index: list[int] = [-1] * n_vertices
+    low: list[int] = [0] * n_vertices
+    on_stack: list[bool] = [False] * n_vertices
+    stack: list[int] = []
+    components: list[list[int]] = []
+    counter: int = 0
+
+    for root in range(n_vertices):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(successors(root)))]
+
+        while work:
+            v, next_vertices = work[-1]
+            descended = False
+            for w in next_vertices:
+                if index[w] == -1:
+                    # visit w before continuing with the other successors of v
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    work.append((w, iter(successors(w))))
+                    descended = True
+                    break
+                elif on_stack[w]:
+                    low[v] = min(low[v], index[w])
+            if descended:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+            if low[v] == index[v]:
+                component: list[int] = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component.append(w)
+                    if w == v:
+                        break
+                components.append(component)
+    return components
+
+# Groups the components (in bottom-up order) by level: bottom components have level 0 and a
+# component is one level above the highest component it has an edge to. Components of the same
+# level have no edges between them, so they can be solved independently.
+def component_levels(components: list[list[int]], successors: Callable[[int], Iterable[int]]) -> list[list[int]]:
+    component_of: dict[int, int] = {}
+    for i, component in enumerate(components):
+        for v in component:
+            component_of[v] = i
+
+    levels: list[int] = []
+    for i, component in enumerate(components):
+        level = 0
+        for v in component:
+            for w in successors(v):
+                j = component_of[w]
+                if j != i:
+                    level = max(level, levels[j] + 1)
+        levels.append(level)
+
+    grouped: list[list[int]] = [[] for _ in range(max(levels, default=-1) + 1)]
+    for i, level in enumerate(levels):
+        grouped[level].append(i)
+    return grouped
+
+# True when the component has a cycle, so the priorities of its vertices matter for the winner
+def is_cyclic(component: list[int], successors: Callable[[int], Iterable[int]]) -> bool:
+    if len(component) > 1:
+        return True
+    v = component[0]
+    return any(w == v for w in successors(v))
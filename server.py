@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+
+from gameparser import GameGraph
+from gamecache import load_game
+from paritygame import ParityGame
+
+# Solver daemon: a long running process that solves games for clients on a local unix socket, so a
+# solve does not pay for starting python, the imports and parsing a game it has seen before. A
+# request is one line of json and is answered with one line of json, a connection can send several
+# requests one after the other. The games are solved by solver processes, every solver keeps the
+# games it parsed and the solutions it found in its own least recently used cache. A game always
+# goes to the same solver (picked by its path), so repeated requests find it in the cache and
+# requests for different games are solved at the same time.
+
+# options of a solve request that change its solution, the limits do not: only finished solves are kept
+SOLUTION_OPTIONS = ('strategy', 'engine', 'presolve', 'dual', 'local')
+# the options a request may leave out, with what is used for them
+OPTION_DEFAULTS = {'strategy': 'auto', 'engine': 'tuple'}
+
+# rough size of the results of a solve in the cache, next to its winners
+RESULTS_BYTES = 2048
+
+# Bytes the arrays and the names of a parsed graph take
+def graph_bytes(graph: GameGraph) -> int:
+    arrays = (graph.priorities, graph.owners, graph.succ_offsets, graph.succ_targets,
+              graph.pred_offsets, graph.pred_targets, graph.names.starts, graph.names.ends)
+    names = graph.names.joined if graph.names.joined is not None else graph.names.data
+    return sum(memoryview(a).nbytes for a in arrays) + len(names)
+
+# Least recently used cache bounded by the bytes of its entries, an entry that is bigger than the
+# whole cache is not kept
+class LRUCache:
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes: int = max_bytes
+        self.entries: OrderedDict[tuple, tuple[object, int]] = OrderedDict()
+        self.bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, key: tuple) -> object | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: tuple, value: object, size: int) -> None:
+        self.discard(key)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (value, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+            self.evictions += 1
+
+    def discard(self, key: tuple) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def counters(self) -> dict:
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+# Solves the game of a request: the strategy (default auto), engine (default tuple), presolve, dual,
+# local (a list of targets, empty for the start vertex), lift_budget and timeout are used as by
+# main.py. Returns the results and the winner of every vertex: 1 for odd, 0 for even and 2 when it
+# was not decided (nothing for a local solve).
+def solve_game(pg: ParityGame, request: dict) -> tuple[dict, bytes]:
+    pg.set_solve_strategy(request.get('strategy') or OPTION_DEFAULTS['strategy'])
+    pg.set_solve_engine(request.get('engine') or OPTION_DEFAULTS['engine'])
+    pg.presolve = bool(request.get('presolve'))
+    lift_budget = request.get('lift_budget')
+    timeout = request.get('timeout')
+    if request.get('local') is not None:
+        pg.solve_local(request['local'] or None, report=False, lift_budget=lift_budget, timeout=timeout)
+        return pg.get_results(), b''
+    if request.get('dual'):
+        pg.solve_dual(report=False, lift_budget=lift_budget, timeout=timeout)
+    else:
+        pg.solve(report=False, lift_budget=lift_budget, timeout=timeout)
+    winners = bytearray(b'\x02') * pg.n_vertices
+    odd_wins, even_wins = pg.make_groups()
+    for v in odd_wins:
+        winners[v.id] = 1
+    for v in even_wins:
+        winners[v.id] = 0
+    return pg.get_results(), bytes(winners)
+
+# Answers one request in a solver process. served_from tells what the cache had: 'solution', 'game'
+# (parsed, not solved with these options) or 'file'. With odd_vertices set the ids of the vertices
+# odd wins are sent along.
+def answer(request: dict, cache: LRUCache, use_cache: bool) -> dict:
+    if request.get('command') == 'stats':
+        return {'ok': True, 'stats': cache.counters()}
+    start = time.perf_counter()
+    path = request['path']
+    status = os.stat(path)
+    # a changed file gets new keys, its old entries are evicted in time
+    game_key = ('game', path, status.st_mtime_ns, status.st_size)
+    # a left out option and its default give the same solution
+    values = (OPTION_DEFAULTS.get(name) if request.get(name) is None else request[name] for name in SOLUTION_OPTIONS)
+    options = tuple(tuple(value) if isinstance(value, list) else value for value in values)
+    solution_key = ('solution',) + game_key[1:] + options
+    served_from = 'solution'
+    solution = cache.get(solution_key)
+    if solution is None:
+        served_from = 'game'
+        graph = cache.get(game_key)
+        if graph is None:
+            served_from = 'file'
+            graph = load_game(path, use_cache)
+            cache.put(game_key, graph, graph_bytes(graph))
+        solution = solve_game(ParityGame.from_graph(graph, path), request)
+        # a local solve stops as soon as its targets are decided, the targets are part of the key
+        if solution[0].get('stopped') in (None, 'decided targets'):
+            cache.put(solution_key, solution, len(solution[1]) + RESULTS_BYTES)
+    results, winners = solution
+    results = dict(results)
+    if request.get('odd_vertices'):
+        results['odd_vertices'] = [id for id, winner in enumerate(winners) if winner == 1]
+    return {'ok': True, 'result': results, 'served_from': served_from, 'time': time.perf_counter() - start}
+
+# Loop of a solver process: answers the requests that come in over conn until it gets None or the
+# server is gone. inherited are the server ends of the pipes the solver got from the fork.
+def solver_worker(conn: Connection, inherited: list[Connection], max_bytes: int, use_cache: bool) -> None:
+    # ctrl-c reaches the whole process group, the server stops the solvers itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    # while a solver holds a server end of its pipe, recv does not see the server die
+    for pipe in inherited:
+        pipe.close()
+    cache = LRUCache(max_bytes)
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        try:
+            reply = answer(request, cache, use_cache)
+        except Exception as e:
+            reply = {'ok': False, 'error': repr(e)}
+        conn.send(reply)
+
+class SolveServer:
+
+    def __init__(self, socket_path: str, workers: int = 1, max_bytes: int = 1 << 30, use_cache: bool = True) -> None:
+        self.socket_path: str = socket_path
+        self.workers: int = max(1, workers)
+        # the cache budget is split over the solvers
+        self.max_bytes: int = max_bytes
+        self.use_cache: bool = use_cache
+        self.stopping = threading.Event()
+        self.pipes: list[Connection] = []
+        # one request at a time per solver, a request waits here while its solver is busy
+        self.locks: list[threading.Lock] = []
+
+    # Serves until a shutdown request comes in, the process is interrupted or it gets SIGTERM, then
+    # stops the solvers and removes the socket
+    def serve(self) -> None:
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stopping.set())
+        # the solvers are started before any thread, forking a process that has threads is not safe
+        processes: list[Process] = []
+        for _ in range(self.workers):
+            parent, child = Pipe()
+            self.pipes.append(parent)
+            process = Process(target=solver_worker, args=(child, list(self.pipes), self.max_bytes // self.workers, self.use_cache), daemon=True)
+            process.start()
+            child.close()
+            processes.append(process)
+            self.locks.append(threading.Lock())
+        listener = self.__bind()
+        try:
+            # wake up now and then to see if a shutdown was asked for
+            listener.settimeout(0.2)
+            while not self.stopping.is_set():
+                try:
+                    client, _ = listener.accept()
+                except socket.timeout:
+                    continue
+                client.settimeout(None)
+                threading.Thread(target=self.__serve_client, args=(client,), daemon=True).start()
+        finally:
+            listener.close()
+            os.unlink(self.socket_path)
+            for pipe, lock, process in zip(self.pipes, self.locks, processes):
+                with lock:
+                    if process.is_alive():
+                        pipe.send(None)
+            for process in processes:
+                process.join()
+
+    def __bind(self) -> socket.socket:
+        if os.path.exists(self.socket_path):
+            # a socket file is left behind when a server is killed, it is only in use when a server answers
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                    probe.connect(self.socket_path)
+                raise RuntimeError('a server is already listening on {path}'.format(path=self.socket_path))
+            except ConnectionRefusedError:
+                os.unlink(self.socket_path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        listener.listen(64)
+        return listener
+
+    def __serve_client(self, client: socket.socket) -> None:
+        with client, client.makefile('rb') as lines:
+            for line in lines:
+                try:
+                    reply = self.dispatch(json.loads(line))
+                except Exception as e:
+                    reply = {'ok': False, 'error': repr(e)}
+                client.sendall(json.dumps(reply).encode('utf-8') + b'\n')
+
+    # Answers a request: 'solve' (the default) goes to the solver of its game, 'stats' collects the
+    # cache counters of every solver and 'shutdown' stops the server after this reply
+    def dispatch(self, request: dict) -> dict:
+        match request.get('command', 'solve'):
+            case 'solve':
+                worker = zlib.crc32(request['path'].encode('utf-8')) % self.workers
+                reply = self.__ask(worker, request)
+                reply['worker'] = worker
+                return reply
+            case 'stats':
+                return {'ok': True, 'workers': [self.__ask(worker, request)['stats'] for worker in range(self.workers)]}
+            case 'shutdown':
+                self.stopping.set()
+                return {'ok': True}
+            case command:
+                raise ValueError('unknown command {command}'.format(command=command))
+
+    def __ask(self, worker: int, request: dict) -> dict:
+        with self.locks[worker]:
+            self.pipes[worker].send(request)
+            return self.pipes[worker].recv()
+
+# Sends one request to the server listening on socket_path and returns its reply
+def request(socket_path: str, payload: dict, timeout: float | None = None) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall(json.dumps(payload).encode('utf-8') + b'\n')
+        with client.makefile('rb') as lines:
+            line = lines.readline()
+    if not line:
+        raise ConnectionError('the server on {path} closed the connection'.format(path=socket_path))
+    return json.loads(line)
+
+# Prints the reply to a solve request like ParityGame.print_results prints a solve
+def print_reply(reply: dict) -> None:
+    result = reply['result']
+    print("##################################")
+    print('File path:', result['file'])
+    if 'picked' in result:
+        print('Strategy: {strategy} (picked {picked})'.format(strategy=result['strategy'], picked=result['picked']))
+    else:
+        print('Strategy:', result['strategy'])
+    print('Engine:', result['engine'])
+    print('Number of lifts:', result['lifts'])
+    if 'winners' in result:
+        for id, winner in result['winners'].items():
+            print("Vertex {id}: {winner}".format(id=id, winner=winner + " wins" if winner is not None else "not decided"))
+    else:
+        print("Vertices that player odd wins:", result['odd_wins'])
+        print("Vertices that player even wins:", result['even_wins'])
+        if 'undecided' in result:
+            print("Vertices not decided:", result['undecided'])
+        print("Verdict:", result['verdict'] + " wins" if result['verdict'] is not None else "not decided")
+    if result.get('stopped') == 'decided targets':
+        print("Stopped early: the targets were decided")
+    elif 'stopped' in result:
+        print("Stopped early by the {reason}".format(reason=result['stopped']))
+    if 'odd_vertices' in result:
+        print("Vertices odd wins:", ' '.join(str(id) for id in result['odd_vertices']))
+    served = {'solution': 'cached solution', 'game': 'cached game', 'file': 'game file'}[reply['served_from']]
+    print("Served from: {served} by solver {worker} in {time:.3f}s".format(served=served, worker=reply['worker'], time=reply['time']))
+    print("##################################\n")
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from multiprocessing import Process, Queue
+from typing import TextIO
+
+from batch import peak_rss_kb
+from generators import FAMILIES
+from paritygame import ParityGame, Strategy, strat_to_string
+
+# Sizes of every family in the default suite, small enough that every strategy finishes
+SUITE_SIZES: dict[str, list[int]] = {
+    'random': [250, 500, 1000],
+    'ladder': [10, 100, 1000],
+    'jurdzinski': [2, 3, 4, 5],
+    'elevator': [2, 3, 4, 5],
+    'philosophers': [2, 3, 4, 5],
+}
+
+# Identifies a measurement, the same key in the results and the baseline is compared
+def result_key(result: dict) -> tuple:
+    return (result['family'], result['size'], result['strategy'], result['engine'])
+
+# Solves one game in a fresh process so the peak rss belongs to this solve only
+def suite_worker(path: str, strategy: str, engine: str, results: Queue) -> None:
+    try:
+        pg = ParityGame.parse_graph(path, use_cache=False)
+        pg.set_solve_strategy(strategy)
+        pg.set_solve_engine(engine)
+        start = time.perf_counter()
+        pg.solve(report=False)
+        wall_time = time.perf_counter() - start
+        result = pg.get_results()
+        result['vertices'] = pg.n_vertices
+        result['edges'] = pg.graph.n_edges
+        result['wall_time'] = wall_time
+        result['time_per_lift'] = wall_time / pg.lift_amount if pg.lift_amount > 0 else 0.0
+        result['peak_rss_kb'] = peak_rss_kb()
+        results.put(result)
+    except Exception as e:
+        results.put({'error': repr(e)})
+
+# Generates every family in sizes, solves every game with every strategy and writes one json
+# line per solve to out. A solve that takes longer than timeout seconds is stopped and recorded
+# as a timeout.
+def run_suite(sizes: dict[str, list[int]], strategies: list[str], engine: str, timeout: float, out: TextIO) -> list[dict]:
+    measurements: list[dict] = []
+    with tempfile.TemporaryDirectory() as directory:
+        for family, family_sizes in sizes.items():
+            for size in family_sizes:
+                path = os.path.join(directory, '{family}{size}.gm'.format(family=family, size=size))
+                FAMILIES[family](path, size)
+                for strategy in strategies:
+                    results: Queue = Queue()
+                    process = Process(target=suite_worker, args=(path, strategy, engine, results), daemon=True)
+                    process.start()
+                    try:
+                        result = results.get(timeout=timeout)
+                    except Exception:
+                        result = {'error': 'timeout after {t}s'.format(t=timeout)}
+                    process.terminate()
+                    process.join()
+                    result.update({'family': family, 'size': size, 'strategy': strategy, 'engine': engine})
+                    measurements.append(result)
+                    out.write(json.dumps(result) + '\n')
+                    out.flush()
+    return measurements
+
+def read_results(path: str) -> list[dict]:
+    with open(path) as file:
+        return [json.loads(line) for line in file if line.strip() != '']
+
+# Compares the results with a baseline, a solve regressed when its lifts or its wall time grew by
+# more than threshold (0.2 is 20%), or when it found different winners. Wall times below
+# min_time are too noisy to compare. Returns a line per regression.
+def compare_baseline(results: list[dict], baseline: list[dict], threshold: float, min_time: float = 0.05) -> list[str]:
+    base = {result_key(result): result for result in baseline}
+    regressions: list[str] = []
+    for result in results:
+        old = base.get(result_key(result))
+        if old is None or 'error' in old:
+            continue
+        name = '{family} {size} {strategy} ({engine})'.format(family=result['family'], size=result['size'],
+                                                              strategy=result['strategy'], engine=result['engine'])
+        if 'error' in result:
+            regressions.append('{name}: {error}'.format(name=name, error=result['error']))
+            continue
+        if result['odd_wins'] != old['odd_wins'] or result['verdict'] != old['verdict']:
+            regressions.append('{name}: winners changed'.format(name=name))
+        if result['lifts'] > old['lifts'] * (1 + threshold):
+            regressions.append('{name}: {old} -> {new} lifts'.format(name=name, old=old['lifts'], new=result['lifts']))
+        if result['wall_time'] > min_time and result['wall_time'] > old['wall_time'] * (1 + threshold):
+            regressions.append('{name}: {old:.3f}s -> {new:.3f}s'.format(name=name, old=old['wall_time'], new=result['wall_time']))
+    return regressions
+
+# Draws the lifts and the wall time against the size of every family, one line per strategy
+def plot_results(results: list[dict], directory: str) -> list[str]:
+    # matplotlib is only needed for the plots
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    paths: list[str] = []
+    families = sorted(set(result['family'] for result in results))
+    for family in families:
+        for measure, label in (('lifts', 'lifts'), ('wall_time', 'wall time (s)')):
+            plt.figure()
+            plt.xlabel('size')
+            plt.ylabel(label)
+            plt.yscale('log')
+            plt.title(f'Size vs {label} for {family}')
+            strategies = [strat_to_string(strat) for strat in Strategy]
+            for strategy in strategies:
+                points = sorted((result['size'], result[measure]) for result in results
+                                if result['family'] == family and result['strategy'] == strategy and 'error' not in result)
+                if len(points) > 0:
+                    plt.plot([p[0] for p in points], [p[1] for p in points], marker='o', label=strategy)
+            plt.legend()
+            path = os.path.join(directory, f'{family} {measure}.png')
+            plt.savefig(path)
+            plt.close()
+            paths.append(path)
+    return paths
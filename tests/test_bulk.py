@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import glob
+import os
+
+import pytest
+
+from generators import write_random_game
+from paritygame import ParityGame
+
+pytest.importorskip('numpy')
+
+EXAMPLES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples', 'test_games', '*.gm')))
+
+def odd_wins(path: str, strategy: str, presolve: bool = False) -> list[bool]: 
+    pg = ParityGame.parse_graph(path, use_cache=False)
+    pg.set_solve_strategy(strategy)
+    pg.presolve = presolve
+    pg.solve(report=False)
+    return [v.tuple.top for v in pg.vertices]
+
+@pytest.mark.parametrize('path', EXAMPLES, ids=os.path.basename)
+def test_numpy_matches_combined_on_examples(path): 
+    assert odd_wins(path, 'numpy') == odd_wins(path, 'combined')
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('presolve', [False, True])
+def test_numpy_matches_combined_on_random_games(tmp_path, seed, presolve): 
+    path = str(tmp_path / 'game.gm')
+    write_random_game(path, 80, 5, 3, seed=seed)
+    assert odd_wins(path, 'numpy', presolve) == odd_wins(path, 'combined')
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+
+from generators import write_random_game
+from paritygame import ParityGame, Strategy, Engine, engine_string
+
+# strategies that lift classic measures only 
+CLASSIC_ONLY = (Strategy.BULK, Strategy.PARALLEL)
+
+def solve(path: str, strategy: Strategy, engine: Engine, **limits) -> ParityGame: 
+    pg = ParityGame.parse_graph(path, use_cache=False)
+    pg.strategy = strategy
+    pg.set_solve_engine(engine_string(engine))
+    pg.solve(report=False, **limits)
+    return pg
+
+def odd_wins(pg: ParityGame) -> list[bool]: 
+    return [v.tuple.top for v in pg.vertices]
+
+@pytest.mark.parametrize('engine', list(Engine), ids=engine_string)
+@pytest.mark.parametrize('strategy', list(Strategy), ids=lambda strategy: strategy.name.lower())
+def test_resume_matches_uninterrupted_solve(tmp_path, strategy, engine): 
+    if strategy in CLASSIC_ONLY and engine == Engine.SUCCINCT: 
+        pytest.skip('{strategy} cannot use the succinct engine'.format(strategy=strategy.name.lower()))
+    if strategy == Strategy.BULK: 
+        pytest.importorskip('numpy')
+    path = str(tmp_path / 'game.gm')
+    checkpoint = str(tmp_path / 'game.ckpt')
+    write_random_game(path, 60, 6, 3, seed=5)
+    expected = odd_wins(solve(path, Strategy.BACKTRACK, Engine.TUPLE))
+
+    # stop after every 20 lifts and continue from the checkpoint until the solve finishes 
+    pg = solve(path, strategy, engine, lift_budget=20, checkpoint=checkpoint)
+    resumes = 0
+    while pg.stopped is not None: 
+        assert pg.stopped == 'lift budget'
+        lifts = pg.lift_amount
+        pg = solve(path, strategy, engine, lift_budget=20, checkpoint=checkpoint, resume=checkpoint)
+        assert pg.lift_amount > lifts
+        resumes += 1
+    # zielonka does not lift, it is never stopped by the budget 
+    assert resumes > 0 or strategy == Strategy.ZIELONKA or pg.picked == Strategy.ZIELONKA
+    assert odd_wins(pg) == expected
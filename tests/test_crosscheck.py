@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import importlib.util
+
+import pytest
+
+from generators import write_random_game
+from paritygame import ParityGame, Strategy, Engine, engine_string, strat_to_string
+
+# every strategy that solves on its own with every engine it can use, zielonka is the reference 
+PAIRS = [(strategy, engine) for strategy in Strategy for engine in Engine 
+         if strategy != Strategy.ZIELONKA 
+         and not (strategy in (Strategy.BULK, Strategy.PARALLEL) and engine == Engine.SUCCINCT) 
+         and not (strategy == Strategy.BULK and importlib.util.find_spec('numpy') is None)]
+
+def odd_wins(path: str, strategy: Strategy, engine: Engine) -> list[bool]: 
+    pg = ParityGame.parse_graph(path, use_cache=False)
+    pg.set_solve_strategy(strat_to_string(strategy))
+    pg.set_solve_engine(engine_string(engine))
+    pg.workers = 2
+    pg.solve(report=False)
+    assert pg.stopped is None
+    return [v.tuple.top for v in pg.vertices]
+
+# seeds of random games with 50 vertices where each player wins at least 5 vertices, most seeds give 
+# games that one player wins everywhere 
+SEEDS = [1, 4, 7, 8, 13, 14, 15, 17, 18, 21]
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_strategies_and_engines_agree_with_zielonka(tmp_path, seed): 
+    path = str(tmp_path / 'game.gm')
+    write_random_game(path, 50, 5, 3, seed=seed)
+    expected = odd_wins(path, Strategy.ZIELONKA, Engine.TUPLE)
+    assert 5 <= sum(expected) <= 45
+    for strategy, engine in PAIRS: 
+        assert odd_wins(path, strategy, engine) == expected, '{strategy} on {engine}'.format(strategy=strat_to_string(strategy), engine=engine_string(engine))
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from generators import write_random_game
+from paritygame import ParityGame, Engine, engine_string
+
+def parse(path: str, engine: Engine) -> ParityGame: 
+    pg = ParityGame.parse_graph(path, use_cache=False)
+    pg.set_solve_strategy('backtrack')
+    pg.set_solve_engine(engine_string(engine))
+    return pg
+
+def odd_wins(pg: ParityGame) -> list[bool]: 
+    return [v.tuple.top for v in pg.vertices]
+
+@pytest.fixture
+def games(tmp_path) -> tuple[str, str]: 
+    low, high = str(tmp_path / 'low.gm'), str(tmp_path / 'high.gm')
+    write_random_game(low, 80, 2, 3, seed=7)
+    write_random_game(high, 80, 9, 3, seed=8)
+    return low, high
+
+@pytest.mark.parametrize('engine', list(Engine), ids=engine_string)
+def test_interleaved_solves_keep_their_domain(games, engine): 
+    low, high = games
+    expected = []
+    for path in games: 
+        pg = parse(path, engine)
+        pg.solve(report=False)
+        expected.append(odd_wins(pg))
+
+    # both games are parsed before either is solved, and the game of high priority is parsed and 
+    # solved in the middle of every progress report of the game of low priority 
+    first, second = parse(low, engine), parse(high, engine)
+    inner: list[list[bool]] = []
+    def solve_other(report: dict) -> None: 
+        other = parse(high, engine)
+        other.solve(report=False)
+        inner.append(odd_wins(other))
+    first.set_progress(solve_other, every=5)
+    first.solve(report=False)
+    second.solve(report=False)
+    assert len(inner) > 0
+    assert all(wins == expected[1] for wins in inner)
+    assert odd_wins(first) == expected[0]
+    assert odd_wins(second) == expected[1]
+    assert first.domain.max_tuple_values != second.domain.max_tuple_values
+
+def test_solves_from_threads(games): 
+    expected = {}
+    for path in games: 
+        pg = parse(path, Engine.TUPLE)
+        pg.solve(report=False)
+        expected[path] = odd_wins(pg)
+    results: list[tuple[str, list[bool]]] = []
+    def run(path: str) -> None: 
+        pg = parse(path, Engine.TUPLE)
+        pg.solve(report=False)
+        results.append((path, odd_wins(pg)))
+    threads = [threading.Thread(target=run, args=(path,)) for path in games * 3]
+    for thread in threads: 
+        thread.start()
+    for thread in threads: 
+        thread.join()
+    assert len(results) == len(threads)
+    assert all(wins == expected[path] for path, wins in results)
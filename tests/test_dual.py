@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from paritygame import ParityGame
+
+GAME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples', 'test_games', 'test6.gm')
+
+@pytest.mark.parametrize('budget', range(1, 9))
+def test_dual_stops_at_lift_budget(budget): 
+    pg = ParityGame.parse_graph(GAME, use_cache=False)
+    pg.set_solve_strategy('input')
+    pg.solve_dual(report=False, lift_budget=budget)
+    assert pg.stopped == 'lift budget'
+    assert pg.lift_amount == budget
+
+def test_dual_matches_solve(): 
+    pg = ParityGame.parse_graph(GAME, use_cache=False)
+    pg.set_solve_strategy('input')
+    pg.solve(report=False)
+    odd_wins = [v.tuple.top for v in pg.vertices]
+    winners = pg.solve_dual(report=False)
+    assert pg.stopped is None
+    assert [winner is not None and winner.name == 'ODD' for winner in winners] == odd_wins
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from paritygame import ParityGame, Strategy, Engine, engine_string, strat_to_string
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# the vertices odd wins in every example game, as the solver before the engines found them 
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'example_winners.json')) as file: 
+    WINNERS: dict[str, list[int]] = json.load(file)
+
+@pytest.mark.parametrize('engine', list(Engine), ids=engine_string)
+@pytest.mark.parametrize('name', sorted(WINNERS))
+def test_example_winners(name, engine): 
+    for strategy in (Strategy.INPUT, Strategy.BACKTRACK, Strategy.LOOPBACKTRACKODD): 
+        pg = ParityGame.parse_graph(os.path.join(ROOT, 'examples', 'test_games', name), use_cache=False)
+        pg.set_solve_strategy(strat_to_string(strategy))
+        pg.set_solve_engine(engine_string(engine))
+        pg.solve(report=False)
+        odd_wins, even_wins = pg.make_groups()
+        assert sorted(v.id for v in odd_wins) == WINNERS[name], strat_to_string(strategy)
+        assert len(odd_wins) + len(even_wins) == pg.n_vertices
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import os
+
+import gamecache
+from gamecache import load_game, cache_path
+
+GAME = 'parity 2;\n0 0 1 1;\n1 0 1 2;\n2 1 1 2;\n'
+# the same size, other priorities 
+CHANGED = 'parity 2;\n0 2 1 1;\n1 1 1 2;\n2 0 1 2;\n'
+
+def test_cache_is_used(tmp_path): 
+    path = str(tmp_path / 'game.gm')
+    with open(path, 'w') as file: 
+        file.write(GAME)
+    first = load_game(path)
+    assert first.buffer is None and os.path.exists(cache_path(path))
+    second = load_game(path)
+    assert second.buffer is not None
+    assert list(second.priorities) == [0, 0, 1]
+
+def test_new_mtime_with_same_contents_is_stamped_once(tmp_path, monkeypatch): 
+    path = str(tmp_path / 'game.gm')
+    with open(path, 'w') as file: 
+        file.write(GAME)
+    load_game(path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    hashes: list[str] = []
+    source_hash = gamecache.source_hash
+    def counting_hash(filepath: str) -> bytes: 
+        hashes.append(filepath)
+        return source_hash(filepath)
+    monkeypatch.setattr(gamecache, 'source_hash', counting_hash)
+    # the first load hashes the source and keeps its new mtime, the next ones only stat it 
+    for _ in range(3): 
+        assert load_game(path).buffer is not None
+    assert hashes == [path]
+
+def test_file_changed_while_parsing(tmp_path, monkeypatch): 
+    path = str(tmp_path / 'game.gm')
+    with open(path, 'w') as file: 
+        file.write(GAME)
+    parse_game = gamecache.parse_game
+    def racing_parse(filepath: str): 
+        graph = parse_game(filepath)
+        # the file is written again after it was read 
+        with open(filepath, 'w') as file: 
+            file.write(CHANGED)
+        os.utime(filepath, ns=(0, os.stat(filepath).st_mtime_ns + 10 ** 9))
+        return graph
+    monkeypatch.setattr(gamecache, 'parse_game', racing_parse)
+    assert list(load_game(path).priorities) == [0, 0, 1]
+    monkeypatch.setattr(gamecache, 'parse_game', parse_game)
+    # the cache holds the old contents, it is not used for the new ones 
+    graph = load_game(path)
+    assert graph.buffer is None
+    assert list(graph.priorities) == [2, 1, 0]
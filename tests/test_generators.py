@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+
+from generators import FAMILIES
+from paritygame import ParityGame
+
+def solve(path: str, strategy: str) -> list[bool]: 
+    pg = ParityGame.parse_graph(path, use_cache=False)
+    pg.set_solve_strategy(strategy)
+    pg.solve(report=False)
+    return [v.tuple.top for v in pg.vertices]
+
+@pytest.mark.parametrize('family', sorted(FAMILIES))
+def test_family_is_reproducible(tmp_path, family): 
+    first, second = tmp_path / 'first.gm', tmp_path / 'second.gm'
+    FAMILIES[family](str(first), 4)
+    FAMILIES[family](str(second), 4)
+    assert first.read_bytes() == second.read_bytes()
+
+@pytest.mark.parametrize('family', sorted(FAMILIES))
+def test_family_grows_with_size(tmp_path, family): 
+    sizes = []
+    for size in (3, 6): 
+        path = str(tmp_path / '{size}.gm'.format(size=size))
+        FAMILIES[family](path, size)
+        sizes.append(ParityGame.parse_graph(path, use_cache=False).n_vertices)
+    assert 0 < sizes[0] < sizes[1]
+
+@pytest.mark.parametrize('family', sorted(FAMILIES))
+def test_family_solves_alike(tmp_path, family): 
+    path = str(tmp_path / 'game.gm')
+    FAMILIES[family](path, 4)
+    assert solve(path, 'backtrack') == solve(path, 'zielonka')
+
+def test_backtrack_lifts_are_reproducible(tmp_path): 
+    # the benchmark baselines compare lift counts, they may not depend on where vertices are in memory 
+    path = str(tmp_path / 'game.gm')
+    FAMILIES['random'](path, 200)
+    lifts = set()
+    for _ in range(3): 
+        pg = ParityGame.parse_graph(path, use_cache=False)
+        pg.set_solve_strategy('combined')
+        pg.solve(report=False)
+        lifts.add(pg.lift_amount)
+    assert len(lifts) == 1
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import io
+import json
+
+import pytest
+
+from generators import write_random_game
+from instrumentation import progress_printer
+from paritygame import ParityGame
+
+@pytest.fixture
+def game(tmp_path) -> str: 
+    path = str(tmp_path / 'game.gm')
+    write_random_game(path, 200, 6, 3, seed=3)
+    return path
+
+def parse(path: str, strategy: str) -> ParityGame: 
+    pg = ParityGame.parse_graph(path, use_cache=False)
+    pg.set_solve_strategy(strategy)
+    return pg
+
+@pytest.mark.parametrize('strategy', ['input', 'backtrack', 'combined', 'lifo', 'focus'])
+def test_counters_add_up(game, strategy): 
+    pg = parse(game, strategy)
+    pg.solve(report=False)
+    results = pg.get_results()
+    assert results['lifts'] > 0
+    assert results['changed_lifts'] + results['noop_lifts'] == results['lifts']
+    assert results['tops_reached'] == results['odd_wins']
+    assert results['prog_calls'] >= results['lifts']
+    assert {'parse', 'solve', 'lift'} <= set(results['phase_times'])
+    # the results are scraped as json 
+    assert json.loads(json.dumps(results)) == results
+
+def test_queue_high_water(game): 
+    pg = parse(game, 'backtrack')
+    pg.solve(report=False)
+    assert 0 < pg.get_results()['queue_high_water'] <= pg.n_vertices
+
+def test_progress_every_lifts(game): 
+    pg = parse(game, 'backtrack')
+    reports: list[dict] = []
+    pg.set_progress(reports.append, every=50)
+    pg.solve(report=False)
+    # and one more when the lifting ends 
+    assert len(reports) == pg.lift_amount // 50 + 1
+    assert [report['lifts'] for report in reports[:-1]] == [50 * (i + 1) for i in range(len(reports) - 1)]
+    assert reports[-1]['lifts'] == pg.lift_amount
+
+@pytest.mark.parametrize('strategy', ['input', 'random', 'selfloop', 'backtrack', 'lifo', 'priority', 'magnitude', 'focus', 'combined'])
+def test_final_report_has_nothing_unstable(tmp_path, strategy): 
+    path = str(tmp_path / 'game.gm')
+    write_random_game(path, 400, 6, 3, seed=11)
+    pg = parse(path, strategy)
+    reports: list[dict] = []
+    pg.set_progress(reports.append, every=100)
+    pg.solve(report=False)
+    assert reports[0]['unstable'] > 0
+    assert reports[-1]['unstable'] == 0
+
+def test_dual_final_report_has_nothing_unstable(game): 
+    pg = parse(game, 'backtrack')
+    reports: list[dict] = []
+    pg.set_progress(reports.append, every=100)
+    pg.solve_dual(report=False)
+    assert reports[-1]['unstable'] == 0
+    assert reports[-1]['odd_decided'] + reports[-1]['even_decided'] == pg.n_vertices
+
+def test_progress_printer_writes_json_lines(game): 
+    pg = parse(game, 'backtrack')
+    out = io.StringIO()
+    pg.set_progress(progress_printer(out, as_json=True), every=100)
+    pg.solve(report=False)
+    lines = out.getvalue().splitlines()
+    assert len(lines) > 0
+    assert all('lifts' in json.loads(line) for line in lines)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+
+from generators import write_random_game
+from paritygame import ParityGame
+
+def solve(path: str, strategy: str, workers: int) -> ParityGame: 
+    pg = ParityGame.parse_graph(path, use_cache=False)
+    pg.set_solve_strategy(strategy)
+    pg.set_solve_engine('radix')
+    pg.workers = workers
+    pg.solve(report=False)
+    return pg
+
+@pytest.mark.parametrize('seed', [1, 4, 7])
+def test_one_worker_lifts_like_backtrack(tmp_path, seed): 
+    # one worker takes the vertices in the same order as the backtrack worklist, so the lifts can be compared 
+    path = str(tmp_path / 'game.gm')
+    write_random_game(path, 200, 5, 3, seed=seed)
+    serial = solve(path, 'backtrack', 1).get_results()
+    parallel = solve(path, 'parallel', 1).get_results()
+    assert (parallel['lifts'], parallel['changed_lifts']) == (serial['lifts'], serial['changed_lifts'])
+    assert parallel['worker_lifts'] == [serial['lifts']]
+
+def test_worker_lifts_add_up(tmp_path): 
+    path = str(tmp_path / 'game.gm')
+    write_random_game(path, 300, 5, 3, seed=7)
+    results = solve(path, 'parallel', 2).get_results()
+    assert sum(results['worker_lifts']) == results['lifts']
+    assert results['changed_lifts'] <= results['lifts']
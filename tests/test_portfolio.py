@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+import paritygame
+from generators import write_random_game
+from paritygame import ParityGame
+
+@pytest.fixture
+def game(tmp_path) -> str: 
+    path = str(tmp_path / 'game.gm')
+    write_random_game(path, 60, 5, 3, seed=7)
+    return path
+
+def odd_wins(pg: ParityGame) -> list[bool]: 
+    return [v.tuple.top for v in pg.vertices]
+
+def test_portfolio_takes_over_the_winner(game): 
+    expected = ParityGame.parse_graph(game, use_cache=False)
+    expected.set_solve_strategy('backtrack')
+    expected.solve(report=False)
+
+    pg = ParityGame.parse_graph(game, use_cache=False)
+    portfolio = pg.solve_portfolio(['backtrack', 'combined', 'zielonka'], report=False)
+    assert portfolio['winner'] in ('backtrack', 'combined', 'zielonka')
+    assert portfolio['errors'] == {}
+    assert portfolio['winner'] not in portfolio['cancelled']
+    assert odd_wins(pg) == odd_wins(expected)
+
+def test_portfolio_survives_a_dead_worker(game, monkeypatch): 
+    worker = paritygame.portfolio_worker
+    def crashing_worker(file, strategy, *args): 
+        # a worker killed before it can send anything, as by the out of memory killer 
+        if strategy == 'input': 
+            os._exit(3)
+        # the other strategy finishes well after that 
+        time.sleep(0.5)
+        worker(file, strategy, *args)
+    # the workers are forked, they see the patched function 
+    monkeypatch.setattr(paritygame, 'portfolio_worker', crashing_worker)
+    monkeypatch.setattr(paritygame, 'PORTFOLIO_POLL', 0.05)
+
+    pg = ParityGame.parse_graph(game, use_cache=False)
+    with pytest.raises(RuntimeError): 
+        pg.solve_portfolio(['input'], report=False)
+
+    portfolio = pg.solve_portfolio(['input', 'backtrack'], report=False)
+    assert portfolio['winner'] == 'backtrack'
+    # the dead worker is found while waiting or when the race ends, it is never called cancelled 
+    assert 'code 3' in portfolio['errors']['input']
+    assert portfolio['cancelled'] == []
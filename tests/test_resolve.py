@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from generators import write_game
+from paritygame import ParityGame, Engine, engine_string
+from vertex import Player
+
+ENGINES = [engine_string(engine) for engine in Engine]
+
+def write_small_game(path: str, n_vertices: int, max_priority: int, seed: int) -> None: 
+    # random game where about one vertex in eight is a dead end 
+    rng = random.Random(seed)
+    vertices = []
+    for v in range(n_vertices): 
+        successors = [] if rng.random() < 0.125 else sorted(set(rng.randrange(n_vertices) for _ in range(rng.randint(1, 3))))
+        vertices.append((rng.randint(0, max_priority), Player.EVEN if rng.randint(0, 1) else Player.ODD, successors, 'v{v}'.format(v=v)))
+    write_game(path, vertices)
+
+def odd_wins(pg: ParityGame) -> list[bool]: 
+    return [v.tuple.top for v in pg.vertices]
+
+def random_edit(pg: ParityGame, rng: random.Random) -> None: 
+    v = rng.randrange(pg.n_vertices)
+    match rng.choice(['add', 'remove', 'priority', 'owner']): 
+        case 'add': 
+            pg.add_edge(v, rng.randrange(pg.n_vertices))
+        case 'remove': 
+            if len(pg.vertices[v].next) > 0: 
+                pg.remove_edge(v, rng.choice(sorted(w.id for w in pg.vertices[v].next)))
+        case 'priority': 
+            # may raise the highest priority, which changes the bounds of the measures 
+            pg.set_priority(v, rng.randrange(pg.max_priority + 3))
+        case 'owner': 
+            pg.set_owner(v, Player.ODD if pg.vertices[v].owner == Player.EVEN else Player.EVEN)
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_resolve_after_new_bounds(tmp_path, engine): 
+    path = tmp_path / 'game.gm'
+    path.write_text('parity 2;\n0 0 1 1;\n1 0 1 ;\n2 1 1 2;\n')
+    pg = ParityGame.parse_graph(str(path), use_cache=False)
+    pg.set_solve_strategy('backtrack')
+    pg.set_solve_engine(engine)
+    pg.solve(report=False)
+    pg.set_priority(2, 3)
+    pg.resolve(report=False)
+    resolved = odd_wins(pg)
+    pg.solve(report=False)
+    assert resolved == odd_wins(pg)
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_resolve_after_dead_end_changes_owner(tmp_path, engine): 
+    # vertex 1 is an even dead end, odd wins it and vertex 0 that can only go there 
+    path = tmp_path / 'game.gm'
+    path.write_text('parity 1;\n0 0 0 1;\n1 0 1 ;\n')
+    pg = ParityGame.parse_graph(str(path), use_cache=False)
+    pg.set_solve_strategy('backtrack')
+    pg.set_solve_engine(engine)
+    pg.solve(report=False)
+    assert odd_wins(pg) == [True, True]
+    pg.set_owner(1, Player.ODD)
+    pg.resolve(report=False)
+    assert odd_wins(pg) == [False, False]
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_resolve_matches_fresh_solve(tmp_path, engine): 
+    path = str(tmp_path / 'game.gm')
+    for seed in range(30): 
+        write_small_game(path, 12, 5, seed)
+        pg = ParityGame.parse_graph(path, use_cache=False)
+        pg.set_solve_strategy('backtrack')
+        pg.set_solve_engine(engine)
+        pg.solve(report=False)
+        rng = random.Random(seed)
+        for _ in range(3): 
+            random_edit(pg, rng)
+        pg.resolve(report=False)
+        resolved = odd_wins(pg)
+        pg.solve(report=False)
+        assert resolved == odd_wins(pg), 'seed {seed}'.format(seed=seed)
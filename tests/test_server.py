@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+from multiprocessing import Process
+
+import pytest
+
+from generators import write_random_game
+from paritygame import ParityGame
+from server import SolveServer, request
+
+def serve(socket_path: str) -> None: 
+    SolveServer(socket_path, workers=2, max_bytes=1 << 24, use_cache=False).serve()
+
+@pytest.fixture
+def server(): 
+    # unix socket paths are short, pytest's tmp_path can be too long 
+    directory = tempfile.mkdtemp(prefix='spm')
+    socket_path = os.path.join(directory, 'spm.sock')
+    process = Process(target=serve, args=(socket_path,))
+    process.start()
+    deadline = time.monotonic() + 10
+    while not os.path.exists(socket_path): 
+        assert process.is_alive() and time.monotonic() < deadline
+        time.sleep(0.01)
+    yield socket_path, process
+    if process.is_alive(): 
+        process.terminate()
+    process.join()
+    shutil.rmtree(directory)
+
+@pytest.fixture
+def game(tmp_path) -> str: 
+    path = str(tmp_path / 'game.gm')
+    # odd wins some vertices of this game and even the others 
+    write_random_game(path, 100, 5, 3, seed=7)
+    return path
+
+def solve_here(path: str) -> list[int]: 
+    pg = ParityGame.parse_graph(path, use_cache=False)
+    pg.set_solve_strategy('backtrack')
+    pg.solve(report=False)
+    return [v.id for v in pg.vertices if v.tuple.top]
+
+def test_solve_cache_stats_and_shutdown(server, game): 
+    socket_path, process = server
+    expected = solve_here(game)
+    assert 0 < len(expected) < 100
+
+    first = request(socket_path, {'path': game, 'strategy': 'backtrack', 'odd_vertices': True})
+    assert first['ok'] and first['served_from'] == 'file'
+    assert first['result']['odd_vertices'] == expected
+    again = request(socket_path, {'path': game, 'strategy': 'backtrack', 'odd_vertices': True})
+    assert again['served_from'] == 'solution'
+    assert again['result']['odd_vertices'] == expected
+    other = request(socket_path, {'path': game, 'strategy': 'zielonka', 'odd_vertices': True})
+    assert other['served_from'] == 'game'
+    assert other['result']['odd_vertices'] == expected
+
+    # a left out strategy is the default one 
+    assert request(socket_path, {'path': game, 'strategy': 'auto'})['served_from'] == 'game'
+    assert request(socket_path, {'path': game})['served_from'] == 'solution'
+
+    # a local solve that decided its targets is kept for those targets only 
+    target = expected[0]
+    local = request(socket_path, {'path': game, 'strategy': 'backtrack', 'local': [target]})
+    assert local['served_from'] == 'game'
+    assert local['result']['winners'] == {str(target): 'odd'}
+    assert request(socket_path, {'path': game, 'strategy': 'backtrack', 'local': [target]})['served_from'] == 'solution'
+    assert request(socket_path, {'path': game, 'strategy': 'backtrack', 'local': []})['served_from'] == 'game'
+
+    # a stopped solve is not kept 
+    assert 'stopped' in request(socket_path, {'path': game, 'strategy': 'input', 'lift_budget': 3})['result']
+    assert request(socket_path, {'path': game, 'strategy': 'input'})['served_from'] == 'game'
+
+    stats = request(socket_path, {'command': 'stats'})
+    assert stats['ok'] and len(stats['workers']) == 2
+    # every request of the game went to one solver 
+    busy = [worker for worker in stats['workers'] if worker['entries'] > 0]
+    assert len(busy) == 1
+    assert busy[0]['hits'] > 0 and busy[0]['misses'] > 0
+
+    assert not request(socket_path, {'command': 'unknown'})['ok']
+    assert request(socket_path, {'command': 'shutdown'})['ok']
+    process.join(10)
+    assert process.exitcode == 0
+    assert not os.path.exists(socket_path)
+
+def test_terminate_stops_the_solvers(server, game): 
+    socket_path, process = server
+    assert request(socket_path, {'path': game, 'strategy': 'backtrack'})['ok']
+    # SIGTERM takes the same way out as a shutdown request 
+    process.terminate()
+    process.join(10)
+    assert process.exitcode == 0
+    assert not os.path.exists(socket_path)
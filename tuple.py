@@ -1,29 +1,29 @@
 from __future__ import annotations
 
-class Tuple: 
-    tuple_size: int = 0
-    empty_tuple_values: list[int] = [] 
-    max_tuple_values: list[int] = []
+# The set of measures of one parity game: the size of the tuples, the maximum value of every 
+# index and the empty tuple. Every ParityGame owns its own domain so games do not share state. 
+class MeasureDomain: 
 
-    def __init__(self, values): 
-        self.values: list[int] = values
-        self.top: bool = False
-    
-    @staticmethod
-    def set_tuple_size(value) -> None: 
-        Tuple.tuple_size = value 
-        Tuple.empty_tuple_values = [0 for _ in range(Tuple.tuple_size)]
-    
-    @staticmethod
-    def set_max_tuple(priorities: list[int]) -> None: 
-        Tuple.max_tuple_values = Tuple.empty_tuple_values.copy()
+    def __init__(self, max_priority: int, priorities: list[int]) -> None: 
+        self.tuple_size: int = max_priority + 1
+        self.empty_tuple_values: list[int] = [0 for _ in range(self.tuple_size)]
+        # only the odd indices are ever compared 
+        self.odd_indices: range = range(1, self.tuple_size, 2)
+        self.max_tuple_values: list[int] = self.empty_tuple_values.copy()
         for p in priorities: 
             if (p % 2 == 1): 
-                Tuple.max_tuple_values[p] += 1
+                self.max_tuple_values[p] += 1
     
-    @staticmethod
-    def get_empty_tuple() -> Tuple: 
-        return Tuple(Tuple.empty_tuple_values.copy())
+    def get_empty_tuple(self) -> Tuple: 
+        return Tuple(self.empty_tuple_values.copy(), self)
+
+class Tuple: 
+    __slots__ = ('values', 'domain', 'top')
+
+    def __init__(self, values: list[int], domain: MeasureDomain): 
+        self.values: list[int] = values
+        self.domain: MeasureDomain = domain
+        self.top: bool = False
     
     def get(self, index: int) -> int: 
         return self.values[index]
@@ -44,28 +44,29 @@ class Tuple:
         self.top = top 
     
     def add(self, start: int) -> None: 
+        max_values = self.domain.max_tuple_values
         index = start 
-        while index > 1 and self.values[index] + 1 > Tuple.max_tuple_values[index]: 
+        while index > 1 and self.values[index] + 1 > max_values[index]: 
             self.values[index] = 0 
             index -= 2
 
-        if self.values[index] + 1 > Tuple.max_tuple_values[index]: 
+        if self.values[index] + 1 > max_values[index]: 
             self.top = True 
             return 
         self.values[index] += 1
     
     def check_top(self) -> None:
         for i, value in enumerate(self.values): 
-            if value > Tuple.max_tuple_values[i]: 
+            if value > self.domain.max_tuple_values[i]: 
                 self.top = True 
 
     # equality function 
     def __eq__(self, other: Tuple) -> bool:
         if (self.top != other.top): return False 
         if (self.top and other.top): return True 
-        for i in range(len(self.values)): 
-            # only check the odd values 
-            if ((i % 2 == 1) and self.values[i] != other.values[i]): 
+        # only check the odd values 
+        for i in self.domain.odd_indices: 
+            if (self.values[i] != other.values[i]): 
                 return False 
         return True 
     
@@ -73,52 +74,48 @@ class Tuple:
     def __lt__(self, other: Tuple) -> bool: 
         if (self.top): return False 
         if (other.top and not self.top): return True 
-        for i in range(len(self.values)): 
-            # only check the odd values 
-            if (i % 2 == 1): 
-                if (self.values[i] < other.values[i]): 
-                    return True 
-                if (self.values[i] > other.values[i]): 
-                    return False 
+        # only check the odd values 
+        for i in self.domain.odd_indices: 
+            if (self.values[i] < other.values[i]): 
+                return True 
+            if (self.values[i] > other.values[i]): 
+                return False 
         return False 
     
     # greater then function 
     def __gt__(self, other: Tuple) -> bool:  
         if (other.top): return False 
         if (self.top and not other.top): return True 
-        for i in range(len(self.values)): 
-            # only check the odd values 
-            if (i % 2 == 1): 
-                if (self.values[i] > other.values[i]): 
-                    return True 
-                if (self.values[i] < other.values[i]): 
-                    return False 
+        # only check the odd values 
+        for i in self.domain.odd_indices: 
+            if (self.values[i] > other.values[i]): 
+                return True 
+            if (self.values[i] < other.values[i]): 
+                return False 
         return False 
     
     # less then or equal function 
     def __le__(self, other: Tuple) -> bool: 
         if (self.top): return False 
         if (other.top and not self.top): return True 
-        for i in range(len(self.values)): 
-            # only check the odd values 
-            if (i % 2 == 1): 
-                if (self.values[i] < other.values[i]): 
-                    return True 
-                if (self.values[i] > other.values[i]): 
-                    return False 
+        # only check the odd values 
+        for i in self.domain.odd_indices: 
+            if (self.values[i] < other.values[i]): 
+                return True 
+            if (self.values[i] > other.values[i]): 
+                return False 
         return True 
     
     # greater then or equal function 
     def __ge__(self, other: Tuple) -> bool:  
         if (other.top): return False 
         if (self.top and not other.top): return True 
-        for i in range(len(self.values)): 
-            # only check the odd values 
-            if (i % 2 == 1): 
-                if (self.values[i] > other.values[i]): 
-                    return True 
-                if (self.values[i] < other.values[i]): 
-                    return False 
+        # only check the odd values 
+        for i in self.domain.odd_indices: 
+            if (self.values[i] > other.values[i]): 
+                return True 
+            if (self.values[i] < other.values[i]): 
+                return False 
         return True 
 
     def __str__(self) -> str:
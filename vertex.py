@@ -9,15 +9,19 @@ class Player(Enum):
     EVEN = 1
 
 class Vertex: 
+    # slots instead of a __dict__ per vertex, games can have millions of vertices 
+    __slots__ = ('id', 'names', 'priority', 'even_priority', 'owner', 'next', 'prev', 'tuple', 'stable', 'odd_self_loop')
 
-    def __init__(self, id: int) -> None: 
+    def __init__(self, id: int, names=None) -> None: 
         self.id: int = id
-        self.name: str = ""
+        # the names of the game (indexed by id), the name is only looked up when it is asked for 
+        self.names = names
         self.priority: int = 0
         self.even_priority: bool = True
         self.owner: Player = Player.EVEN
-        self.next: set[Vertex] = set()
-        self.prev: set[Vertex] = set()
+        # lists take less memory than sets, every edge is in them once 
+        self.next: list[Vertex] = []
+        self.prev: list[Vertex] = []
 
         # Tuple for small progress measures algo 
         self.tuple: Tuple = None 
@@ -30,12 +34,24 @@ class Vertex:
         self.owner = Player.EVEN if int(vertex_info[2]) else Player.ODD
         for next_id in vertex_info[3].split(','): 
             self.add_transition(other_vertices[int(next_id)])
-        self.name = " ".join(vertex_info[4:]).strip("\"") if len(vertex_info) > 4 else ''
+        if len(vertex_info) > 4: 
+            self.names = {self.id: " ".join(vertex_info[4:]).strip("\"")}
         self.check_odd_self_loop()
 
+    @property 
+    def name(self) -> str: 
+        return self.names[self.id] if self.names is not None else ''
+
     def add_transition(self, other: Vertex) -> None: 
-        self.next.add(other)
-        other.prev.add(self)
+        if other in self.next: 
+            return
+        self.next.append(other)
+        other.prev.append(self)
+
+    def remove_transition(self, other: Vertex) -> None: 
+        if other in self.next: 
+            self.next.remove(other)
+            other.prev.remove(self)
 
     def check_odd_self_loop(self) -> None: 
         if (self.owner == Player.ODD and not self.even_priority): 
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from typing import Callable
+
+from vertex import Vertex
+
+# Worklists of the vertices a lift strategy still has to lift. They are plain lists and deques,
+# without the lock queue.Queue takes on every put and get. A vertex is in a worklist at most once,
+# membership is one bit per vertex of the game. Vertices outside the lifted part of the game keep
+# their bit set, so they are never added.
+class Worklist:
+
+    def __init__(self, n_vertices: int, vertices: list[Vertex]) -> None:
+        self.bits: bytearray = bytearray(b'\xff') * ((n_vertices + 7) >> 3)
+        for v in vertices:
+            self.bits[v.id >> 3] &= ~(1 << (v.id & 7))
+        # the longest the worklist has been
+        self.high_water: int = 0
+
+    def __contains__(self, v: Vertex) -> bool:
+        return self.bits[v.id >> 3] & (1 << (v.id & 7)) != 0
+
+    # adds v unless it is in the worklist already, returns if it was added
+    def add(self, v: Vertex) -> bool:
+        bits = self.bits
+        if bits[v.id >> 3] & (1 << (v.id & 7)):
+            return False
+        bits[v.id >> 3] |= 1 << (v.id & 7)
+        self.push(v)
+        if len(self) > self.high_water:
+            self.high_water = len(self)
+        return True
+
+    # the next vertex to lift, None when the worklist is empty
+    def take(self) -> Vertex | None:
+        if len(self) == 0:
+            return None
+        v = self.pop()
+        self.bits[v.id >> 3] &= ~(1 << (v.id & 7))
+        return v
+
+    # the vertices in the worklist, in the order they would be taken as far as the ordering allows
+    def vertices(self) -> list[Vertex]:
+        pass
+
+    def push(self, v: Vertex) -> None:
+        pass
+
+    def pop(self) -> Vertex:
+        pass
+
+    def __len__(self) -> int:
+        pass
+
+class FifoWorklist(Worklist):
+
+    def __init__(self, n_vertices: int, vertices: list[Vertex]) -> None:
+        super().__init__(n_vertices, vertices)
+        self.queue: deque[Vertex] = deque()
+
+    def push(self, v: Vertex) -> None:
+        self.queue.append(v)
+
+    def pop(self) -> Vertex:
+        return self.queue.popleft()
+
+    def vertices(self) -> list[Vertex]:
+        return list(self.queue)
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+class LifoWorklist(Worklist):
+
+    def __init__(self, n_vertices: int, vertices: list[Vertex]) -> None:
+        super().__init__(n_vertices, vertices)
+        self.stack: list[Vertex] = []
+
+    def push(self, v: Vertex) -> None:
+        self.stack.append(v)
+
+    def pop(self) -> Vertex:
+        return self.stack.pop()
+
+    def vertices(self) -> list[Vertex]:
+        return self.stack[::-1]
+
+    def __len__(self) -> int:
+        return len(self.stack)
+
+# Takes the vertex with the smallest key first, vertices with the same key in the order they were
+# added. Without a key the vertices themselves are compared (Vertex.__lt__ compares the owners).
+class HeapWorklist(Worklist):
+
+    def __init__(self, n_vertices: int, vertices: list[Vertex], key: Callable[[Vertex], int] | None = None) -> None:
+        super().__init__(n_vertices, vertices)
+        self.heap: list = []
+        self.key = key
+        self.count: int = 0
+
+    def push(self, v: Vertex) -> None:
+        if self.key is None:
+            heapq.heappush(self.heap, v)
+        else:
+            self.count += 1
+            heapq.heappush(self.heap, (self.key(v), self.count, v))
+
+    def pop(self) -> Vertex:
+        item = heapq.heappop(self.heap)
+        return item if self.key is None else item[2]
+
+    # the order of the heap itself, adding them again in this order gives the same heap
+    def vertices(self) -> list[Vertex]:
+        return list(self.heap) if self.key is None else [item[2] for item in self.heap]
+
+    def __len__(self) -> int:
+        return len(self.heap)
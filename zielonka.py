@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable
+
+from attractor import attractor
+from vertex import Player
+
+# Vertices outside the subgame of the running call, as the excluded argument of attractor. The
+# subgames of the calls on the stack are nested, every vertex is marked with the depth of the
+# deepest call whose subgame it is in, so only the vertices of the running call have its depth.
+class Outside:
+
+    def __init__(self, depths: list[int]) -> None:
+        self.depths: list[int] = depths
+        self.depth: int = 0
+
+    def __getitem__(self, v: int) -> bool:
+        return self.depths[v] != self.depth
+
+# One call of the recursion: the vertices of its subgame, how far it got and what it has to remember
+class Call:
+
+    def __init__(self, vertices: list[int], depth: int) -> None:
+        self.vertices: list[int] = vertices
+        self.depth: int = depth
+        self.stage: int = 0
+        self.player: Player = Player.EVEN
+        # the vertices given to the call below, their depth is set back when it returns
+        self.below: list[int] = []
+        # the opponent's attractor to what the opponent won in the first call below
+        self.attracted: list[int] = []
+
+# Zielonka's recursive algorithm on the subgame of the given vertices, with an explicit stack so a
+# deep recursion does not hit the recursion limit. A call takes the lowest priority p of its subgame,
+# the player of that parity (who wins a play that sees p infinitely often) and that player's attractor
+# A to the vertices with priority p, and solves the game without A. When the opponent wins nothing
+# there the player wins the whole subgame. Otherwise the opponent also wins its attractor B to what it
+# won, and the game without B is solved for the rest. The subgame has to be a trap for both players
+# (no vertex has all of its moves outside of it), dead ends are first given to the opponent of their
+# owner together with the attractors to them. stop is asked before every call and ends the solve
+# early when it returns true.
+# Returns the vertices odd wins and the vertices even wins, or None when stopped, and counters: the
+# number of calls, attractors computed and the deepest call.
+def zielonka_solve(n_vertices: int, vertices: Iterable[int], owner: Callable[[int], Player], priority: Callable[[int], int],
+                   successors: Callable[[int], Iterable[int]], predecessors: Callable[[int], Iterable[int]],
+                   stop: Callable[[], bool] | None = None) -> tuple[tuple[list[int], list[int]] | None, dict]:
+    counters = {'zielonka_calls': 0, 'attractors': 0, 'max_depth': 0}
+    depths: list[int] = [-1 for _ in range(n_vertices)]
+    outside = Outside(depths)
+    vertices = list(vertices)
+    for v in vertices:
+        depths[v] = 0
+
+    def out_degree(v: int) -> int:
+        return sum(1 for w in successors(v) if depths[w] == outside.depth)
+
+    def attract(targets: list[int], player: Player) -> list[int]:
+        counters['attractors'] += 1
+        return attractor(targets, player, owner, predecessors, out_degree, outside)
+
+    # a player that cannot move loses, the rest is a trap for both players
+    won: dict[Player, list[int]] = {Player.ODD: [], Player.EVEN: []}
+    for player in (Player.ODD, Player.EVEN):
+        dead_ends = [v for v in vertices if depths[v] == 0 and owner(v) != player and out_degree(v) == 0]
+        for v in attract(dead_ends, player):
+            depths[v] = -1
+            won[player].append(v)
+    vertices = [v for v in vertices if depths[v] == 0]
+
+    stack: list[Call] = [Call(vertices, 0)]
+    # what the call that returned last won, odd first
+    result: tuple[list[int], list[int]] = ([], [])
+    while stack:
+        call = stack[-1]
+        outside.depth = call.depth
+        if call.stage == 0:
+            if stop is not None and stop():
+                return None, counters
+            counters['zielonka_calls'] += 1
+            counters['max_depth'] = max(counters['max_depth'], call.depth)
+            if len(call.vertices) == 0:
+                result = ([], [])
+                stack.pop()
+                continue
+            lowest = min(priority(v) for v in call.vertices)
+            call.player = Player.EVEN if lowest % 2 == 0 else Player.ODD
+            attracted = set(attract([v for v in call.vertices if priority(v) == lowest], call.player))
+            call.below = [v for v in call.vertices if v not in attracted]
+            call.stage = 1
+            stack.append(below(call, depths))
+            continue
+
+        # a call below returned, its vertices are back in this subgame
+        for v in call.below:
+            depths[v] = call.depth
+        opponent = Player.ODD if call.player == Player.EVEN else Player.EVEN
+        opponent_won = result[0] if opponent == Player.ODD else result[1]
+        if call.stage == 1:
+            if len(opponent_won) == 0:
+                result = (call.vertices, []) if call.player == Player.ODD else ([], call.vertices)
+                stack.pop()
+                continue
+            call.attracted = attract(opponent_won, opponent)
+            attracted = set(call.attracted)
+            call.below = [v for v in call.vertices if v not in attracted]
+            call.stage = 2
+            stack.append(below(call, depths))
+            continue
+
+        # stage 2: the opponent also wins its attractor
+        if opponent == Player.ODD:
+            result = (result[0] + call.attracted, result[1])
+        else:
+            result = (result[0], result[1] + call.attracted)
+        stack.pop()
+
+    return (result[0] + won[Player.ODD], result[1] + won[Player.EVEN]), counters
+
+# The call on the vertices of call.below, which move one level deeper
+def below(call: Call, depths: list[int]) -> Call:
+    for v in call.below:
+        depths[v] = call.depth + 1
+    return Call(call.below, call.depth + 1)